@@ -0,0 +1,99 @@
+"""
+Benchmark the bulk read path.
+
+Compares records/second for the ways of turning data into EmployeeRecord
+objects, using a synthetic table so no Airtable access is needed:
+
+- Airtable records: EmployeeRecord.from_airtable_record on decoded pages.
+- Snapshot rows: validated EmployeeRecord(**values) vs model_construct, plus
+  the end-to-end Snapshot.records() rate. (On pydantic 2.x the compiled
+  validator is faster than the pure-Python model_construct, which is why
+  Snapshot keeps validating.)
+
+Usage: python benchmarks/bulk_read.py [--records N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from smog.models import AIRTABLE_FIELDS, EmployeeRecord
+from smog.snapshot import Snapshot, write_snapshot
+
+# Largest page the List records endpoint returns.
+PAGE_SIZE = 100
+
+
+def _pages(count: int) -> List[List[Dict[str, Any]]]:
+    """Build the decoded List records pages of a synthetic table."""
+    records: List[Dict[str, Any]] = []
+    for i in range(count):
+        fields = {
+            AIRTABLE_FIELDS["email"]: f"employee{i}@example.com",
+            AIRTABLE_FIELDS["manager_email"]: f"employee{i // 8}@example.com" if i else None,
+            AIRTABLE_FIELDS["employment_status"]: "FTE",
+            AIRTABLE_FIELDS["name"]: f"Employee {i}",
+            AIRTABLE_FIELDS["title"]: "Software Engineer",
+            AIRTABLE_FIELDS["department"]: f"Department {i % 40}",
+        }
+        present = {name: value for name, value in fields.items() if value is not None}
+        records.append({"id": f"rec{i:014d}", "fields": present})
+    return [records[start:start + PAGE_SIZE] for start in range(0, count, PAGE_SIZE)]
+
+
+def _rate(count: int, repeat: int, run: Callable[[], object]) -> float:
+    """Return records/second for the best of repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return count / best
+
+
+def main() -> None:
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = _pages(args.records)
+
+    def from_pages() -> None:
+        for page in pages:
+            for record in page:
+                EmployeeRecord.from_airtable_record(record)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.snap"
+        decoded = (record for page in pages for record in page)
+        write_snapshot((EmployeeRecord.from_airtable_record(record) for record in decoded), path)
+        with Snapshot.open(path) as snapshot:
+            rows = [record.model_dump() for record in snapshot.records()]
+            snapshot_read = _rate(args.records, args.repeat, lambda: list(snapshot.records()))
+
+    def construct(build: Callable[..., EmployeeRecord]) -> Callable[[], None]:
+        def run() -> None:
+            for values in rows:
+                build(**values)
+
+        return run
+
+    results = [
+        ("Airtable record construction", _rate(args.records, args.repeat, from_pages)),
+        ("row construction (validated)", _rate(args.records, args.repeat, construct(EmployeeRecord))),
+        (
+            "row construction (model_construct)",
+            _rate(args.records, args.repeat, construct(EmployeeRecord.model_construct)),
+        ),
+        ("snapshot read, end to end", snapshot_read),
+    ]
+    for label, rate in results:
+        print(f"{label:<40} {rate:>12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
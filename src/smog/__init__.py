@@ -1,13 +1,50 @@
 """Airtable employee lookup client."""
 
+from smog.bloom import BloomFilter
+from smog.cache import StaleWhileRevalidateCache
+from smog.cassette import Cassette, RecordingTransport, ReplayTransport
 from smog.client import AirtableClient
-from smog.config import AirtableConfig, load_config
-from smog.models import EmployeeRecord, EmployeeLookupResult
+from smog.config import AirtableConfig, load_config, load_sources
+from smog.deadline import Deadline, DeadlineExceeded, HedgingPolicy
+from smog.directory import EmployeeDirectory
+from smog.emails import EmailNormalizer, normalize_email
+from smog.federation import FederatedClient
+from smog.history import History, HistoricalView
+from smog.index import EmployeeIndex
+from smog.models import ChangeEvent, EmployeeRecord, EmployeeLookupResult
+from smog.parallel import SharedSnapshot, map_employees
+from smog.snapshot import Snapshot, write_snapshot
+from smog.watch import ChangeFeed
+from smog.webhook import WebhookServer, WebhookSync
 
 __all__ = [
     "AirtableClient",
     "AirtableConfig",
     "load_config",
+    "load_sources",
+    "FederatedClient",
     "EmployeeRecord",
     "EmployeeLookupResult",
+    "EmployeeDirectory",
+    "Deadline",
+    "DeadlineExceeded",
+    "HedgingPolicy",
+    "EmailNormalizer",
+    "normalize_email",
+    "EmployeeIndex",
+    "History",
+    "HistoricalView",
+    "ChangeEvent",
+    "ChangeFeed",
+    "WebhookServer",
+    "WebhookSync",
+    "Snapshot",
+    "SharedSnapshot",
+    "map_employees",
+    "StaleWhileRevalidateCache",
+    "BloomFilter",
+    "Cassette",
+    "RecordingTransport",
+    "ReplayTransport",
+    "write_snapshot",
 ]
@@ -0,0 +1,226 @@
+"""
+Bloom filter over known employee emails, to skip lookups that must miss.
+
+The filter answers "definitely not an employee" without a network request;
+a "maybe" still goes to Airtable. It is written next to a snapshot
+(SNAPSHOT.bloom) when the snapshot is built, so it is exactly as fresh as
+that snapshot: anyone added to the table later is reported as not found
+until the filter is rebuilt.
+
+File layout (little-endian): magic, version, bit count, hash count, email
+count, then the bit array.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+from smog.emails import split_alternate_emails
+from smog.models import EmployeeRecord
+
+MAGIC = b"SMOGBLOM"
+VERSION = 1
+
+# False positive rate a filter is sized for when none is given.
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+# magic, version, bit_count, hash_count, email_count
+_HEADER = struct.Struct("<8sIQIQ")
+
+
+def filter_path(snapshot_path: Path) -> Path:
+    """
+    Return where the filter for a snapshot file is kept.
+
+    Args:
+        snapshot_path: Snapshot file.
+
+    Returns:
+        SNAPSHOT.bloom next to the snapshot.
+    """
+    return snapshot_path.with_name(snapshot_path.name + ".bloom")
+
+
+def _record_emails(records: Iterable[EmployeeRecord]) -> Iterator[str]:
+    for record in records:
+        yield record.email
+        yield from split_alternate_emails(record.alternate_emails)
+
+
+class BloomFilter:
+    """
+    Compact, case-insensitive set of emails with no false negatives.
+
+    Membership is tested with hash_count bit positions derived from one
+    BLAKE2b digest by double hashing, so a probe costs a single hash.
+    """
+
+    def __init__(self, bits: bytearray, hash_count: int, count: int = 0) -> None:
+        """
+        Initialize from a bit array.
+
+        Args:
+            bits: Bit array; its length sets the filter size.
+            hash_count: Bit positions set per email.
+            count: Number of emails added so far.
+        """
+        self._bits = bits
+        self._bit_count = len(bits) * 8
+        self.hash_count = hash_count
+        self.count = count
+
+    @classmethod
+    def sized_for(
+        cls,
+        capacity: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> "BloomFilter":
+        """
+        Create an empty filter sized to hold capacity emails at a target false positive rate.
+
+        Args:
+            capacity: Expected number of emails.
+            false_positive_rate: Target false positive rate once capacity emails are added.
+
+        Returns:
+            Empty BloomFilter.
+
+        Raises:
+            ValueError: If false_positive_rate is not between 0 and 1.
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"false_positive_rate must be between 0 and 1, got {false_positive_rate}")
+        capacity = max(capacity, 1)
+        bit_count = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = max(round(bit_count / capacity * math.log(2)), 1)
+        return cls(bytearray(-(-bit_count // 8)), hash_count)
+
+    @classmethod
+    def build(
+        cls,
+        records: Iterable[EmployeeRecord],
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> "BloomFilter":
+        """
+        Build a filter of every employee's email and alternate emails.
+
+        Args:
+            records: Employee records.
+            false_positive_rate: Target false positive rate.
+
+        Returns:
+            BloomFilter containing the records' emails.
+        """
+        emails = {email.lower() for email in _record_emails(records)}
+        bloom = cls.sized_for(len(emails), false_positive_rate)
+        for email in emails:
+            bloom.add(email)
+        return bloom
+
+    def _positions(self, email: str) -> Iterator[int]:
+        digest = hashlib.blake2b(email.lower().encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        # Odd, so the step is never 0 (which would probe one bit hash_count times).
+        step = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * step) % self._bit_count
+
+    def add(self, email: str) -> None:
+        """
+        Add an email (case-insensitive).
+
+        Args:
+            email: Email address.
+        """
+        for position in self._positions(email):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, email: object) -> bool:
+        """Return False if the email was definitely never added, True if it may have been."""
+        if not isinstance(email, str):
+            return False
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(email))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Estimated chance that an email never added tests as present.
+
+        Computed from the fraction of bits actually set, so it reflects the
+        filter's real fill rather than its target.
+        """
+        set_bits = bin(int.from_bytes(self._bits, "little")).count("1")
+        return float((set_bits / self._bit_count) ** self.hash_count)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Describe the filter.
+
+        Returns:
+            Dictionary with emails, bits, hash_count, bytes and false_positive_rate.
+        """
+        return {
+            "emails": self.count,
+            "bits": self._bit_count,
+            "hash_count": self.hash_count,
+            "bytes": self.nbytes,
+            "false_positive_rate": self.false_positive_rate,
+        }
+
+    def save(self, path: Path) -> None:
+        """
+        Write the filter to a file, replacing it atomically.
+
+        Args:
+            path: Destination file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, self._bit_count, self.hash_count, self.count))
+                f.write(self._bits)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """
+        Read a filter written by save.
+
+        Args:
+            path: Filter file.
+
+        Returns:
+            The stored BloomFilter.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the file is not a filter this version can read.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not a smog filter file: {path}")
+        magic, version, bit_count, hash_count, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Not a smog filter file: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported filter version {version} in {path}")
+        bits = bytearray(data[_HEADER.size:])
+        if len(bits) * 8 != bit_count or hash_count < 1:
+            raise ValueError(f"Truncated or corrupt filter file: {path}")
+        return cls(bits, hash_count, count)
@@ -0,0 +1,171 @@
+"""Stale-while-revalidate cache for lookup results."""
+
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from smog.deadline import DaemonExecutor, DeadlineExceeded
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    loaded_at: float
+
+
+class StaleWhileRevalidateCache(Generic[K, V]):
+    """
+    TTL cache that serves stale values while refreshing them in the background.
+
+    For an entry of a given age:
+
+    - younger than ttl - refresh_ahead: served as is
+    - younger than ttl: served, and a background refresh is started so hot
+      keys are renewed before they expire
+    - younger than max_staleness: served stale, and a background refresh is started
+    - older than max_staleness (or missing): the caller blocks on a load
+
+    Loads are single-flighted: concurrent callers for the same key share one
+    load instead of each issuing their own request. A blocking load runs on
+    the caller's thread, so it never queues behind background refreshes;
+    refreshes run on daemon threads, so a stuck one cannot delay exit.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_staleness: float,
+        refresh_ahead: float = 0.0,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry is considered fresh.
+            max_staleness: Seconds after loading beyond which an entry is never served.
+            refresh_ahead: Seconds before expiry at which a read triggers a background refresh.
+            max_workers: Most background refreshes running at once. Further refreshes
+                         are skipped, still serving the stale value, until one finishes.
+            clock: Monotonic time source, in seconds.
+
+        Raises:
+            ValueError: If the time bounds are inconsistent.
+        """
+        if ttl < 0 or refresh_ahead < 0 or refresh_ahead > ttl:
+            raise ValueError("refresh_ahead must be between 0 and ttl")
+        if max_staleness < ttl:
+            raise ValueError("max_staleness must be at least ttl")
+
+        self._ttl = ttl
+        self._max_staleness = max_staleness
+        self._refresh_ahead = refresh_ahead
+        self._clock = clock
+        self._entries: Dict[K, _Entry[V]] = {}
+        self._in_flight: Dict[K, "Future[V]"] = {}
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._refreshes = 0
+        self._executor = DaemonExecutor(thread_name_prefix="smog-refresh")
+
+    def get(self, key: K, loader: Callable[[], V], timeout: Optional[float] = None) -> V:
+        """
+        Return the cached value for key, loading or refreshing it as needed.
+
+        Args:
+            key: Cache key.
+            loader: Callable producing a fresh value for key.
+            timeout: Seconds to wait if the caller has to block on a load another
+                     caller or a refresh started. Unbounded if None. A load this
+                     caller runs itself is bounded only by loader.
+
+        Returns:
+            The cached or freshly loaded value.
+
+        Raises:
+            DeadlineExceeded: If the load doesn't finish within timeout. It keeps
+                              running and still fills the cache.
+            Exception: Whatever loader raised, if the caller had to block on it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.loaded_at
+                if age < self._max_staleness:
+                    if age >= self._ttl - self._refresh_ahead:
+                        self._start_refresh(key, loader)
+                    return entry.value
+            future = self._in_flight.get(key)
+            loads_here = future is None
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+
+        if loads_here:
+            return self._load(key, loader, future)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if not future.done():
+                raise DeadlineExceeded(f"Deadline expired waiting for a load of {key!r}") from None
+            raise
+
+    def invalidate(self, key: K) -> None:
+        """
+        Drop the entry for key so the next read loads it again.
+
+        Args:
+            key: Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Wait for in-flight loads and refreshes to finish."""
+        with self._lock:
+            futures = list(self._in_flight.values())
+        wait(futures)
+
+    def _start_refresh(self, key: K, loader: Callable[[], V]) -> None:
+        """Start a background refresh unless key is loading or all workers are busy. Caller holds the lock."""
+        if key in self._in_flight or self._refreshes >= self._max_workers:
+            return
+        future: "Future[V]" = Future()
+        self._in_flight[key] = future
+        self._refreshes += 1
+        self._executor.submit(self._refresh, key, loader, future)
+
+    def _refresh(self, key: K, loader: Callable[[], V], future: "Future[V]") -> None:
+        try:
+            self._load(key, loader, future)
+        finally:
+            with self._lock:
+                self._refreshes -= 1
+
+    def _load(self, key: K, loader: Callable[[], V], future: "Future[V]") -> V:
+        """Run loader, store its value and settle future for callers sharing the load."""
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._entries[key] = _Entry(value, self._clock())
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+        return value
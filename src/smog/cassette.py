@@ -0,0 +1,378 @@
+"""
+Record and replay of Airtable HTTP traffic for offline performance runs.
+
+A cassette holds every request a client sent, with its query parameters
+(formula, page offset, page size), response body and how long it took.
+RecordingTransport captures one from live traffic; ReplayTransport answers
+from it, sleeping for the recorded (optionally scaled) latency, so the same
+workload can be rerun against any client configuration without touching
+Airtable.
+
+Both are requests transport adapters that AirtableClient mounts on its
+session (see its transport argument), so everything above HTTP - caching,
+hedging, deadlines, pagination - runs exactly as in production.
+
+Cassette files are gzipped JSON lines, one interaction per line.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import BaseAdapter
+from requests.exceptions import ReadTimeout
+from requests.structures import CaseInsensitiveDict
+
+from smog.deadline import DeadlineExceeded
+from smog.directory import EmployeeDirectory
+
+# (method, path, sorted query parameters, request body)
+_Key = Tuple[str, str, Tuple[Tuple[str, Tuple[str, ...]], ...], Optional[str]]
+
+_Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class CassetteMiss(LookupError):
+    """A replayed client sent a request the cassette has no recording of."""
+
+
+def _body_text(body: Any) -> Optional[str]:
+    """Return a request or response body as text; streamed bodies are not recorded."""
+    if isinstance(body, str):
+        return body
+    if isinstance(body, bytes):
+        # surrogateescape keeps arbitrary bytes round-tripping through JSON.
+        return body.decode("utf-8", "surrogateescape")
+    return None
+
+
+class Cassette:
+    """
+    Ordered list of recorded interactions.
+
+    Each interaction is a dict with at (seconds since recording started),
+    method, path, params (query parameters, each a list of values), body,
+    status, content_type, elapsed (seconds) and response (the body text).
+    """
+
+    def __init__(self, interactions: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Initialize the cassette.
+
+        Args:
+            interactions: Interactions to start with, in request order.
+        """
+        self.interactions: List[Dict[str, Any]] = list(interactions)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.interactions)
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        """
+        Read a cassette file.
+
+        Args:
+            path: Cassette written by save.
+
+        Returns:
+            The recorded Cassette.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def save(self, path: Path) -> None:
+        """
+        Write the cassette, replacing the file atomically.
+
+        Args:
+            path: Destination file.
+        """
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded traffic.
+
+        Returns:
+            Dictionary with requests, pages (requests that continued from an
+            offset), errors (status 400 and above), total_latency, p50_latency
+            and p95_latency, in seconds.
+        """
+        latencies = sorted(interaction["elapsed"] for interaction in self.interactions)
+        return {
+            "requests": len(latencies),
+            "pages": sum("offset" in interaction["params"] for interaction in self.interactions),
+            "errors": sum(interaction["status"] >= 400 for interaction in self.interactions),
+            "total_latency": sum(latencies),
+            "p50_latency": percentile(latencies, 0.5),
+            "p95_latency": percentile(latencies, 0.95),
+        }
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+
+    Args:
+        ordered: Values in ascending order.
+        fraction: Percentile between 0 and 1.
+
+    Returns:
+        The percentile, or 0.0 for no values.
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def _key(method: str, path: str, params: Mapping[str, List[str]], body: Optional[str]) -> _Key:
+    return (method, path, tuple(sorted((name, tuple(values)) for name, values in params.items())), body)
+
+
+def _split(request: PreparedRequest) -> Tuple[str, Dict[str, List[str]]]:
+    url = urlsplit(request.url or "")
+    return url.path, parse_qs(url.query, keep_blank_values=True)
+
+
+class Transport(BaseAdapter):
+    """Base for adapters AirtableClient can mount in place of the network."""
+
+    def attach(self, session: Session, prefix: str) -> None:
+        """
+        Mount this transport on a session for URLs starting with prefix.
+
+        Args:
+            session: Session to route through this transport.
+            prefix: URL prefix, e.g. the API endpoint.
+        """
+        session.mount(prefix, self)
+
+    def close(self) -> None:
+        """Release resources; nothing to release by default."""
+
+
+class RecordingTransport(Transport):
+    """
+    Pass requests through to the network and record each one into a cassette.
+
+    The session's own adapter stays underneath, so retries and connection
+    pooling are unchanged; a recorded latency includes any retries.
+    Safe to share between threads and clients.
+    """
+
+    def __init__(
+        self,
+        cassette: Optional[Cassette] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            cassette: Cassette to append to; a new one if None.
+            clock: Monotonic time source, in seconds.
+        """
+        super().__init__()
+        self.cassette = cassette if cassette is not None else Cassette()
+        self._clock = clock
+        self._started = clock()
+        self._inner: Optional[BaseAdapter] = None
+        self._lock = threading.Lock()
+
+    def attach(self, session: Session, prefix: str) -> None:
+        self._inner = session.get_adapter(prefix)
+        super().attach(session, prefix)
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: _Timeout = None,
+        verify: Union[bool, str] = True,
+        cert: Union[None, str, Tuple[str, str]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        if self._inner is None:
+            raise RuntimeError("RecordingTransport must be attached to a session before use")
+        start = self._clock()
+        response = self._inner.send(
+            request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+        )
+        content = response.content
+        elapsed = self._clock() - start
+
+        path, params = _split(request)
+        interaction = {
+            "at": round(start - self._started, 6),
+            "method": request.method,
+            "path": path,
+            "params": params,
+            "body": _body_text(request.body),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "elapsed": round(elapsed, 6),
+            "response": _body_text(content),
+        }
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return response
+
+    def close(self) -> None:
+        if self._inner is not None:
+            self._inner.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answer requests from a cassette instead of the network.
+
+    Requests are matched on method, path, query parameters and body.
+    Identical requests get their recordings in order; once those run out the
+    last one is served again, so configurations that repeat requests (e.g.
+    hedging) still replay. Each response is delayed by its recorded latency
+    times latency_scale, and a delay longer than the request's read timeout
+    raises ReadTimeout after the timeout, as the network would.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            cassette: Recorded traffic to serve.
+            latency_scale: Multiplier for recorded latencies; 0 replays instantly.
+            sleep: Function used to wait out latencies.
+
+        Raises:
+            ValueError: If latency_scale is negative.
+        """
+        if latency_scale < 0:
+            raise ValueError(f"latency_scale must not be negative, got {latency_scale}")
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._sleep = sleep
+        self._recordings: Dict[_Key, Deque[Dict[str, Any]]] = {}
+        for interaction in cassette:
+            key = _key(interaction["method"], interaction["path"], interaction["params"], interaction["body"])
+            self._recordings.setdefault(key, deque()).append(interaction)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.latency = 0.0
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: _Timeout = None,
+        verify: Union[bool, str] = True,
+        cert: Union[None, str, Tuple[str, str]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        path, params = _split(request)
+        key = _key(request.method or "", path, params, _body_text(request.body))
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise CassetteMiss(f"No recording of {request.method} {request.url}")
+            interaction = recordings.popleft() if len(recordings) > 1 else recordings[0]
+            self.requests += 1
+
+        delay = interaction["elapsed"] * self.latency_scale
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            self._wait(read_timeout)
+            raise ReadTimeout(f"Replayed response took {delay:.3f}s", request=request)
+        self._wait(delay)
+
+        response = Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict()
+        if interaction["content_type"]:
+            response.headers["Content-Type"] = interaction["content_type"]
+        body = interaction["response"]
+        response._content = b"" if body is None else body.encode("utf-8", "surrogateescape")
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+        with self._lock:
+            self.latency += seconds
+
+
+def run_workload(
+    directory: EmployeeDirectory,
+    emails: Iterable[str],
+    concurrency: int = 1,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Dict[str, Any]:
+    """
+    Run a management chain lookup for each email and measure them.
+
+    Args:
+        directory: Directory to look up in, e.g. a client on a replay transport.
+        emails: Emails to look up, in order.
+        concurrency: Lookups in flight at once.
+        clock: Monotonic time source, in seconds.
+
+    Returns:
+        Dictionary with lookups, found, not_found, partial, timeouts, errors,
+        wall_time, p50_latency and p95_latency, in seconds.
+    """
+    outcomes: List[Tuple[str, float]] = []
+
+    def look_up(email: str) -> Tuple[str, float]:
+        start = clock()
+        try:
+            result = directory.get_employee_with_management_chain(email)
+            outcome = "not_found" if result is None else "partial" if result.partial else "found"
+        except DeadlineExceeded:
+            outcome = "timeouts"
+        except Exception:
+            outcome = "errors"
+        return outcome, clock() - start
+
+    start = clock()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="smog-workload") as pool:
+            outcomes = list(pool.map(look_up, emails))
+    else:
+        outcomes = [look_up(email) for email in emails]
+    wall_time = clock() - start
+
+    latencies = sorted(latency for _, latency in outcomes)
+    stats: Dict[str, Any] = {"lookups": len(outcomes)}
+    for outcome in ("found", "not_found", "partial", "timeouts", "errors"):
+        stats[outcome] = sum(kind == outcome for kind, _ in outcomes)
+    stats["wall_time"] = wall_time
+    stats["p50_latency"] = percentile(latencies, 0.5)
+    stats["p95_latency"] = percentile(latencies, 0.95)
+    return stats
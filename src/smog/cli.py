@@ -1,54 +1,56 @@
 """CLI interface for employee lookup."""
 
+import csv
+import json
+import sqlite3
 import sys
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
 
 import click
 
+from smog.bloom import DEFAULT_FALSE_POSITIVE_RATE, BloomFilter, filter_path
+from smog.cassette import Cassette, RecordingTransport, ReplayTransport, Transport, run_workload
 from smog.client import AirtableClient
-from smog.config import load_app_config, load_config
+from smog.config import load_app_config, load_config, load_sources
+from smog.database import query, write_database
+from smog.deadline import DeadlineExceeded, HedgingPolicy
+from smog.directory import EmployeeDirectory, first_with_management_chain
+from smog.emails import EmailNormalizer
+from smog.federation import FederatedClient
+from smog.history import History
+from smog.index import EmployeeIndex
+from smog.models import EmployeeLookupResult, EmployeeRecord
+from smog.orgchart import walk_org, write_dot, write_json
+from smog.reconcile import CHAIN_CHANGED_COLUMN, RECONCILE_COLUMNS, reconcile
+from smog.shell import Shell
+from smog.snapshot import Snapshot, write_snapshot
+from smog.views import REPORT_DEPTH_COLUMNS, REPORT_SPAN_COLUMNS, OrgViews
+from smog.watch import ChangeFeed
+from smog.webhook import WebhookServer, WebhookSync, post_payloads
 
 
-def normalize_email(email: str, default_domain: str) -> str:
-    """
-    Normalize email by optionally appending default domain.
+class _DefaultLookupGroup(click.Group):
+    """Command group that treats an unknown first argument as an email to look up."""
 
-    Args:
-        email: Email address or username.
-        default_domain: Domain to append if email has no @ and domain is configured.
+    default_command = "lookup"
 
-    Returns:
-        Normalized email address.
-    """
-    if "@" not in email and default_domain:
-        return f"{email}@{default_domain}"
-    return email
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
 
 
-@click.command()
-@click.argument("email")
-@click.option("--details", is_flag=True, help="Show detailed employee information")
-def main(email: str, details: bool) -> None:
+def _echo_lookup_result(result: EmployeeLookupResult, details: bool) -> None:
     """
-    Look up an employee by email and display their manager chain.
+    Print an employee and their management chain.
 
     Args:
-        email: Employee email address or username to look up.
-               If no @ is present and default_email_domain is configured,
-               the domain will be appended.
+        result: Lookup result to display.
         details: Whether to show detailed employee information.
     """
-    app_config = load_app_config()
-    normalized_email = normalize_email(email, app_config["default_email_domain"])
-
-    config = load_config()
-    client = AirtableClient(config)
-
-    result = client.get_employee_with_management_chain(normalized_email)
-
-    if result is None:
-        click.echo(f"Employee not found: {normalized_email}", err=True)
-        sys.exit(1)
-
     click.echo("\n=== Employee Information ===")
     click.echo(f"Email:             {result.employee.email}")
     click.echo(f"Employment Status: {result.employee.employment_status}")
@@ -90,5 +92,881 @@ def main(email: str, details: bool) -> None:
     click.echo()
 
 
+def _parse_as_of(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an --as-of value as a UTC time.
+
+    A bare date means the end of that day, so syncs made during the day count.
+    """
+    if value is None:
+        return None
+    try:
+        when = datetime.fromisoformat(value)
+    except ValueError:
+        raise click.BadParameter("expected YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS") from None
+    if "T" not in value and " " not in value:
+        when = when.replace(hour=23, minute=59, second=59, microsecond=999999)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when
+
+
+def _open_history(history_dir: Optional[Path], app_config: Dict[str, Any]) -> History:
+    """
+    Open the history directory given on the command line or in config.yaml.
+
+    Raises:
+        click.UsageError: If neither names a history directory.
+    """
+    directory = history_dir or app_config.get("history_dir")
+    if not directory:
+        raise click.UsageError("No history directory: pass --history or set history_dir in config.yaml")
+    return History(Path(directory))
+
+
+def _make_client(
+    timeout: Optional[float] = None,
+    hedge: bool = False,
+    prefilter: Optional[BloomFilter] = None,
+    transport: Optional[Transport] = None,
+) -> Union[AirtableClient, FederatedClient]:
+    """
+    Create a client for the sources in secrets.yaml.
+
+    A single source gets a plain AirtableClient; several sources are queried
+    together through a FederatedClient.
+    """
+    configs = load_sources()
+    if len(configs) == 1:
+        return AirtableClient(
+            configs[0],
+            timeout=timeout,
+            hedging=HedgingPolicy() if hedge else None,
+            prefilter=prefilter,
+            transport=transport,
+        )
+    return FederatedClient.from_configs(
+        configs, timeout=timeout, hedge=hedge, prefilter=prefilter, transport=transport
+    )
+
+
+def _load_prefilter(prefilter_path: Optional[Path], app_config: Dict[str, Any]) -> Optional[BloomFilter]:
+    """
+    Load the filter given on the command line or in config.yaml, if any.
+
+    Raises:
+        click.UsageError: If the file is missing or not a filter.
+    """
+    path = prefilter_path or app_config.get("prefilter")
+    if not path:
+        return None
+    try:
+        return BloomFilter.load(Path(path))
+    except (OSError, ValueError) as e:
+        raise click.UsageError(f"Cannot load prefilter {path}: {e}")
+
+
+_as_of_option = click.option(
+    "--as-of",
+    callback=_parse_as_of,
+    metavar="DATE",
+    help="Answer from recorded history as of DATE (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS, UTC)",
+)
+_history_option = click.option(
+    "--history",
+    "history_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="History directory (defaults to history_dir in config.yaml)",
+)
+_prefilter_option = click.option(
+    "--prefilter",
+    "prefilter_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Filter of known emails, e.g. SNAPSHOT.bloom; others are not found without a request "
+    "(defaults to prefilter in config.yaml)",
+)
+
+
+@click.group(cls=_DefaultLookupGroup)
+def main() -> None:
+    """
+    Airtable employee lookup.
+
+    Run `smog EMAIL` to look up an employee, or use one of the commands below.
+    """
+
+
+@main.command()
+@click.argument("email")
+@click.option("--details", is_flag=True, help="Show detailed employee information")
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Answer from a snapshot file instead of querying Airtable",
+)
+@_as_of_option
+@_history_option
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds allowed for the whole lookup; prints a partial chain if it runs out",
+)
+@_prefilter_option
+def lookup(
+    email: str,
+    details: bool,
+    snapshot_path: Optional[Path],
+    as_of: Optional[datetime],
+    history_dir: Optional[Path],
+    timeout: Optional[float],
+    prefilter_path: Optional[Path],
+) -> None:
+    """
+    Look up an employee by email and display their manager chain.
+
+    Args:
+        email: Employee email address or username to look up.
+               If no @ is present and default_email_domain is configured,
+               the domain will be appended.
+        details: Whether to show detailed employee information.
+        snapshot_path: Snapshot file to read instead of Airtable, if given.
+        as_of: Answer from recorded history as of this time, if given.
+        history_dir: History directory to read, overriding config.yaml.
+        timeout: Seconds allowed for the whole Airtable lookup, if given.
+        prefilter_path: Filter consulted before querying Airtable, overriding config.yaml.
+    """
+    app_config = load_app_config()
+    candidates = EmailNormalizer.from_app_config(app_config).candidates(email)
+    normalized_email = candidates[-1]
+
+    if as_of is not None:
+        try:
+            view = _open_history(history_dir, app_config).as_of(as_of)
+        except LookupError as e:
+            click.echo(str(e), err=True)
+            sys.exit(1)
+        with view:
+            result = first_with_management_chain(view, candidates)
+    elif snapshot_path is not None:
+        with Snapshot.open(snapshot_path) as snapshot:
+            result = first_with_management_chain(snapshot, candidates)
+    else:
+        bloom = _load_prefilter(prefilter_path, app_config)
+        client = _make_client(timeout=timeout, prefilter=bloom)
+        try:
+            # Airtable is queried on {Email} only, so the as-typed form of an alias can't match there.
+            result = client.get_employee_with_management_chain(normalized_email)
+        except DeadlineExceeded:
+            click.echo(f"Timed out looking up {normalized_email}", err=True)
+            sys.exit(1)
+
+    if result is None:
+        click.echo(f"Employee not found: {normalized_email}", err=True)
+        sys.exit(1)
+
+    _echo_lookup_result(result, details)
+    if result.partial:
+        click.echo("Timed out before the management chain was complete", err=True)
+
+
+@main.command()
+@click.option("--details", is_flag=True, help="Show detailed employee information on lookup")
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Build the local index from a snapshot file instead of downloading the table",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds allowed for each lookup",
+)
+@_prefilter_option
+def shell(
+    details: bool,
+    snapshot_path: Optional[Path],
+    timeout: Optional[float],
+    prefilter_path: Optional[Path],
+) -> None:
+    """
+    Run lookups interactively against one warm client.
+
+    Args:
+        details: Whether lookups show detailed employee information.
+        snapshot_path: Snapshot file to build the local index from, if given.
+        timeout: Seconds allowed for each lookup, if given.
+        prefilter_path: Filter consulted before each lookup, overriding config.yaml.
+    """
+    app_config = load_app_config()
+    client = _make_client(timeout=timeout, prefilter=_load_prefilter(prefilter_path, app_config))
+
+    def load_records() -> List[EmployeeRecord]:
+        if snapshot_path is None:
+            return client.all_employees()
+        with Snapshot.open(snapshot_path) as snapshot:
+            return list(snapshot.records())
+
+    normalize = EmailNormalizer.from_app_config(app_config)
+    Shell(client, load_records, normalize, lambda result: _echo_lookup_result(result, details)).cmdloop()
+
+
+@main.command("snapshot")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@_as_of_option
+@_history_option
+def build_snapshot(output: Path, as_of: Optional[datetime], history_dir: Optional[Path]) -> None:
+    """
+    Download the employee table into a memory-mappable snapshot file.
+
+    A prefilter of the snapshot's emails is written next to it (OUTPUT.bloom).
+
+    Args:
+        output: Path of the snapshot file to write.
+        as_of: Write the table as recorded in history at this time instead, if given.
+        history_dir: History directory to read, overriding config.yaml.
+    """
+    if as_of is not None:
+        try:
+            view = _open_history(history_dir, load_app_config()).as_of(as_of)
+        except LookupError as e:
+            click.echo(str(e), err=True)
+            sys.exit(1)
+        with view:
+            records = list(view.records())
+    else:
+        records = _make_client().all_employees()
+
+    count = write_snapshot(records, output)
+    BloomFilter.build(records).save(filter_path(output))
+    click.echo(f"Wrote {count} employees to {output}")
+
+
+@main.group()
+def prefilter() -> None:
+    """Build and inspect filters that rule out unknown emails without a request."""
+
+
+@prefilter.command("build")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Read employees from a snapshot file instead of downloading the table",
+)
+@click.option(
+    "--false-positive-rate",
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=DEFAULT_FALSE_POSITIVE_RATE,
+    show_default=True,
+    help="Share of unknown emails the filter lets through to Airtable",
+)
+def prefilter_build(output: Path, snapshot_path: Optional[Path], false_positive_rate: float) -> None:
+    """
+    Write a filter of every employee email.
+
+    Args:
+        output: Filter file to write.
+        snapshot_path: Snapshot file to read instead of Airtable, if given.
+        false_positive_rate: Target false positive rate.
+    """
+    if snapshot_path is not None:
+        with Snapshot.open(snapshot_path) as snapshot:
+            bloom = BloomFilter.build(snapshot.records(), false_positive_rate)
+    else:
+        bloom = BloomFilter.build(_make_client().all_employees(), false_positive_rate)
+    bloom.save(output)
+    click.echo(f"Wrote {bloom.count} emails to {output}")
+
+
+@prefilter.command("stats")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def prefilter_stats(path: Path) -> None:
+    """
+    Show a filter's size, memory footprint and estimated false positive rate.
+
+    Args:
+        path: Filter file, e.g. SNAPSHOT.bloom.
+    """
+    try:
+        stats = BloomFilter.load(path).stats()
+    except ValueError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    click.echo(f"Emails:              {stats['emails']}")
+    click.echo(f"Bits:                {stats['bits']} ({stats['hash_count']} per email)")
+    click.echo(f"Memory:              {stats['bytes']} bytes")
+    click.echo(f"False positive rate: {stats['false_positive_rate']:.4%}")
+
+
+_database_option = click.option(
+    "--db",
+    "db_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="SQLite database file (defaults to database in config.yaml)",
+)
+
+
+def _database_path(db_path: Optional[Path], app_config: Dict[str, Any]) -> Path:
+    """
+    Pick the database given on the command line or in config.yaml.
+
+    Raises:
+        click.UsageError: If neither names a database.
+    """
+    path = db_path or app_config.get("database")
+    if not path:
+        raise click.UsageError("No database: pass --db or set database in config.yaml")
+    return Path(path)
+
+
+@main.command()
+@_database_option
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Read employees from a snapshot file instead of downloading the table",
+)
+def materialize(db_path: Optional[Path], snapshot_path: Optional[Path]) -> None:
+    """
+    Write the employee table and its management closure to a SQLite database.
+
+    Args:
+        db_path: Database file to write, overriding config.yaml.
+        snapshot_path: Snapshot file to read instead of Airtable, if given.
+    """
+    path = _database_path(db_path, load_app_config())
+    if snapshot_path is not None:
+        with Snapshot.open(snapshot_path) as snapshot:
+            count = write_database(snapshot.records(), path)
+    else:
+        count = write_database(_make_client().all_employees(), path)
+
+    click.echo(f"Wrote {count} employees to {path}")
+
+
+@main.command()
+@click.argument("statement")
+@_database_option
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "csv", "ndjson"]),
+    default="table",
+    show_default=True,
+    help="Output format for result rows",
+)
+def sql(statement: str, db_path: Optional[Path], output_format: str) -> None:
+    """
+    Run a read-only SQL query against the database written by materialize.
+
+    Tables: employees (one row per employee) and closure (employee, ancestor,
+    depth), e.g. headcount under a manager:
+
+    \b
+        SELECT count(*) FROM closure WHERE ancestor = 'cto@example.com' AND depth > 0
+
+    Args:
+        statement: SQL statement to run.
+        db_path: Database file to query, overriding config.yaml.
+        output_format: "table" for aligned columns, "csv", or "ndjson" for JSON lines.
+    """
+    path = _database_path(db_path, load_app_config())
+    try:
+        columns, rows = query(path, statement)
+        if output_format == "csv":
+            writer = csv.writer(sys.stdout)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        elif output_format == "ndjson":
+            for row in rows:
+                click.echo(json.dumps(dict(zip(columns, row))))
+        else:
+            table = [tuple("" if value is None else str(value) for value in row) for row in rows]
+            widths = [max([len(column)] + [len(row[i]) for row in table]) for i, column in enumerate(columns)]
+            click.echo("  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+            for row in table:
+                click.echo("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+    except (FileNotFoundError, sqlite3.Error) as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("kind", type=click.Choice(["span", "depth", "chains"]))
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Report on a snapshot file (views are cached until it changes) instead of downloading the table",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["csv", "ndjson"]),
+    default="csv",
+    show_default=True,
+    help="Output format for report rows",
+)
+def report(kind: str, snapshot_path: Optional[Path], output_format: str) -> None:
+    """
+    Print an org-wide report: span of control, depth or management chains.
+
+    span lists every manager with direct and total report counts and depth;
+    depth lists every employee with their manager and depth; chains lists
+    every employee with their managers up to the top.
+
+    Args:
+        kind: Which report to print.
+        snapshot_path: Snapshot file to report on, if given.
+        output_format: "csv" or "ndjson" for JSON lines.
+    """
+    if snapshot_path is not None:
+        views = OrgViews.for_snapshot(snapshot_path)
+    else:
+        views = OrgViews.build(_make_client().all_employees())
+
+    rows = {"span": views.span, "depth": views.depth, "chains": views.chains}[kind]()
+    if output_format == "ndjson":
+        for row in rows:
+            click.echo(json.dumps(row))
+        return
+
+    if kind == "chains":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["email"] + [f"manager_{level}" for level in range(1, views.max_depth + 1)])
+        writer.writerows([row["email"], *row["chain"]] for row in rows)
+    else:
+        columns = {"span": REPORT_SPAN_COLUMNS, "depth": REPORT_DEPTH_COLUMNS}[kind]
+        dict_writer = csv.DictWriter(sys.stdout, fieldnames=columns)
+        dict_writer.writeheader()
+        dict_writer.writerows(rows)
+
+
+@main.command()
+@click.argument("root")
+@click.option("--depth", type=click.IntRange(min=0), help="Levels below ROOT to show (default all)")
+@click.option(
+    "--collapse-above",
+    type=click.IntRange(min=0),
+    metavar="N",
+    help="Hide the reports of anyone below ROOT with more than N reports",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["dot", "json"]),
+    default="dot",
+    show_default=True,
+    help="Graphviz DOT or a nested JSON tree",
+)
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Read employees from a snapshot file instead of downloading the table",
+)
+def orgchart(
+    root: str,
+    depth: Optional[int],
+    collapse_above: Optional[int],
+    output_format: str,
+    snapshot_path: Optional[Path],
+) -> None:
+    """
+    Export the org chart under ROOT, e.g. `smog orgchart cto@example.com | dot -Tsvg`.
+
+    Args:
+        root: Email of the employee at the top of the chart.
+        depth: Levels below the root to show, if limited.
+        collapse_above: Report count above which a subtree is collapsed, if given.
+        output_format: "dot" or "json".
+        snapshot_path: Snapshot file to read instead of Airtable, if given.
+    """
+    candidates = EmailNormalizer.from_app_config(load_app_config()).candidates(root)
+    if snapshot_path is not None:
+        with Snapshot.open(snapshot_path) as snapshot:
+            index = EmployeeIndex(snapshot.records())
+    else:
+        index = EmployeeIndex(_make_client().all_employees())
+
+    email = next((email for email in candidates if index.find_by_email(email)), candidates[-1])
+    if index.find_by_email(email) is None:
+        click.echo(f"Employee not found: {email}", err=True)
+        sys.exit(1)
+
+    events = walk_org(index, email, max_depth=depth, collapse_above=collapse_above)
+    if output_format == "dot":
+        write_dot(events, sys.stdout)
+    else:
+        write_json(events, sys.stdout)
+
+
+@main.group()
+def history() -> None:
+    """Record and inspect point-in-time history of the table."""
+
+
+@history.command("record")
+@_history_option
+def history_record(history_dir: Optional[Path]) -> None:
+    """
+    Download the table and append it to the history.
+
+    Args:
+        history_dir: History directory to write, overriding config.yaml.
+    """
+    store = _open_history(history_dir, load_app_config())
+    client = _make_client()
+
+    count = store.record(client.all_employees())
+    click.echo(f"Recorded {count} changed records")
+
+
+@main.group()
+def cassette() -> None:
+    """Record Airtable traffic for a lookup workload and replay it offline."""
+
+
+def _read_workload(workload: TextIO) -> List[str]:
+    """Read one email or username per line, skipping blank lines and # comments."""
+    normalize = EmailNormalizer.from_app_config(load_app_config())
+    lines = (line.strip() for line in workload)
+    return [normalize(line) for line in lines if line and not line.startswith("#")]
+
+
+def _echo_stats(stats: Dict[str, Any]) -> None:
+    for name, value in stats.items():
+        label = name.replace("_", " ").capitalize() + ":"
+        click.echo(f"{label:<15} {f'{value:.3f}s' if isinstance(value, float) else value}")
+
+
+_workload_argument = click.argument("workload", type=click.File("r"))
+_concurrency_option = click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Lookups in flight at once",
+)
+
+
+@cassette.command("record")
+@click.argument("path", type=click.Path(dir_okay=False, path_type=Path))
+@_workload_argument
+@_concurrency_option
+def cassette_record(path: Path, workload: TextIO, concurrency: int) -> None:
+    """
+    Look up every email in WORKLOAD against Airtable, recording each request to PATH.
+
+    Args:
+        path: Cassette file to write.
+        workload: File with one email or username per line.
+        concurrency: Lookups in flight at once.
+    """
+    emails = _read_workload(workload)
+    transport = RecordingTransport()
+    stats = run_workload(_make_client(transport=transport), emails, concurrency=concurrency)
+    transport.cassette.save(path)
+    _echo_stats(stats)
+    click.echo(f"Recorded {len(transport.cassette)} requests to {path}")
+
+
+@cassette.command("replay")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@_workload_argument
+@_concurrency_option
+@click.option(
+    "--latency-scale",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Multiplier for recorded latencies; 0 replays instantly",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds allowed for each lookup",
+)
+@click.option("--hedge", is_flag=True, help="Send a duplicate of requests slower than the observed p95")
+@_prefilter_option
+def cassette_replay(
+    path: Path,
+    workload: TextIO,
+    concurrency: int,
+    latency_scale: float,
+    timeout: Optional[float],
+    hedge: bool,
+    prefilter_path: Optional[Path],
+) -> None:
+    """
+    Replay the lookups in WORKLOAD against a recorded cassette instead of Airtable.
+
+    Reports request counts and lookup latencies for the given client
+    configuration. Requests the cassette has no recording of count as errors.
+
+    Args:
+        path: Cassette file to replay.
+        workload: File with one email or username per line.
+        concurrency: Lookups in flight at once.
+        latency_scale: Multiplier for recorded latencies.
+        timeout: Seconds allowed for each lookup, if given.
+        hedge: Whether to hedge slow requests.
+        prefilter_path: Filter consulted before each lookup, overriding config.yaml.
+    """
+    emails = _read_workload(workload)
+    transport = ReplayTransport(Cassette.load(path), latency_scale=latency_scale)
+    client = _make_client(
+        timeout=timeout,
+        hedge=hedge,
+        prefilter=_load_prefilter(prefilter_path, load_app_config()),
+        transport=transport,
+    )
+    stats = run_workload(client, emails, concurrency=concurrency)
+    stats["requests"] = transport.requests
+    stats["request_latency"] = transport.latency
+    _echo_stats(stats)
+
+
+@cassette.command("stats")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def cassette_stats(path: Path) -> None:
+    """
+    Summarize the requests recorded in a cassette.
+
+    Args:
+        path: Cassette file.
+    """
+    _echo_stats(Cassette.load(path).stats())
+
+
+@main.command()
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "ndjson"]),
+    default="text",
+    show_default=True,
+    help="Output format for change events",
+)
+@click.option("--interval", type=float, default=60.0, show_default=True, help="Seconds between polls")
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Seed the local index from a snapshot file instead of downloading the table",
+)
+def watch(output_format: str, interval: float, snapshot_path: Optional[Path]) -> None:
+    """
+    Stream hires, terminations, manager and title changes as they happen.
+
+    Args:
+        output_format: "text" for one readable line per event, "ndjson" for JSON lines.
+        interval: Seconds between polls.
+        snapshot_path: Snapshot file to seed the local index from, if given.
+    """
+    app_config = load_app_config()
+    client = _make_client()
+
+    if snapshot_path is not None:
+        watermark = datetime.fromtimestamp(snapshot_path.stat().st_mtime, timezone.utc)
+        with Snapshot.open(snapshot_path) as snapshot:
+            index = EmployeeIndex(snapshot.records())
+    else:
+        watermark = datetime.now(timezone.utc)
+        index = EmployeeIndex(client.all_employees())
+
+    feed = ChangeFeed(client, index, watermark, app_config["terminated_statuses"])
+    for event in feed.stream(interval):
+        if output_format == "ndjson":
+            click.echo(event.model_dump_json())
+        else:
+            change = f"{event.previous or '-'} -> {event.current or '-'}"
+            click.echo(f"{event.type:<15} {event.email}  {change}")
+
+
+@main.command("reconcile")
+@click.argument("accounts", type=click.File("r", encoding="utf-8-sig"))
+@click.option(
+    "--email-column",
+    default="email",
+    show_default=True,
+    help="Column holding the account owner's email",
+)
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Join against a snapshot file instead of downloading the table",
+)
+@click.option(
+    "--since",
+    callback=_parse_as_of,
+    metavar="DATE",
+    help="Flag rows whose management chain changed since DATE, using recorded history",
+)
+@_history_option
+@click.option(
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="Where to write the annotated CSV (default stdout)",
+)
+def reconcile_accounts(
+    accounts: TextIO,
+    email_column: str,
+    snapshot_path: Optional[Path],
+    since: Optional[datetime],
+    history_dir: Optional[Path],
+    output: TextIO,
+) -> None:
+    """
+    Annotate a CSV of accounts with each owner's employment status and chain.
+
+    The employee table is loaded once and joined locally on normalized email,
+    so runtime is bounded by CSV parsing rather than Airtable requests.
+
+    Args:
+        accounts: CSV file with a header row.
+        email_column: Column holding the account owner's email.
+        snapshot_path: Snapshot file to join against, if given.
+        since: Compare management chains against history as of this time, if given.
+        history_dir: History directory to read, overriding config.yaml.
+        output: Destination for the annotated CSV.
+    """
+    app_config = load_app_config()
+    reader = csv.DictReader(accounts)
+    if reader.fieldnames is None or email_column not in reader.fieldnames:
+        raise click.UsageError(f"Column {email_column!r} not found in {accounts.name}")
+
+    with ExitStack() as stack:
+        directory: EmployeeDirectory
+        if snapshot_path is not None:
+            directory = stack.enter_context(Snapshot.open(snapshot_path))
+        else:
+            directory = EmployeeIndex(_make_client().all_employees())
+
+        baseline = None
+        if since is not None:
+            try:
+                baseline = stack.enter_context(_open_history(history_dir, app_config).as_of(since))
+            except LookupError as e:
+                click.echo(str(e), err=True)
+                sys.exit(1)
+
+        fieldnames = list(reader.fieldnames) + RECONCILE_COLUMNS
+        if baseline is not None:
+            fieldnames.append(CHAIN_CHANGED_COLUMN)
+        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer.writeheader()
+
+        writer.writerows(
+            reconcile(
+                reader,
+                directory,
+                email_column,
+                EmailNormalizer.from_app_config(app_config),
+                app_config["terminated_statuses"],
+                baseline=baseline,
+            )
+        )
+
+
+@main.group()
+def webhook() -> None:
+    """Receive Airtable webhook notifications."""
+
+
+@webhook.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on")
+@click.option("--port", type=int, default=8080, show_default=True, help="Port to listen on")
+@click.option("--webhook-id", help="Airtable webhook ID whose payloads are fetched on each ping")
+@click.option("--table-id", help="Only follow changes to this Airtable table ID")
+@click.option(
+    "--mac-secret",
+    envvar="SMOG_WEBHOOK_MAC_SECRET",
+    help="Base64 MAC secret used to verify notifications",
+)
+@click.option(
+    "--snapshot",
+    "snapshot_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Seed the index from a snapshot file instead of downloading the table",
+)
+def webhook_serve(
+    host: str,
+    port: int,
+    webhook_id: Optional[str],
+    table_id: Optional[str],
+    mac_secret: Optional[str],
+    snapshot_path: Optional[Path],
+) -> None:
+    """
+    Keep an in-memory index fresh from webhook notifications and serve lookups.
+
+    Args:
+        host: Address to listen on.
+        port: Port to listen on.
+        webhook_id: Webhook whose payloads are fetched on each ping.
+        table_id: Airtable table ID to follow.
+        mac_secret: Base64 MAC secret used to verify notifications.
+        snapshot_path: Snapshot file to seed the index from, if given.
+    """
+    config = load_config()
+    client = AirtableClient(config)
+
+    if snapshot_path is not None:
+        with Snapshot.open(snapshot_path) as snapshot:
+            index = EmployeeIndex(snapshot.records())
+    else:
+        index = EmployeeIndex(client.all_employees())
+
+    sync = WebhookSync(client, index, webhook_id=webhook_id, table_id=table_id, mac_secret=mac_secret)
+    server = WebhookServer((host, port), sync)
+    click.echo(f"Listening on http://{host}:{server.server_port}/ with {len(index)} employees")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@webhook.command("replay")
+@click.argument("url")
+@click.argument(
+    "payload_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--mac-secret",
+    envvar="SMOG_WEBHOOK_MAC_SECRET",
+    help="Base64 MAC secret to sign requests with",
+)
+def webhook_replay(url: str, payload_files: Tuple[Path, ...], mac_secret: Optional[str]) -> None:
+    """
+    POST recorded webhook payloads to a receiver, standing in for Airtable.
+
+    Each file holds one payload object or a list of them.
+
+    Args:
+        url: Receiver URL.
+        payload_files: JSON files with recorded payloads.
+        mac_secret: Base64 MAC secret to sign requests with, if the receiver verifies them.
+    """
+    payloads: List[Dict[str, Any]] = []
+    for path in payload_files:
+        data = json.loads(path.read_text())
+        payloads.extend(data if isinstance(data, list) else [data])
+
+    post_payloads(url, payloads, mac_secret=mac_secret)
+    click.echo(f"Posted {len(payloads)} payloads to {url}")
+
+
 if __name__ == "__main__":
     main()
@@ -1,88 +1,209 @@
 """Airtable client for employee lookups."""
 
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Collection, Dict, List, Mapping, Optional, Sequence
+from urllib.parse import quote
 
 from pyairtable import Api
 
+from smog.bloom import BloomFilter
+from smog.cache import StaleWhileRevalidateCache
+from smog.cassette import Transport
 from smog.config import AirtableConfig
-from smog.models import EmployeeRecord, EmployeeLookupResult
+from smog.deadline import DaemonExecutor, Deadline, DeadlineExceeded, HedgingPolicy, call_with_deadline
+from smog.directory import EmployeeDirectory
+from smog.models import EmployeeRecord
 
 
-class AirtableClient:
+# Record IDs per RECORD_ID() formula, keeping request URLs well under length limits.
+RECORD_ID_BATCH_SIZE = 50
+
+# Seconds allowed to establish a connection to Airtable when a timeout is set.
+CONNECT_TIMEOUT = 5
+
+
+class AirtableClient(EmployeeDirectory):
     """Client for querying employee data from Airtable."""
 
-    def __init__(self, config: AirtableConfig) -> None:
+    def __init__(
+        self,
+        config: AirtableConfig,
+        cache: Optional[StaleWhileRevalidateCache[str, Optional[EmployeeRecord]]] = None,
+        timeout: Optional[float] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        prefilter: Optional[BloomFilter] = None,
+        transport: Optional[Transport] = None,
+    ) -> None:
         """
         Initialize the Airtable client.
 
         Args:
             config: Configuration containing API key, base ID, and table name.
+            cache: Optional cache for find_by_email results, keyed by lowercased email.
+                   Expired entries are served stale while they refresh in the background.
+            timeout: Default seconds allowed per chain lookup, shared by all of its hops.
+                     Unbounded if None.
+            hedging: Policy for sending a duplicate of slow lookups. No hedging if None.
+            prefilter: Filter of known emails. Lookups for emails it rules out return
+                       None without a request. Every lookup is sent if None.
+            transport: Adapter to send requests through instead of the network directly,
+                       e.g. a RecordingTransport or ReplayTransport.
         """
         self._config = config
-        api = Api(config.api_key)
+        self._cache = cache
+        self.default_timeout = timeout
+        self._hedging = hedging
+        self.prefilter = prefilter
+        self._executor = DaemonExecutor(thread_name_prefix="smog-airtable")
+        api_timeout = None if timeout is None else (CONNECT_TIMEOUT, max(int(timeout + 0.999), 1))
+        api = Api(config.api_key, timeout=api_timeout)
+        if transport is not None:
+            transport.attach(api.session, str(api.endpoint_url))
         self._table = api.table(config.base_id, config.table_name)
 
-    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+    def find_by_email(self, email: str, timeout: Optional[float] = None) -> Optional[EmployeeRecord]:
         """
         Find an employee by email address.
 
         Args:
             email: Employee email address to search for.
+            timeout: Seconds allowed for the lookup. Unbounded if None.
 
         Returns:
             EmployeeRecord if found, None otherwise.
+
+        Raises:
+            DeadlineExceeded: If the timeout expires first.
         """
+        if self.prefilter is not None and email not in self.prefilter:
+            return None
+        deadline = None if timeout is None else Deadline(timeout)
+        if self._cache is not None:
+            return self._cache.get(
+                email.lower(), lambda: self._bounded_fetch(email, deadline), timeout=timeout
+            )
+        return self._bounded_fetch(email, deadline)
+
+    def _find_within(self, email: str, deadline: Optional[Deadline]) -> Optional[EmployeeRecord]:
+        if deadline is None:
+            return self.find_by_email(email)
+        if deadline.expired:
+            raise DeadlineExceeded(f"Deadline expired before looking up {email}")
+        return self.find_by_email(email, timeout=deadline.remaining())
+
+    def _bounded_fetch(self, email: str, deadline: Optional[Deadline]) -> Optional[EmployeeRecord]:
+        """Query Airtable under the deadline, hedging if configured."""
+        if deadline is None and self._hedging is None:
+            return self._fetch_by_email(email)
+        return call_with_deadline(
+            self._executor, lambda: self._fetch_by_email(email, deadline), deadline, self._hedging
+        )
+
+    def _fetch_by_email(self, email: str, deadline: Optional[Deadline] = None) -> Optional[EmployeeRecord]:
+        """Query Airtable for an employee, bypassing the cache."""
         formula = f"LOWER({{Email}}) = LOWER('{email}')"
-        records = self._table.all(formula=formula)
+        records: Sequence[Mapping[str, Any]]
+        if deadline is None:
+            records = self._table.all(formula=formula)
+        else:
+            records = self._first_page(formula, deadline)
 
         if not records:
             return None
 
-        record = records[0]
-        fields = record["fields"]
-
-        return EmployeeRecord(
-            email=fields.get("Email", ""),
-            manager_email=fields.get("Manager Email"),
-            employment_status=fields.get("Employee Status", "Unknown"),
-            name=fields.get("Name"),
-            title=fields.get("Title"),
-            department=fields.get("Department"),
-            division=fields.get("Division"),
-            eng_team=fields.get("Eng Team"),
-            operating_group=fields.get("Operating Group"),
-            start_date=fields.get("Start Date"),
-            state=fields.get("State"),
-            employment_type=fields.get("Employment Type"),
-            manager_name=fields.get("Manager Name"),
+        return EmployeeRecord.from_airtable_record(records[0])
+
+    def _first_page(self, formula: str, deadline: Deadline) -> List[Dict[str, Any]]:
+        """
+        Fetch the first page of List records with timeouts cut to the time left.
+
+        Table.all only applies the timeout fixed on the Api, so a call abandoned
+        at the deadline could keep waiting long after it. Going through the
+        session directly keeps authentication and rate-limit retries.
+
+        Args:
+            formula: filterByFormula expression, sent as Table.all sends it.
+            deadline: Deadline bounding the request's connect and read timeouts.
+
+        Returns:
+            Records on the first page.
+
+        Raises:
+            DeadlineExceeded: If the deadline has already passed.
+        """
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline expired before the request was sent")
+        api = self._table.api
+        # Api.build_url exists on every supported pyairtable; Table.urls is 3.x only.
+        url = api.build_url(self._config.base_id, quote(self._config.table_name, safe=""))
+        response = api.session.get(
+            str(url),
+            params={"filterByFormula": formula},
+            timeout=(min(CONNECT_TIMEOUT, remaining), remaining),
         )
+        response.raise_for_status()
+        records: List[Dict[str, Any]] = response.json().get("records", [])
+        return records
 
-    def get_employee_with_management_chain(self, email: str) -> Optional[EmployeeLookupResult]:
+    def all_employees(self) -> List[EmployeeRecord]:
         """
-        Get employee with their full management chain.
+        Fetch every employee in the table.
 
-        Looks up the employee, their manager, and their manager's manager.
+        Returns:
+            List of EmployeeRecord, one per Airtable row.
+        """
+        return [EmployeeRecord.from_airtable_record(record) for record in self._table.all()]
+
+    def modified_since(self, since: datetime) -> List[EmployeeRecord]:
+        """
+        Fetch employees whose Airtable row changed after a point in time.
 
         Args:
-            email: Employee email address to search for.
+            since: Timezone-aware watermark; rows modified at or before it are skipped.
 
         Returns:
-            EmployeeLookupResult with employee and management chain, or None if employee not found.
+            List of EmployeeRecord for the modified rows.
         """
-        employee = self.find_by_email(email)
-        if employee is None:
-            return None
+        watermark = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{watermark}'))"
+        return [EmployeeRecord.from_airtable_record(record) for record in self._table.all(formula=formula)]
 
-        manager = None
-        managers_manager = None
+    def find_by_record_ids(self, record_ids: Collection[str]) -> List[EmployeeRecord]:
+        """
+        Fetch specific employees by Airtable record ID.
 
-        if employee.manager_email:
-            manager = self.find_by_email(employee.manager_email)
-            if manager and manager.manager_email:
-                managers_manager = self.find_by_email(manager.manager_email)
+        Args:
+            record_ids: Record IDs to fetch. IDs that no longer exist are skipped.
 
-        return EmployeeLookupResult(
-            employee=employee,
-            manager=manager,
-            managers_manager=managers_manager,
-        )
+        Returns:
+            List of EmployeeRecord for the IDs that were found.
+        """
+        ids = sorted(record_ids)
+        employees: List[EmployeeRecord] = []
+        for start in range(0, len(ids), RECORD_ID_BATCH_SIZE):
+            batch = ids[start:start + RECORD_ID_BATCH_SIZE]
+            formula = "OR(" + ", ".join(f"RECORD_ID() = '{record_id}'" for record_id in batch) + ")"
+            employees.extend(
+                EmployeeRecord.from_airtable_record(record) for record in self._table.all(formula=formula)
+            )
+        return employees
+
+    def webhook_payloads(self, webhook_id: str, cursor: int = 1) -> List[Dict[str, Any]]:
+        """
+        Fetch webhook payloads from Airtable, starting at a cursor.
+
+        Args:
+            webhook_id: ID of the webhook registered on this base.
+            cursor: Cursor of the first payload to fetch.
+
+        Returns:
+            Payloads in Airtable's JSON shape, each with its "cursor" added.
+        """
+        webhook = self._table.base.webhook(webhook_id)
+        payloads = []
+        for payload in webhook.payloads(cursor):
+            data: Dict[str, Any] = payload.model_dump(mode="json", by_alias=True, exclude_none=True)
+            data["cursor"] = payload.cursor
+            payloads.append(data)
+        return payloads
@@ -1,11 +1,125 @@
 """Configuration loading for Airtable client."""
 
+import hashlib
+import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-import yaml
 from pydantic import BaseModel, Field
 
+# Employee Status values that mean the person no longer works here.
+DEFAULT_TERMINATED_STATUSES = ("Terminated",)
+
+# Environment variables holding the contents of secrets.yaml / config.yaml as
+# JSON. When set they are used instead of the default files, with no file I/O.
+SECRETS_ENV = "SMOG_SECRETS"
+APP_CONFIG_ENV = "SMOG_CONFIG"
+
+# Directory for parsed-config caches; defaults to $XDG_CACHE_HOME/smog or ~/.cache/smog.
+CACHE_DIR_ENV = "SMOG_CACHE_DIR"
+
+_FileKey = Tuple[int, int]
+
+# Parsed files for this process, keyed by path; valid while (mtime_ns, size) match.
+_parsed: Dict[Path, Tuple[_FileKey, Any]] = {}
+
+
+def _cache_dir() -> Path:
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "smog"
+
+
+def _parse_yaml(path: Path) -> Any:
+    """Parse a YAML file with the LibYAML loader when PyYAML was built with it."""
+    # Imported here so runs served from the parsed cache skip importing PyYAML.
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _read_cache(cache_path: Path, key: _FileKey) -> Tuple[bool, Any]:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return False, None
+    if not isinstance(cached, dict) or cached.get("key") != list(key):
+        return False, None
+    return True, cached.get("data")
+
+
+def _write_cache(cache_path: Path, key: _FileKey, data: Any) -> None:
+    try:
+        content = json.dumps({"key": list(key), "data": data}, separators=(",", ":"))
+    except (TypeError, ValueError):
+        # YAML values without a JSON form (e.g. dates); parse the file each time.
+        return
+    try:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # mkstemp creates the file readable by this user only.
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        os.unlink(tmp_name)
+
+
+def load_yaml_file(path: Path, persist: bool = True) -> Any:
+    """
+    Load a YAML file, reusing an earlier parse while the file is unchanged.
+
+    Parsed contents are kept in memory and, if persist is set, in a JSON
+    cache file under the cache directory, both keyed by the file's mtime and
+    size, so repeated CLI runs skip YAML parsing (and importing PyYAML) until
+    the file changes.
+
+    Args:
+        path: YAML file to load.
+        persist: Whether the parse may be written to the cache directory. Pass
+                 False for files holding credentials; any cache file an earlier
+                 version wrote for them is removed.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    path = path.resolve()
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    memo = _parsed.get(path)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    cache_name = hashlib.blake2b(str(path).encode("utf-8"), digest_size=12).hexdigest() + ".json"
+    cache_path = _cache_dir() / cache_name
+    if persist:
+        found, data = _read_cache(cache_path, key)
+        if not found:
+            data = _parse_yaml(path)
+            _write_cache(cache_path, key, data)
+    else:
+        data = _parse_yaml(path)
+        try:
+            cache_path.unlink()
+        except OSError:
+            pass
+
+    _parsed[path] = (key, data)
+    return data
+
 
 class AirtableConfig(BaseModel):
     """Configuration for Airtable API access."""
@@ -13,35 +127,72 @@ class AirtableConfig(BaseModel):
     api_key: str = Field(..., description="Airtable API key")
     base_id: str = Field(..., description="Airtable base ID")
     table_name: str = Field(..., description="Name of the users table")
+    name: str = Field("", description="Label for this source when several bases are configured")
+    domains: List[str] = Field(
+        default_factory=list,
+        description="Email domains this source is authoritative for; lookups for them query only this source",
+    )
 
 
-def load_config(secrets_path: Optional[Path] = None) -> AirtableConfig:
+def load_sources(secrets_path: Optional[Path] = None) -> List[AirtableConfig]:
     """
-    Load Airtable configuration from secrets.yaml.
+    Load every configured Airtable source from secrets.yaml.
+
+    Either the airtable section holds a single api_key/base_id/table_name, or
+    it holds a "sources" list of them. Sources without their own api_key use
+    the section's api_key.
 
     Args:
         secrets_path: Path to secrets.yaml file. If None, uses default location.
 
     Returns:
-        AirtableConfig instance with loaded configuration.
+        AirtableConfig per source, in configured order.
 
     Raises:
         FileNotFoundError: If secrets file doesn't exist.
         KeyError: If required configuration keys are missing.
     """
-    if secrets_path is None:
-        secrets_path = Path(__file__).parent.parent.parent / "secrets.yaml"
-
-    with open(secrets_path) as f:
-        secrets = yaml.safe_load(f)
+    secrets: Mapping[str, Any]
+    if secrets_path is None and os.environ.get(SECRETS_ENV):
+        secrets = json.loads(os.environ[SECRETS_ENV])
+    else:
+        if secrets_path is None:
+            secrets_path = Path(__file__).parent.parent.parent / "secrets.yaml"
+        # Credentials stay in this process; only config.yaml is cached on disk.
+        secrets = load_yaml_file(secrets_path, persist=False)
 
     airtable_config = secrets["airtable"]
+    sources = airtable_config.get("sources") or [airtable_config]
+
+    return [
+        AirtableConfig(
+            api_key=source.get("api_key") or airtable_config["api_key"],
+            base_id=source["base_id"],
+            table_name=source["table_name"],
+            name=source.get("name", ""),
+            domains=source.get("domains") or [],
+        )
+        for source in sources
+    ]
 
-    return AirtableConfig(
-        api_key=airtable_config["api_key"],
-        base_id=airtable_config["base_id"],
-        table_name=airtable_config["table_name"],
-    )
+
+def load_config(secrets_path: Optional[Path] = None) -> AirtableConfig:
+    """
+    Load Airtable configuration from secrets.yaml.
+
+    When several sources are configured, the first one is returned.
+
+    Args:
+        secrets_path: Path to secrets.yaml file. If None, uses default location.
+
+    Returns:
+        AirtableConfig instance with loaded configuration.
+
+    Raises:
+        FileNotFoundError: If secrets file doesn't exist.
+        KeyError: If required configuration keys are missing.
+    """
+    return load_sources(secrets_path)[0]
 
 
 def load_app_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
@@ -55,16 +206,25 @@ def load_app_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
         Dictionary with application configuration.
         Returns empty dict with default values if config file doesn't exist.
     """
-    if config_path is None:
-        config_path = Path(__file__).parent.parent.parent / "config.yaml"
-
-    # Return defaults if config file doesn't exist
-    if not config_path.exists():
-        return {"default_email_domain": ""}
-
-    with open(config_path) as f:
-        config = yaml.safe_load(f) or {}
+    config: Mapping[str, Any]
+    if config_path is None and os.environ.get(APP_CONFIG_ENV):
+        config = json.loads(os.environ[APP_CONFIG_ENV])
+    else:
+        if config_path is None:
+            config_path = Path(__file__).parent.parent.parent / "config.yaml"
+
+        # Defaults apply to every key if config file doesn't exist
+        try:
+            config = load_yaml_file(config_path) or {}
+        except FileNotFoundError:
+            config = {}
 
     return {
         "default_email_domain": config.get("default_email_domain", ""),
+        "terminated_statuses": config.get("terminated_statuses") or list(DEFAULT_TERMINATED_STATUSES),
+        "history_dir": config.get("history_dir", ""),
+        "database": config.get("database", ""),
+        "prefilter": config.get("prefilter", ""),
+        "domain_aliases": config.get("domain_aliases") or {},
+        "strip_plus_tags": bool(config.get("strip_plus_tags", False)),
     }
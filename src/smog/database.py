@@ -0,0 +1,174 @@
+"""SQLite materialization of the employee table for local ad-hoc queries."""
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from smog.models import EmployeeRecord
+
+# Columns with their own index, for WHERE and GROUP BY queries over org facets.
+FACET_COLUMNS = (
+    "employment_status",
+    "employment_type",
+    "department",
+    "division",
+    "eng_team",
+    "operating_group",
+    "state",
+)
+
+
+def closure_rows(records: Sequence[EmployeeRecord]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Derive the management closure of a table.
+
+    Depth 0 is the employee themself, 1 their manager, and so on up to the
+    top. Each chain is built once from the manager's already-built chain, so
+    the work is proportional to the number of rows produced. A manager
+    missing from the table ends the chain, and a cycle in Manager Email is
+    cut at the first repeated employee.
+
+    Args:
+        records: Employee records.
+
+    Yields:
+        (employee email, ancestor email, depth) for every employee and each of their managers.
+    """
+    by_key = {record.email.lower(): record for record in records}
+    chains: Dict[str, List[Tuple[str, int]]] = {}
+
+    for start in by_key:
+        # Climb until reaching a chain that is already built, or the top.
+        path: List[str] = []
+        on_path = set()
+        key: Optional[str] = start
+        while key is not None and key in by_key and key not in chains and key not in on_path:
+            path.append(key)
+            on_path.add(key)
+            manager = by_key[key].manager_email
+            key = manager.lower() if manager else None
+
+        above = chains[key] if key is not None and key in chains else []
+        for key in reversed(path):
+            chain = [(by_key[key].email, 0)] + [(ancestor, depth + 1) for ancestor, depth in above]
+            chains[key] = chain
+            above = chain
+
+    for key, chain in chains.items():
+        email = by_key[key].email
+        for ancestor, depth in chain:
+            yield email, ancestor, depth
+
+
+def write_database(records: Iterable[EmployeeRecord], path: Path) -> int:
+    """
+    Write employee records and their management closure to a SQLite database.
+
+    Tables:
+        employees: one row per employee, a column per EmployeeRecord field,
+            emails compared case-insensitively. Indexed on manager_email and
+            every facet column.
+        closure: (employee, ancestor, depth), including depth 0 for each
+            employee. Indexed for both "chain of X" and "everyone under X".
+
+    The database is built in a temporary file and renamed into place, so
+    readers never see a half-written file.
+
+    Args:
+        records: Employee records to store. Later records replace earlier ones with the same email.
+        path: Destination database file.
+
+    Returns:
+        Number of employees written.
+    """
+    unique: Dict[str, EmployeeRecord] = {}
+    for record in records:
+        unique[record.email.lower()] = record
+    rows = list(unique.values())
+
+    columns = list(EmployeeRecord.model_fields)
+    definitions = ", ".join(
+        "email TEXT PRIMARY KEY COLLATE NOCASE" if column == "email"
+        else f"{column} TEXT COLLATE NOCASE" if column == "manager_email"
+        else f"{column} TEXT"
+        for column in columns
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_name)
+        try:
+            # The file is not visible to readers until it is renamed into place.
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            with connection:
+                connection.execute(f"CREATE TABLE employees ({definitions})")
+                connection.executemany(
+                    f"INSERT INTO employees ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    ([getattr(record, column) for column in columns] for record in rows),
+                )
+                connection.execute(
+                    "CREATE TABLE closure ("
+                    "employee TEXT NOT NULL COLLATE NOCASE, "
+                    "ancestor TEXT NOT NULL COLLATE NOCASE, "
+                    "depth INTEGER NOT NULL, "
+                    "PRIMARY KEY (employee, ancestor)"
+                    ") WITHOUT ROWID"
+                )
+                connection.executemany("INSERT INTO closure VALUES (?, ?, ?)", closure_rows(rows))
+                connection.execute("CREATE INDEX employees_manager_email ON employees (manager_email)")
+                for column in FACET_COLUMNS:
+                    connection.execute(f"CREATE INDEX employees_{column} ON employees ({column})")
+                connection.execute("CREATE INDEX closure_ancestor ON closure (ancestor, depth)")
+            connection.execute("ANALYZE")
+        finally:
+            connection.close()
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return len(rows)
+
+
+def query(
+    path: Path,
+    sql: str,
+    parameters: Sequence[Any] = (),
+) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """
+    Run a read-only query against a database written by write_database.
+
+    Args:
+        path: Database file.
+        sql: A single SQL statement.
+        parameters: Values for ? placeholders in the statement.
+
+    Returns:
+        Column names and an iterator over the result rows. Rows are fetched
+        lazily and the connection closes when the iterator is exhausted.
+
+    Raises:
+        FileNotFoundError: If the database does not exist.
+        sqlite3.Error: If the statement is invalid or tries to write.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Database not found: {path}")
+    connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(sql, parameters)
+    except BaseException:
+        connection.close()
+        raise
+    columns = [description[0] for description in cursor.description or ()]
+
+    def rows() -> Iterator[Tuple[Any, ...]]:
+        try:
+            yield from cursor
+        finally:
+            connection.close()
+
+    return columns, rows()
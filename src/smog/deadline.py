@@ -0,0 +1,245 @@
+"""Deadlines and hedged calls for bounding lookup latency."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Deque, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a lookup's time budget runs out before it completes."""
+
+
+class Deadline:
+    """A point in time by which an operation, and every step inside it, must finish."""
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline.
+            clock: Monotonic time source, in seconds.
+        """
+        self._clock = clock
+        self._expires_at = clock() + timeout
+
+    def remaining(self) -> float:
+        """
+        Seconds left before the deadline.
+
+        Returns:
+            Remaining time, never negative.
+        """
+        return max(self._expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+
+class DaemonExecutor(Executor):
+    """
+    Executor running each call on its own daemon thread.
+
+    Calls abandoned at a deadline may still be blocked on the network; as
+    daemon threads they cannot keep the interpreter from exiting, unlike a
+    ThreadPoolExecutor's workers, which are joined at exit.
+    """
+
+    def __init__(self, thread_name_prefix: str = "smog-call") -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            thread_name_prefix: Prefix for the names of the threads started.
+        """
+        self._thread_name_prefix = thread_name_prefix
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> "Future[T]":
+        future: "Future[T]" = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        with self._lock:
+            self._counter += 1
+            name = f"{self._thread_name_prefix}_{self._counter}"
+        threading.Thread(target=run, name=name, daemon=True).start()
+        return future
+
+
+class LatencyTracker:
+    """Sliding window of call latencies used to pick the hedge delay."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent latencies kept.
+            min_samples: Samples needed before a percentile is reported.
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a latency sample.
+
+        Args:
+            seconds: Observed call latency.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Return a latency percentile over the window.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            Latency in seconds, or None until enough samples are recorded.
+        """
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class HedgingPolicy:
+    """
+    Decides when to send a duplicate request, within a budget.
+
+    A hedge fires once the primary request has been outstanding for the
+    observed p95 latency, and at most budget x (requests made) hedges are
+    sent, so hedging adds a bounded fraction of load against the API's rate limit.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.1,
+        percentile: float = 0.95,
+        tracker: Optional[LatencyTracker] = None,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            budget: Maximum hedged requests as a fraction of all requests.
+            percentile: Latency percentile after which a hedge fires.
+            tracker: Latency window to read; a new one if None.
+        """
+        self.tracker = tracker or LatencyTracker()
+        self._budget = budget
+        self._percentile = percentile
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Count a request and return how long to wait before hedging it.
+
+        Returns:
+            Delay in seconds, or None if there is no latency history yet.
+        """
+        with self._lock:
+            self._requests += 1
+        return self.tracker.percentile(self._percentile)
+
+    def try_acquire(self) -> bool:
+        """
+        Reserve a hedge if the budget allows.
+
+        Returns:
+            True if a hedge may be sent.
+        """
+        with self._lock:
+            if self._hedges + 1 > self._budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+
+def call_with_deadline(
+    executor: Executor,
+    fn: Callable[[], T],
+    deadline: Optional[Deadline],
+    hedging: Optional[HedgingPolicy] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> T:
+    """
+    Run fn within a deadline, optionally hedging it with a duplicate call.
+
+    Calls that miss the deadline keep running in the executor, but their
+    result is discarded. Use a DaemonExecutor so they cannot delay exit.
+
+    Args:
+        executor: Executor the call (and any hedge) runs on.
+        fn: Idempotent call to make.
+        deadline: Deadline to finish by. Unbounded if None.
+        hedging: Policy deciding when to send a duplicate. No hedging if None.
+        clock: Monotonic time source, in seconds.
+
+    Returns:
+        The result of whichever call succeeded first.
+
+    Raises:
+        DeadlineExceeded: If no call succeeded before the deadline.
+        Exception: The error of the last failing call, if every call failed.
+    """
+
+    def timed() -> T:
+        started = clock()
+        result = fn()
+        if hedging is not None:
+            hedging.tracker.record(clock() - started)
+        return result
+
+    def time_left() -> Optional[float]:
+        return None if deadline is None else deadline.remaining()
+
+    pending: Set["Future[T]"] = {executor.submit(timed)}
+    hedge_delay = hedging.hedge_delay() if hedging is not None else None
+    hedged = hedging is None or hedge_delay is None
+    error: Optional[BaseException] = None
+
+    while pending:
+        wait_for = time_left()
+        if not hedged:
+            wait_for = hedge_delay if wait_for is None else min(wait_for, hedge_delay or 0.0)
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            exception = future.exception()
+            if exception is None:
+                return future.result()
+            error = exception
+
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded("Deadline expired before the call completed")
+        if not hedged and not done:
+            hedged = True
+            if hedging is not None and hedging.try_acquire():
+                pending.add(executor.submit(timed))
+
+    assert error is not None
+    raise error
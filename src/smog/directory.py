@@ -0,0 +1,129 @@
+"""Common lookup interface shared by all employee data sources."""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+from smog.deadline import Deadline, DeadlineExceeded
+from smog.models import EmployeeRecord, EmployeeLookupResult
+
+
+class EmployeeDirectory(ABC):
+    """
+    Base class for anything that can resolve an employee by email.
+
+    Subclasses only implement find_by_email; the management chain walk is
+    shared so every source (live Airtable, snapshot files, ...) answers
+    chain lookups the same way.
+    """
+
+    # Time budget in seconds for a chain lookup when none is passed; None is unbounded.
+    default_timeout: Optional[float] = None
+
+    @abstractmethod
+    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by email address.
+
+        Args:
+            email: Employee email address to search for.
+
+        Returns:
+            EmployeeRecord if found, None otherwise.
+        """
+
+    def _find_within(self, email: str, deadline: Optional[Deadline]) -> Optional[EmployeeRecord]:
+        """
+        Find an employee, giving up once the deadline has passed.
+
+        Sources whose lookups can block override this to bound the lookup itself.
+
+        Raises:
+            DeadlineExceeded: If the deadline has already passed.
+        """
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(f"Deadline expired before looking up {email}")
+        return self.find_by_email(email)
+
+    def get_employee_with_management_chain(
+        self,
+        email: str,
+        timeout: Optional[float] = None,
+    ) -> Optional[EmployeeLookupResult]:
+        """
+        Get employee with their full management chain.
+
+        Looks up the employee, their manager, and their manager's manager.
+
+        Args:
+            email: Employee email address to search for.
+            timeout: Seconds allowed for the whole walk; each hop only gets the
+                     time left. Defaults to default_timeout.
+
+        Returns:
+            EmployeeLookupResult with employee and management chain, or None if employee not found.
+            If the deadline expires after the employee was found, the managers not yet
+            found are None and the result is marked partial.
+
+        Raises:
+            DeadlineExceeded: If the deadline expires before the employee is found.
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        deadline = None if timeout is None else Deadline(timeout)
+
+        employee = self._find_within(email, deadline)
+        if employee is None:
+            return None
+
+        manager = None
+        managers_manager = None
+        partial = False
+
+        try:
+            if employee.manager_email:
+                manager = self._find_within(employee.manager_email, deadline)
+                if manager and manager.manager_email:
+                    managers_manager = self._find_within(manager.manager_email, deadline)
+        except DeadlineExceeded:
+            partial = True
+
+        return EmployeeLookupResult(
+            employee=employee,
+            manager=manager,
+            managers_manager=managers_manager,
+            partial=partial,
+        )
+
+
+def first_with_management_chain(
+    directory: EmployeeDirectory,
+    emails: Sequence[str],
+    timeout: Optional[float] = None,
+) -> Optional[EmployeeLookupResult]:
+    """
+    Look up candidate addresses in order and return the first employee found.
+
+    Meant for local directories, which also match alternate emails. A live
+    AirtableClient matches only {Email}, so send it just the normalized form.
+
+    Args:
+        directory: Directory to look up in.
+        emails: Addresses to try, e.g. from EmailNormalizer.candidates.
+        timeout: Seconds allowed for all candidates together. If None, each
+                 lookup uses the directory's default_timeout.
+
+    Returns:
+        EmployeeLookupResult for the first candidate found, or None if none is.
+
+    Raises:
+        DeadlineExceeded: If the deadline expires before an employee is found.
+    """
+    deadline = None if timeout is None else Deadline(timeout)
+    for email in emails:
+        if deadline is None:
+            result = directory.get_employee_with_management_chain(email)
+        else:
+            result = directory.get_employee_with_management_chain(email, timeout=deadline.remaining())
+        if result is not None:
+            return result
+    return None
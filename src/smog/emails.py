@@ -0,0 +1,161 @@
+"""Email address normalization."""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+_ALTERNATE_EMAIL_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def lookup_candidates(email: str, normalize: Callable[[str], str]) -> List[str]:
+    """
+    List the addresses to try, in order, when looking up a typed email.
+
+    The address as typed comes first, since rewriting can lose information
+    the alternate-email index needs (an acquired domain listed under
+    Alternate Emails, a primary address that really contains "+"). The
+    normalized form follows if it differs. Bare usernames have nothing to
+    look up until normalized, so only the normalized form is tried.
+
+    Args:
+        email: Email address or username as entered.
+        normalize: Normalization applied to produce the second candidate.
+
+    Returns:
+        One or two addresses, without case-insensitive duplicates.
+    """
+    email = email.strip()
+    normalized = normalize(email)
+    if "@" not in email or normalized.lower() == email.lower():
+        return [normalized]
+    return [email, normalized]
+
+
+def split_alternate_emails(value: Optional[str]) -> List[str]:
+    """
+    Split an Alternate Emails field into individual addresses.
+
+    Args:
+        value: Field text with addresses separated by commas, semicolons or whitespace.
+
+    Returns:
+        Addresses containing an @, in field order.
+    """
+    if not value:
+        return []
+    return [part for part in _ALTERNATE_EMAIL_SEPARATORS.split(value) if "@" in part]
+
+
+class EmailNormalizer:
+    """
+    Normalization pipeline applied to emails before lookup.
+
+    Steps, in order: trim whitespace, append the default domain to bare
+    usernames, rewrite aliased domains to their canonical domain, and
+    optionally strip "+tag" plus-addressing from the local part.
+    """
+
+    def __init__(
+        self,
+        default_domain: str = "",
+        domain_aliases: Optional[Mapping[str, str]] = None,
+        strip_plus_tags: bool = False,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            default_domain: Domain to append if email has no @. Empty to leave usernames alone.
+            domain_aliases: Map of alias domain to canonical domain, e.g. an acquired company's domain.
+            strip_plus_tags: Whether to drop "+tag" from the local part.
+        """
+        self._default_domain = default_domain
+        self._domain_aliases = {
+            alias.lower(): canonical for alias, canonical in (domain_aliases or {}).items()
+        }
+        self._strip_plus_tags = strip_plus_tags
+
+    @classmethod
+    def from_app_config(cls, app_config: Mapping[str, Any]) -> "EmailNormalizer":
+        """
+        Build a pipeline from the dictionary returned by load_app_config.
+
+        Args:
+            app_config: Application configuration.
+
+        Returns:
+            EmailNormalizer using the configured settings.
+        """
+        return cls(
+            default_domain=app_config.get("default_email_domain", ""),
+            domain_aliases=app_config.get("domain_aliases"),
+            strip_plus_tags=app_config.get("strip_plus_tags", False),
+        )
+
+    def __call__(self, email: str) -> str:
+        """
+        Normalize an email.
+
+        Args:
+            email: Email address or username.
+
+        Returns:
+            Normalized email address.
+        """
+        email = email.strip()
+        if "@" not in email:
+            return f"{email}@{self._default_domain}" if self._default_domain else email
+
+        local, _, domain = email.rpartition("@")
+        domain = self._domain_aliases.get(domain.lower(), domain)
+        if self._strip_plus_tags and "+" in local:
+            local = local.split("+", 1)[0]
+        return f"{local}@{domain}"
+
+    def candidates(self, email: str) -> List[str]:
+        """
+        List the addresses to try for a typed email: as typed, then normalized.
+
+        Args:
+            email: Email address or username.
+
+        Returns:
+            One or two addresses; see lookup_candidates.
+        """
+        return lookup_candidates(email, self)
+
+    def unique(self, emails: Iterable[str]) -> List[str]:
+        """
+        Normalize a batch of emails and drop duplicates.
+
+        Args:
+            emails: Emails or usernames, possibly repeated or differing only in case or alias.
+
+        Returns:
+            Normalized emails, first occurrence kept, in input order.
+        """
+        seen: Dict[str, str] = {}
+        for email in emails:
+            normalized = self(email)
+            seen.setdefault(normalized.lower(), normalized)
+        return list(seen.values())
+
+
+def normalize_email(
+    email: str,
+    default_domain: str,
+    domain_aliases: Optional[Mapping[str, str]] = None,
+    strip_plus_tags: bool = False,
+) -> str:
+    """
+    Normalize email by optionally appending default domain.
+
+    Args:
+        email: Email address or username.
+        default_domain: Domain to append if email has no @ and domain is configured.
+        domain_aliases: Map of alias domain to canonical domain.
+        strip_plus_tags: Whether to drop "+tag" from the local part.
+
+    Returns:
+        Normalized email address.
+    """
+    return EmailNormalizer(default_domain, domain_aliases, strip_plus_tags)(email)
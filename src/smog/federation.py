@@ -0,0 +1,176 @@
+"""Lookups spanning several Airtable bases."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+from smog.bloom import BloomFilter
+from smog.cassette import Transport
+from smog.client import AirtableClient
+from smog.config import AirtableConfig
+from smog.deadline import DaemonExecutor, Deadline, DeadlineExceeded, HedgingPolicy
+from smog.directory import EmployeeDirectory
+from smog.models import EmployeeRecord
+
+T = TypeVar("T")
+
+
+class FederatedClient(EmployeeDirectory):
+    """
+    Client querying several Airtable sources as one employee table.
+
+    An email whose domain is claimed by some sources (their configured
+    domains) is only looked up in those sources. Any other email is looked
+    up in every source concurrently and the first hit wins. Because the chain
+    walk calls find_by_email per hop, management chains that cross bases
+    resolve like any other.
+    """
+
+    # Filter of known emails checked before any source is queried; None checks nothing.
+    prefilter: Optional[BloomFilter] = None
+
+    def __init__(self, clients: Sequence[AirtableClient], domains: Sequence[Sequence[str]] = ()) -> None:
+        """
+        Initialize the federated client.
+
+        Args:
+            clients: One client per source, in priority order.
+            domains: For each client, the email domains it is authoritative for.
+        """
+        self._clients = list(clients)
+        self._routes: Dict[str, List[AirtableClient]] = {}
+        for client, client_domains in zip(self._clients, domains):
+            for domain in client_domains:
+                self._routes.setdefault(domain.lower(), []).append(client)
+        # Lookups abandoned at a deadline run on daemon threads so they cannot delay exit.
+        self._executor = DaemonExecutor(thread_name_prefix="smog-fanout")
+
+    @classmethod
+    def from_configs(
+        cls,
+        configs: Sequence[AirtableConfig],
+        timeout: Optional[float] = None,
+        hedge: bool = False,
+        prefilter: Optional[BloomFilter] = None,
+        transport: Optional[Transport] = None,
+    ) -> "FederatedClient":
+        """
+        Build a federated client from source configurations.
+
+        Args:
+            configs: Source configurations, e.g. from load_sources.
+            timeout: Default seconds allowed per chain lookup. Unbounded if None.
+            hedge: Whether each source hedges its slow lookups.
+            prefilter: Filter of known emails across all sources. Emails it rules out
+                       return None without querying any source.
+            transport: Adapter every source sends its requests through, if given.
+
+        Returns:
+            FederatedClient with one AirtableClient per source.
+        """
+        clients = [
+            AirtableClient(
+                config, timeout=timeout, hedging=HedgingPolicy() if hedge else None, transport=transport
+            )
+            for config in configs
+        ]
+        federated = cls(clients, [config.domains for config in configs])
+        federated.default_timeout = timeout
+        federated.prefilter = prefilter
+        return federated
+
+    def close(self) -> None:
+        """Shut down the fan-out executor; lookups still running finish on their daemon threads."""
+        self._executor.shutdown(wait=False)
+
+    def _clients_for(self, email: str) -> List[AirtableClient]:
+        domain = email.rpartition("@")[2].lower()
+        return self._routes.get(domain, self._clients)
+
+    def _gather(self, calls: Sequence[Callable[[], T]]) -> List[T]:
+        """Run calls concurrently and return their results in call order."""
+        if len(calls) == 1:
+            return [calls[0]()]
+        return [future.result() for future in [self._executor.submit(call) for call in calls]]
+
+    def find_by_email(self, email: str, timeout: Optional[float] = None) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by email address across the sources.
+
+        Args:
+            email: Employee email address to search for.
+            timeout: Seconds allowed for the lookup. Unbounded if None.
+
+        Returns:
+            EmployeeRecord from the first source to find it, None if no source does.
+
+        Raises:
+            DeadlineExceeded: If the timeout expires before any source finds the employee.
+            Exception: A source's error, if no other source found the employee.
+        """
+        if self.prefilter is not None and email not in self.prefilter:
+            return None
+        clients = self._clients_for(email)
+        if len(clients) == 1:
+            return clients[0].find_by_email(email, timeout=timeout)
+
+        deadline = None if timeout is None else Deadline(timeout)
+        pending = {self._executor.submit(client.find_by_email, email, timeout) for client in clients}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=None if deadline is None else deadline.remaining(),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                _discard(pending)
+                raise DeadlineExceeded(f"Deadline expired before any source found {email}")
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                record = future.result()
+                if record is not None:
+                    _discard(pending)
+                    return record
+        if error is not None:
+            raise error
+        return None
+
+    def _find_within(self, email: str, deadline: Optional[Deadline]) -> Optional[EmployeeRecord]:
+        if deadline is None:
+            return self.find_by_email(email)
+        if deadline.expired:
+            raise DeadlineExceeded(f"Deadline expired before looking up {email}")
+        return self.find_by_email(email, timeout=deadline.remaining())
+
+    def all_employees(self) -> List[EmployeeRecord]:
+        """
+        Fetch every employee from every source concurrently.
+
+        Returns:
+            List of EmployeeRecord, sources in configured order.
+        """
+        pages = self._gather([client.all_employees for client in self._clients])
+        return [record for page in pages for record in page]
+
+    def modified_since(self, since: datetime) -> List[EmployeeRecord]:
+        """
+        Fetch employees modified after a point in time, from every source.
+
+        Args:
+            since: Timezone-aware watermark.
+
+        Returns:
+            List of EmployeeRecord for the modified rows.
+        """
+        pages = self._gather([partial(client.modified_since, since) for client in self._clients])
+        return [record for page in pages for record in page]
+
+
+def _discard(futures: Set["Future[Optional[EmployeeRecord]]"]) -> None:
+    """Cancel lookups that have not started; running ones finish and are ignored."""
+    for future in futures:
+        future.cancel()
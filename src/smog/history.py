@@ -0,0 +1,266 @@
+"""
+Point-in-time history of the employee table.
+
+A history directory holds full snapshots ("bases") plus one delta file per
+sync listing only the records that changed since the previous sync, keyed
+by Airtable record ID. Storage grows with change volume rather than table
+size. Reading the table as of a past time opens the nearest earlier base
+and overlays the deltas after it; only the deltas are held in memory.
+
+Files:
+
+    base-<timestamp>.snap       snapshot (see smog.snapshot) of the full table
+    delta-<timestamp>.jsonl.gz  gzipped JSON lines: {"id": ..., "record": {...}}
+                                or {"id": ..., "deleted": true}
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from smog.directory import EmployeeDirectory
+from smog.emails import split_alternate_emails
+from smog.index import record_hash
+from smog.models import EmployeeRecord
+from smog.snapshot import Snapshot, write_snapshot
+
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%fZ"
+_BASE_PREFIX = "base-"
+_BASE_SUFFIX = ".snap"
+_DELTA_PREFIX = "delta-"
+_DELTA_SUFFIX = ".jsonl.gz"
+
+
+def _record_key(record: EmployeeRecord) -> str:
+    """Key a record by Airtable ID, falling back to its email."""
+    return record.record_id or f"email:{record.email.lower()}"
+
+
+def _format_timestamp(when: datetime) -> str:
+    return when.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+
+def _parse_timestamp(text: str) -> datetime:
+    return datetime.strptime(text, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+
+class HistoricalView(EmployeeDirectory):
+    """Read-only view of the employee table as of a past time."""
+
+    def __init__(self, base: Snapshot, overlay: Dict[str, Optional[EmployeeRecord]]) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            base: Snapshot of the nearest base at or before the requested time.
+            overlay: Latest version of every record changed after the base, keyed
+                     by record key. None marks a deleted record.
+        """
+        self._base = base
+        self._overlay = overlay
+        self._overlay_by_email: Dict[str, EmployeeRecord] = {}
+        self._overlay_aliases: Dict[str, EmployeeRecord] = {}
+        for record in overlay.values():
+            if record is None:
+                continue
+            self._overlay_by_email[record.email.lower()] = record
+            for alias in split_alternate_emails(record.alternate_emails):
+                self._overlay_aliases.setdefault(alias.lower(), record)
+
+    def close(self) -> None:
+        """Unmap the base snapshot."""
+        self._base.close()
+
+    def __enter__(self) -> "HistoricalView":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by email address as of the view's time.
+
+        Args:
+            email: Employee email or alternate email to search for (case-insensitive).
+                   A primary email wins over another employee's alternate.
+
+        Returns:
+            EmployeeRecord if the employee existed with that email, None otherwise.
+        """
+        record = self._overlay_by_email.get(email.lower())
+        if record is not None:
+            return record
+        record = self._base.find_by_email(email)
+        if record is not None and _record_key(record) not in self._overlay:
+            if record.email.lower() == email.lower():
+                return record
+            # Matched an alternate in the base; a changed record's alternate wins over it.
+            return self._overlay_aliases.get(email.lower(), record)
+        return self._overlay_aliases.get(email.lower())
+
+    def records(self) -> Iterator[EmployeeRecord]:
+        """
+        Iterate over every record as of the view's time.
+
+        Returns:
+            Iterator of EmployeeRecord, streaming the base and then records added later.
+        """
+        seen = set()
+        for record in self._base.records():
+            key = _record_key(record)
+            seen.add(key)
+            if key in self._overlay:
+                current = self._overlay[key]
+                if current is not None:
+                    yield current
+            else:
+                yield record
+        for key, current in self._overlay.items():
+            if key not in seen and current is not None:
+                yield current
+
+
+class History:
+    """A directory of base snapshots and per-sync record deltas."""
+
+    def __init__(self, directory: Path, rebase_ratio: float = 0.5) -> None:
+        """
+        Initialize the history.
+
+        Args:
+            directory: Directory holding the history files. Created if missing.
+            rebase_ratio: Write a new base instead of a delta once the records
+                          changed since the last base exceed this fraction of the table.
+        """
+        self._directory = Path(directory)
+        self._rebase_ratio = rebase_ratio
+
+    def _files(self, prefix: str, suffix: str) -> List[Tuple[datetime, Path]]:
+        if not self._directory.exists():
+            return []
+        files = []
+        for path in self._directory.iterdir():
+            name = path.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                files.append((_parse_timestamp(name[len(prefix):-len(suffix)]), path))
+        return sorted(files)
+
+    def _bases(self) -> List[Tuple[datetime, Path]]:
+        return self._files(_BASE_PREFIX, _BASE_SUFFIX)
+
+    def _deltas(self) -> List[Tuple[datetime, Path]]:
+        return self._files(_DELTA_PREFIX, _DELTA_SUFFIX)
+
+    def times(self) -> List[datetime]:
+        """
+        List the times of every recorded sync.
+
+        Returns:
+            Sorted sync times, bases and deltas alike.
+        """
+        return sorted(when for when, _ in self._bases() + self._deltas())
+
+    def _overlay(self, since: datetime, until: datetime) -> Tuple[Dict[str, Optional[EmployeeRecord]], int]:
+        """Apply the deltas in (since, until] in order, counting the changed lines read."""
+        overlay: Dict[str, Optional[EmployeeRecord]] = {}
+        changes = 0
+        for when, path in self._deltas():
+            if when <= since or when > until:
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    changes += 1
+                    if entry.get("deleted"):
+                        overlay[entry["id"]] = None
+                    else:
+                        overlay[entry["id"]] = EmployeeRecord(**entry["record"])
+        return overlay, changes
+
+    def as_of(self, when: datetime) -> HistoricalView:
+        """
+        Open a view of the table as of a point in time.
+
+        Args:
+            when: Timezone-aware time. The latest sync at or before it is used.
+
+        Returns:
+            HistoricalView over the nearest base and the deltas after it. Call close() when done.
+
+        Raises:
+            LookupError: If nothing was recorded at or before that time.
+        """
+        bases = [(base_time, path) for base_time, path in self._bases() if base_time <= when]
+        if not bases:
+            raise LookupError(f"No history recorded on or before {when.isoformat()}")
+        base_time, base_path = bases[-1]
+        overlay, _ = self._overlay(base_time, when)
+        return HistoricalView(Snapshot.open(base_path), overlay)
+
+    def record(self, records: Iterable[EmployeeRecord], when: Optional[datetime] = None) -> int:
+        """
+        Record the current state of the table.
+
+        The first sync, and any sync after enough change has accumulated,
+        writes a full base; otherwise only records that differ from the
+        previous sync are written.
+
+        Args:
+            records: Every employee currently in the table.
+            when: Time of the sync. Defaults to now.
+
+        Returns:
+            Number of records written: the table size for a base, the number of changes for a delta.
+        """
+        when = when or datetime.now(timezone.utc)
+        current = {_record_key(record): record for record in records}
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        bases = self._bases()
+        if not bases:
+            return self._write_base(current.values(), when)
+
+        base_time, base_path = bases[-1]
+        overlay, changes_since_base = self._overlay(base_time, when)
+        with Snapshot.open(base_path) as base:
+            previous = {_record_key(record): record_hash(record) for record in base.records()}
+        for key, record in overlay.items():
+            if record is None:
+                previous.pop(key, None)
+            else:
+                previous[key] = record_hash(record)
+
+        entries: List[Dict[str, object]] = []
+        for key, record in current.items():
+            if previous.get(key) != record_hash(record):
+                entries.append({"id": key, "record": record.model_dump(exclude_none=True)})
+        for key in previous.keys() - current.keys():
+            entries.append({"id": key, "deleted": True})
+
+        if changes_since_base + len(entries) > self._rebase_ratio * max(len(current), 1):
+            return self._write_base(current.values(), when)
+        if entries:
+            self._write_delta(entries, when)
+        return len(entries)
+
+    def _write_base(self, records: Iterable[EmployeeRecord], when: datetime) -> int:
+        path = self._directory / f"{_BASE_PREFIX}{_format_timestamp(when)}{_BASE_SUFFIX}"
+        return write_snapshot(records, path)
+
+    def _write_delta(self, entries: List[Dict[str, object]], when: datetime) -> None:
+        path = self._directory / f"{_DELTA_PREFIX}{_format_timestamp(when)}{_DELTA_SUFFIX}"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, path)
@@ -0,0 +1,177 @@
+"""In-memory email index over employee records."""
+
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from smog.directory import EmployeeDirectory
+from smog.emails import split_alternate_emails
+from smog.models import EmployeeRecord
+
+
+def record_hash(record: EmployeeRecord) -> str:
+    """
+    Hash the content of an employee record.
+
+    The Airtable record ID is excluded so the hash only changes when the
+    employee data itself changes.
+
+    Args:
+        record: Employee record to hash.
+
+    Returns:
+        Hex digest of the record content.
+    """
+    content = record.model_dump_json(exclude={"record_id"})
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmployeeIndex(EmployeeDirectory):
+    """
+    Mutable in-memory index of employee records keyed by lowercased email.
+
+    A reverse manager -> direct reports index is kept in step with every
+    upsert and remove, so a changed Manager Email only moves one entry.
+    Addresses listed in a record's Alternate Emails also resolve to it,
+    unless they are some other employee's primary email.
+    """
+
+    def __init__(self, records: Iterable[EmployeeRecord] = ()) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            records: Records to index. Later records replace earlier ones with the same email.
+        """
+        self._by_email: Dict[str, EmployeeRecord] = {}
+        self._hashes: Dict[str, str] = {}
+        self._email_by_id: Dict[str, str] = {}
+        self._reports: Dict[str, Set[str]] = {}
+        self._aliases: Dict[str, str] = {}
+        for record in records:
+            self.upsert(record)
+
+    def __len__(self) -> int:
+        return len(self._by_email)
+
+    def __contains__(self, email: object) -> bool:
+        return isinstance(email, str) and self.find_by_email(email) is not None
+
+    def __iter__(self) -> Iterator[EmployeeRecord]:
+        return iter(list(self._by_email.values()))
+
+    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by email address.
+
+        Args:
+            email: Employee email or alternate email to search for (case-insensitive).
+
+        Returns:
+            EmployeeRecord if found, None otherwise.
+        """
+        key = email.lower()
+        record = self._by_email.get(key)
+        if record is None and key in self._aliases:
+            record = self._by_email.get(self._aliases[key])
+        return record
+
+    def find_by_record_id(self, record_id: str) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by Airtable record ID.
+
+        Args:
+            record_id: Airtable record ID.
+
+        Returns:
+            EmployeeRecord if indexed, None otherwise.
+        """
+        email = self._email_by_id.get(record_id)
+        return None if email is None else self._by_email.get(email)
+
+    def direct_reports(self, email: str) -> List[EmployeeRecord]:
+        """
+        List the employees whose Manager Email is the given address.
+
+        Args:
+            email: Manager email address (case-insensitive).
+
+        Returns:
+            Direct reports sorted by email. Empty if there are none.
+        """
+        keys = self._reports.get(email.lower(), ())
+        return [self._by_email[key] for key in sorted(keys)]
+
+    def content_hash(self, email: str) -> Optional[str]:
+        """
+        Return the stored content hash for an email.
+
+        Args:
+            email: Employee email address (case-insensitive).
+
+        Returns:
+            Hash from record_hash, or None if the email is not indexed.
+        """
+        return self._hashes.get(email.lower())
+
+    def upsert(self, record: EmployeeRecord) -> Optional[EmployeeRecord]:
+        """
+        Insert or replace a record.
+
+        A record whose Airtable ID is already indexed under a different email
+        replaces that entry, so email changes do not leave stale keys behind.
+
+        Args:
+            record: Record to index.
+
+        Returns:
+            The record previously stored for the same record ID or email, if any.
+        """
+        previous = None
+        if record.record_id is not None:
+            previous = self.find_by_record_id(record.record_id)
+        if previous is not None:
+            self.remove(previous.email)
+        displaced = self.remove(record.email)
+        if previous is None:
+            previous = displaced
+
+        key = record.email.lower()
+        self._by_email[key] = record
+        self._hashes[key] = record_hash(record)
+        if record.record_id is not None:
+            self._email_by_id[record.record_id] = key
+        if record.manager_email:
+            self._reports.setdefault(record.manager_email.lower(), set()).add(key)
+        for alias in split_alternate_emails(record.alternate_emails):
+            if alias.lower() != key:
+                self._aliases[alias.lower()] = key
+        return previous
+
+    def remove(self, email: str) -> Optional[EmployeeRecord]:
+        """
+        Remove a record by email.
+
+        Args:
+            email: Employee email address (case-insensitive).
+
+        Returns:
+            The removed record, or None if the email was not indexed.
+        """
+        key = email.lower()
+        record = self._by_email.pop(key, None)
+        self._hashes.pop(key, None)
+        if record is None:
+            return None
+        if record.record_id is not None:
+            self._email_by_id.pop(record.record_id, None)
+        if record.manager_email:
+            manager_key = record.manager_email.lower()
+            reports = self._reports.get(manager_key)
+            if reports is not None:
+                reports.discard(key)
+                if not reports:
+                    del self._reports[manager_key]
+        for alias in split_alternate_emails(record.alternate_emails):
+            if self._aliases.get(alias.lower()) == key:
+                del self._aliases[alias.lower()]
+        return record
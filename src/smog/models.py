@@ -1,9 +1,27 @@
 """Pydantic data models for employee records."""
 
-from typing import Optional
+from typing import Any, Dict, Literal, Mapping, Optional
 
 from pydantic import BaseModel, Field
 
+# Maps EmployeeRecord attribute names to the Airtable field they are read from.
+AIRTABLE_FIELDS: Dict[str, str] = {
+    "email": "Email",
+    "manager_email": "Manager Email",
+    "employment_status": "Employee Status",
+    "name": "Name",
+    "title": "Title",
+    "department": "Department",
+    "division": "Division",
+    "eng_team": "Eng Team",
+    "operating_group": "Operating Group",
+    "start_date": "Start Date",
+    "state": "State",
+    "employment_type": "Employment Type",
+    "manager_name": "Manager Name",
+    "alternate_emails": "Alternate Emails",
+}
+
 
 class EmployeeRecord(BaseModel):
     """Represents an employee record from Airtable."""
@@ -21,6 +39,43 @@ class EmployeeRecord(BaseModel):
     state: Optional[str] = Field(None, description="State/location")
     employment_type: Optional[str] = Field(None, description="Employment type (Full Time, Part Time, etc.)")
     manager_name: Optional[str] = Field(None, description="Manager's full name")
+    alternate_emails: Optional[str] = Field(
+        None, description="Other addresses for this employee, separated by commas or whitespace"
+    )
+    record_id: Optional[str] = Field(None, description="Airtable record ID")
+
+    @classmethod
+    def from_airtable_fields(cls, fields: Mapping[str, Any]) -> "EmployeeRecord":
+        """
+        Build an EmployeeRecord from the fields of an Airtable record.
+
+        Args:
+            fields: The "fields" mapping of an Airtable record.
+
+        Returns:
+            EmployeeRecord populated from the mapped Airtable fields.
+        """
+        values: Dict[str, Any] = {
+            attr: fields.get(airtable_name) for attr, airtable_name in AIRTABLE_FIELDS.items()
+        }
+        values["email"] = fields.get(AIRTABLE_FIELDS["email"], "")
+        values["employment_status"] = fields.get(AIRTABLE_FIELDS["employment_status"], "Unknown")
+        return cls(**values)
+
+    @classmethod
+    def from_airtable_record(cls, record: Mapping[str, Any]) -> "EmployeeRecord":
+        """
+        Build an EmployeeRecord from a full Airtable record, keeping its record ID.
+
+        Args:
+            record: Airtable record with "id" and "fields" keys.
+
+        Returns:
+            EmployeeRecord populated from the record.
+        """
+        employee = cls.from_airtable_fields(record["fields"])
+        employee.record_id = record.get("id")
+        return employee
 
 
 class EmployeeLookupResult(BaseModel):
@@ -33,3 +88,16 @@ class EmployeeLookupResult(BaseModel):
     employee: EmployeeRecord = Field(..., description="The employee being looked up")
     manager: Optional[EmployeeRecord] = Field(None, description="The employee's manager")
     managers_manager: Optional[EmployeeRecord] = Field(None, description="The manager's manager")
+    partial: bool = Field(False, description="True if a deadline expired before the chain was complete")
+
+
+class ChangeEvent(BaseModel):
+    """A typed change to an employee detected between two reads of the table."""
+
+    type: Literal["hire", "termination", "status_change", "manager_change", "title_change"] = Field(
+        ..., description="Kind of change"
+    )
+    email: str = Field(..., description="Email of the changed employee")
+    previous: Optional[str] = Field(None, description="Value before the change, if any")
+    current: Optional[str] = Field(None, description="Value after the change, if any")
+    employee: EmployeeRecord = Field(..., description="The employee record after the change")
@@ -0,0 +1,193 @@
+"""Org chart export for a manager's subtree."""
+
+import json
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+
+from smog.index import EmployeeIndex
+from smog.models import EmployeeRecord
+
+
+class ChartNode(NamedTuple):
+    """
+    One employee in an org chart walk.
+
+    depth counts levels below the chart's root, manager is None at the root,
+    and collapsed is the number of reports hidden under this node (0 if its
+    subtree is shown).
+    """
+
+    record: EmployeeRecord
+    depth: int
+    manager: Optional[str]
+    collapsed: int
+
+
+# Walk events: ("enter", node) before a node's reports, ("exit", node) after them.
+ChartEvent = Tuple[str, ChartNode]
+
+
+def subtree_sizes(index: EmployeeIndex, root: str) -> Dict[str, int]:
+    """
+    Count every employee's direct and indirect reports under a root.
+
+    Iterative post-order walk, so deep orgs cannot hit the recursion limit.
+
+    Args:
+        index: Employee index with the reverse manager index.
+        root: Email at the top of the subtree (case-insensitive).
+
+    Returns:
+        Map of lowercased email to report count, for everyone in the subtree.
+    """
+    sizes: Dict[str, int] = {}
+    stack: List[Tuple[str, bool]] = [(root.lower(), False)]
+    seen: Set[str] = set()
+    while stack:
+        key, done = stack.pop()
+        if done:
+            # Reports skipped as already seen (a cycle) are not counted.
+            counted = [sizes[report.email.lower()] for report in index.direct_reports(key)
+                       if report.email.lower() in sizes]
+            sizes[key] = len(counted) + sum(counted)
+            continue
+        if key in seen:
+            continue
+        seen.add(key)
+        stack.append((key, True))
+        stack.extend((report.email.lower(), False) for report in index.direct_reports(key))
+    return sizes
+
+
+def walk_org(
+    index: EmployeeIndex,
+    root: str,
+    max_depth: Optional[int] = None,
+    collapse_above: Optional[int] = None,
+) -> Iterator[ChartEvent]:
+    """
+    Walk the org under a root depth-first, yielding events as it goes.
+
+    The walk uses an explicit stack over the reverse manager index, so it
+    has no recursion limit and holds only the current path's pending
+    siblings. Reports are visited in email order. An employee seen twice
+    (a Manager Email cycle) is not visited again.
+
+    Args:
+        index: Employee index with the reverse manager index.
+        root: Email at the top of the chart (case-insensitive).
+        max_depth: Deepest level shown below the root; unlimited if None.
+            Employees at the last level show their hidden report count.
+        collapse_above: Hide the reports of anyone below the root with more
+            than this many direct and indirect reports. No collapsing if None.
+
+    Yields:
+        ("enter", node) before a node's reports and ("exit", node) after them.
+
+    Raises:
+        LookupError: If the root is not in the index.
+    """
+    record = index.find_by_email(root)
+    if record is None:
+        raise LookupError(f"Employee not found: {root}")
+
+    sizes = subtree_sizes(index, record.email) if collapse_above is not None or max_depth is not None else {}
+
+    def node(employee: EmployeeRecord, depth: int, manager: Optional[str]) -> ChartNode:
+        size = sizes.get(employee.email.lower(), 0)
+        hide = depth > 0 and collapse_above is not None and size > collapse_above
+        hide = hide or (max_depth is not None and depth >= max_depth)
+        return ChartNode(employee, depth, manager, size if hide else 0)
+
+    seen = {record.email.lower()}
+    stack: List[Tuple[ChartNode, Optional[Iterator[EmployeeRecord]]]] = []
+    top = node(record, 0, None)
+    yield "enter", top
+    stack.append((top, None if top.collapsed else iter(index.direct_reports(record.email))))
+    while stack:
+        current, reports = stack[-1]
+        report = None
+        if reports is not None:
+            report = next((report for report in reports if report.email.lower() not in seen), None)
+        if report is None:
+            stack.pop()
+            yield "exit", current
+            continue
+        seen.add(report.email.lower())
+        child = node(report, current.depth + 1, current.record.email)
+        yield "enter", child
+        stack.append((child, None if child.collapsed else iter(index.direct_reports(report.email))))
+
+
+def _label(record: EmployeeRecord) -> str:
+    return "\n".join(part for part in (record.name or record.email, record.title) if part)
+
+
+def write_dot(events: Iterator[ChartEvent], out: TextIO) -> int:
+    """
+    Stream an org chart as a Graphviz DOT digraph.
+
+    Args:
+        events: Events from walk_org.
+        out: Destination stream.
+
+    Returns:
+        Number of employees written.
+    """
+    count = 0
+    out.write("digraph orgchart {\n  rankdir=TB;\n  node [shape=box];\n")
+    for kind, current in events:
+        if kind != "enter":
+            continue
+        count += 1
+        email = current.record.email
+        label = _label(current.record)
+        style = ""
+        if current.collapsed:
+            label += f"\n+{current.collapsed} reports"
+            style = ", style=dashed"
+        out.write(f"  {json.dumps(email)} [label={json.dumps(label)}{style}];\n")
+        if current.manager is not None:
+            out.write(f"  {json.dumps(current.manager)} -> {json.dumps(email)};\n")
+    out.write("}\n")
+    return count
+
+
+def write_json(events: Iterator[ChartEvent], out: TextIO) -> int:
+    """
+    Stream an org chart as one nested JSON object.
+
+    Each node has email, name, title and children; collapsed nodes also have
+    hidden_reports. The document is written as the walk proceeds, never held
+    in memory.
+
+    Args:
+        events: Events from walk_org.
+        out: Destination stream.
+
+    Returns:
+        Number of employees written.
+    """
+    count = 0
+    # Whether the innermost open children list already has an element.
+    has_sibling: List[bool] = []
+    for kind, current in events:
+        if kind == "exit":
+            has_sibling.pop()
+            out.write("]}")
+            continue
+        count += 1
+        if has_sibling:
+            if has_sibling[-1]:
+                out.write(",")
+            has_sibling[-1] = True
+        fields: Dict[str, Any] = {
+            "email": current.record.email,
+            "name": current.record.name,
+            "title": current.record.title,
+        }
+        if current.collapsed:
+            fields["hidden_reports"] = current.collapsed
+        out.write(json.dumps(fields)[:-1] + ', "children": [')
+        has_sibling.append(False)
+    out.write("\n")
+    return count
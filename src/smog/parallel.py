@@ -0,0 +1,198 @@
+"""Process-parallel analysis over a snapshot published in shared memory."""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from types import TracebackType
+from typing import Callable, List, Optional, Tuple, Type, TypeVar, Union
+
+from smog.models import EmployeeRecord
+from smog.snapshot import Snapshot
+
+R = TypeVar("R")
+
+# Work items per worker, so uneven per-employee costs still balance out.
+CHUNKS_PER_WORKER = 4
+
+# The snapshot attached in this worker process, set by the pool initializer.
+_worker_snapshot: Optional[Snapshot] = None
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to the publisher's block from a pool worker.
+
+    Workers share their parent's resource tracker, so the publisher's
+    registration already covers the block; the tracker only cleans up
+    blocks that are still registered when every process has exited.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _view(memory: shared_memory.SharedMemory, size: int) -> memoryview:
+    """Return the first size bytes of an open block."""
+    buf = memory.buf
+    assert buf is not None, "shared memory block is closed"
+    return buf[:size]
+
+
+class SharedSnapshot:
+    """
+    Snapshot bytes published once into a shared memory block.
+
+    Worker processes attach by name and read the same physical pages, so
+    nothing is pickled or copied per worker. The publisher owns the block:
+    close() releases and unlinks it.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Copy snapshot bytes into a new shared memory block.
+
+        Args:
+            data: Snapshot contents.
+
+        Raises:
+            ValueError: If the data is not a readable snapshot.
+        """
+        self.size = len(data)
+        self._memory = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        with _view(self._memory, self.size) as view:
+            view[:] = data
+        self._open()
+
+    def _open(self) -> None:
+        view = _view(self._memory, self.size)
+        try:
+            self.snapshot = Snapshot(view)
+        except BaseException:
+            view.release()
+            self._memory.close()
+            self._memory.unlink()
+            raise
+
+    @classmethod
+    def publish(cls, path: Path) -> "SharedSnapshot":
+        """
+        Publish a snapshot file into shared memory, reading it straight into the block.
+
+        Args:
+            path: Snapshot file written by write_snapshot.
+
+        Returns:
+            SharedSnapshot holding the file's contents.
+
+        Raises:
+            ValueError: If the file is not a readable snapshot.
+        """
+        shared = cls.__new__(cls)
+        with open(path, "rb") as f:
+            shared.size = os.fstat(f.fileno()).st_size
+            shared._memory = shared_memory.SharedMemory(create=True, size=max(shared.size, 1))
+            try:
+                with _view(shared._memory, shared.size) as view:
+                    f.readinto(view)
+            except BaseException:
+                shared._memory.close()
+                shared._memory.unlink()
+                raise
+        shared._open()
+        return shared
+
+    @property
+    def name(self) -> str:
+        """Name workers attach to."""
+        return self._memory.name
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def close(self) -> None:
+        """Release and unlink the shared memory block."""
+        self.snapshot.close()
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> "SharedSnapshot":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def worker_snapshot() -> Snapshot:
+    """
+    Return the snapshot attached in the current map_employees worker.
+
+    Lets the function passed to map_employees look up other employees, e.g.
+    worker_snapshot().get_employee_with_management_chain(record.email).
+
+    Raises:
+        RuntimeError: If called outside a map_employees worker.
+    """
+    if _worker_snapshot is None:
+        raise RuntimeError("worker_snapshot() is only available inside map_employees workers")
+    return _worker_snapshot
+
+
+def _init_worker(name: str, size: int) -> None:
+    global _worker_memory, _worker_snapshot
+    _worker_memory = _attach_memory(name)
+    _worker_snapshot = Snapshot(_view(_worker_memory, size))
+
+
+def _run_chunk(fn: Callable[[EmployeeRecord], R], start: int, stop: int) -> List[R]:
+    return [fn(record) for record in worker_snapshot().records(start, stop)]
+
+
+def map_employees(
+    fn: Callable[[EmployeeRecord], R],
+    snapshot: Union[Path, SharedSnapshot],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> List[R]:
+    """
+    Apply fn to every employee in a snapshot across a process pool.
+
+    The snapshot is published into shared memory once (unless it already is)
+    and every worker attaches to it at startup. Work is sent as row ranges,
+    so only the results cross process boundaries.
+
+    Args:
+        fn: Function of one EmployeeRecord. Must be picklable, i.e. defined at
+            module level.
+        snapshot: Snapshot file, or an already published SharedSnapshot to reuse.
+        workers: Number of worker processes; os.cpu_count() if None.
+        chunk_size: Employees per work item. By default each worker gets
+            about CHUNKS_PER_WORKER items.
+
+    Returns:
+        fn's results in snapshot order.
+    """
+    shared = SharedSnapshot.publish(snapshot) if isinstance(snapshot, Path) else snapshot
+    try:
+        count = len(shared)
+        workers = workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(-(-count // (workers * CHUNKS_PER_WORKER)), 1)
+        ranges: List[Tuple[int, int]] = [
+            (start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared.name, shared.size)
+        ) as pool:
+            futures = [pool.submit(_run_chunk, fn, start, stop) for start, stop in ranges]
+            return [result for future in futures for result in future.result()]
+    finally:
+        if shared is not snapshot:
+            shared.close()
@@ -0,0 +1,107 @@
+"""Bulk reconciliation of external account lists against employee status."""
+
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from smog.directory import EmployeeDirectory
+from smog.emails import lookup_candidates
+
+# Columns appended to every reconciled row.
+RECONCILE_COLUMNS = [
+    "smog_email",
+    "smog_status",
+    "smog_employment_status",
+    "smog_manager",
+    "smog_managers_manager",
+]
+CHAIN_CHANGED_COLUMN = "smog_chain_changed"
+
+_Chain = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _chain(directory: EmployeeDirectory, email: str, memo: Dict[str, Optional[_Chain]]) -> Optional[_Chain]:
+    """Resolve (employment status, manager, manager's manager) for an email, once per email."""
+    key = email.lower()
+    if key not in memo:
+        result = directory.get_employee_with_management_chain(email)
+        if result is None:
+            memo[key] = None
+        else:
+            memo[key] = (
+                result.employee.employment_status,
+                result.manager.email if result.manager else result.employee.manager_email,
+                result.managers_manager.email if result.managers_manager else None,
+            )
+    return memo[key]
+
+
+def reconcile(
+    rows: Iterable[Dict[str, str]],
+    directory: EmployeeDirectory,
+    email_column: str,
+    normalize: Callable[[str], str],
+    terminated_statuses: Collection[str],
+    baseline: Optional[EmployeeDirectory] = None,
+) -> Iterator[Dict[str, str]]:
+    """
+    Annotate account rows with the owner's employment status and management chain.
+
+    The directory is expected to be local (an EmployeeIndex or Snapshot) so
+    every row is a hash probe rather than a network request. Chains are
+    resolved once per distinct email.
+
+    smog_status is "active", "terminated" (employment status is one of
+    terminated_statuses) or "unknown" (no employee with that email).
+
+    Args:
+        rows: Input rows, e.g. from csv.DictReader.
+        directory: Employee data to join against.
+        email_column: Name of the column holding the account owner's email. Rows where
+                      it is missing or empty, e.g. short CSV rows, are "unknown".
+        normalize: Normalization applied to each email. The email as written is
+                   tried first, then its normalized form.
+        terminated_statuses: Employment statuses that count as terminated.
+        baseline: Employee data as of an earlier time. When given, rows also get
+                  smog_chain_changed, "yes" if the manager or manager's manager differ.
+
+    Returns:
+        Iterator of input rows with the smog_* columns added, in input order. Fields
+        beyond the header (csv.DictReader's None key) are dropped.
+    """
+    chains: Dict[str, Optional[_Chain]] = {}
+    baseline_chains: Dict[str, Optional[_Chain]] = {}
+
+    for row in rows:
+        # csv.DictReader fills the fields of a short row with None.
+        raw = (row.get(email_column) or "").strip()
+        candidates = lookup_candidates(raw, normalize) if raw else []
+        email, chain = "", None
+        for email in candidates:
+            chain = _chain(directory, email, chains)
+            if chain is not None:
+                break
+
+        # It also files the extra fields of a long row under None; no writer has that column.
+        annotated = {key: value for key, value in row.items() if key is not None}
+        annotated["smog_email"] = email
+        if chain is None:
+            annotated["smog_status"] = "unknown"
+            annotated["smog_employment_status"] = ""
+            annotated["smog_manager"] = ""
+            annotated["smog_managers_manager"] = ""
+        else:
+            status, manager, managers_manager = chain
+            annotated["smog_status"] = "terminated" if status in terminated_statuses else "active"
+            annotated["smog_employment_status"] = status or ""
+            annotated["smog_manager"] = manager or ""
+            annotated["smog_managers_manager"] = managers_manager or ""
+
+        if baseline is not None:
+            before = _chain(baseline, email, baseline_chains) if email else None
+            changed = chain is not None and before is not None and _lowered(before[1:]) != _lowered(chain[1:])
+            annotated[CHAIN_CHANGED_COLUMN] = "yes" if changed else "no"
+
+        yield annotated
+
+
+def _lowered(values: Tuple[Optional[str], ...]) -> List[str]:
+    return [(value or "").lower() for value in values]
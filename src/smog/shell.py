@@ -0,0 +1,255 @@
+"""Interactive lookup shell with a warm client and local completion."""
+
+import cmd
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from smog.deadline import DeadlineExceeded
+from smog.directory import EmployeeDirectory
+from smog.emails import lookup_candidates
+from smog.index import EmployeeIndex
+from smog.models import EmployeeLookupResult, EmployeeRecord
+
+# Most completions or search results listed at once.
+MAX_MATCHES = 50
+
+
+class PrefixIndex:
+    """
+    Sorted, case-insensitive prefix index over strings.
+
+    Keys are kept in one sorted list, so a prefix query is a binary search to
+    the first candidate followed by a scan of the matches only, independent of
+    the total number of keys.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            entries: (key, value) pairs; the key is matched and displayed, the value is returned.
+        """
+        pairs = sorted({(key.lower(), key, value) for key, value in entries})
+        self._folded = [folded for folded, _, _ in pairs]
+        self._entries = [(key, value) for _, key, value in pairs]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def matches(self, prefix: str, limit: int = MAX_MATCHES) -> List[Tuple[str, str]]:
+        """
+        Find keys starting with a prefix.
+
+        Args:
+            prefix: Prefix to match (case-insensitive).
+            limit: Most matches to return.
+
+        Returns:
+            Up to limit (key, value) pairs in key order.
+        """
+        folded = prefix.lower()
+        start = bisect_left(self._folded, folded)
+        found: List[Tuple[str, str]] = []
+        for position in range(start, min(start + limit, len(self._folded))):
+            if not self._folded[position].startswith(folded):
+                break
+            found.append(self._entries[position])
+        return found
+
+
+def completion_index(records: Iterable[EmployeeRecord]) -> PrefixIndex:
+    """
+    Build the shell's completion index: every email and name, both resolving to an email.
+
+    Args:
+        records: Employee records to index.
+
+    Returns:
+        PrefixIndex over emails and names.
+    """
+    entries: List[Tuple[str, str]] = []
+    for record in records:
+        entries.append((record.email, record.email))
+        if record.name:
+            entries.append((record.name, record.email))
+    return PrefixIndex(entries)
+
+
+class Shell(cmd.Cmd):
+    """
+    Line-oriented shell running lookups against one long-lived client.
+
+    Live lookups reuse the client's HTTP session, so only the first pays for
+    connection setup. chain, reports and search are answered from a local
+    EmployeeIndex, which also feeds tab completion of emails and names.
+    """
+
+    intro = "smog shell. Type help for commands, Tab to complete emails and names."
+    prompt = "smog> "
+
+    def __init__(
+        self,
+        client: EmployeeDirectory,
+        load_records: Callable[[], Iterable[EmployeeRecord]],
+        normalize: Callable[[str], str],
+        show: Callable[[EmployeeLookupResult], None],
+        stdin: Optional[TextIO] = None,
+        stdout: Optional[TextIO] = None,
+    ) -> None:
+        """
+        Initialize the shell.
+
+        Args:
+            client: Directory live lookups go to.
+            load_records: Loads the records for the local index; called again by refresh.
+            normalize: Email normalization applied to typed emails.
+            show: Prints a lookup result.
+            stdin: Input stream, sys.stdin if None.
+            stdout: Output stream, sys.stdout if None.
+        """
+        super().__init__(stdin=stdin, stdout=stdout)
+        self._client = client
+        self._load_records = load_records
+        self._normalize = normalize
+        self._show = show
+        self.index = EmployeeIndex()
+        self._completions = PrefixIndex()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Reload the local index and completion entries."""
+        self.index = EmployeeIndex(self._load_records())
+        self._completions = completion_index(self.index)
+
+    def _say(self, line: str = "") -> None:
+        self.stdout.write(line + "\n")
+
+    def _resolve(self, arg: str) -> Optional[str]:
+        """Turn a typed email, username or exact name into an email."""
+        arg = arg.strip()
+        if not arg:
+            self._say("An email or name is required")
+            return None
+        if "@" not in arg:
+            for key, email in self._completions.matches(arg):
+                if key.lower() == arg.lower() and key != email:
+                    return email
+        candidates = lookup_candidates(arg, self._normalize)
+        # Prefer the form the local index knows, e.g. an alternate email as typed.
+        return next((email for email in candidates if self.index.find_by_email(email)), candidates[-1])
+
+    def _complete(self, text: str, line: str) -> List[str]:
+        """
+        Complete the argument being typed.
+
+        Readline hands over only the current word, so for names with spaces
+        the match is made against the whole argument and only the part from
+        the current word on is returned.
+        """
+        argument = line.partition(" ")[2].lstrip()
+        cut = len(argument) - len(text)
+        return [key[cut:] for key, _ in self._completions.matches(argument)]
+
+    def emptyline(self) -> bool:
+        return False
+
+    def default(self, line: str) -> None:
+        self._say(f"Unknown command: {line.split()[0]}. Type help for commands.")
+
+    def do_lookup(self, arg: str) -> None:
+        """lookup EMAIL|NAME: look up an employee and their managers in the live source."""
+        email = self._resolve(arg)
+        if email is None:
+            return
+        try:
+            result = self._client.get_employee_with_management_chain(email)
+        except DeadlineExceeded:
+            self._say(f"Timed out looking up {email}")
+            return
+        except Exception as e:
+            self._say(f"Lookup failed: {e}")
+            return
+        if result is None:
+            self._say(f"Employee not found: {email}")
+            return
+        self._show(result)
+        if result.partial:
+            self._say("Timed out before the management chain was complete")
+
+    def do_chain(self, arg: str) -> None:
+        """chain EMAIL|NAME: print the whole management chain up to the top, from the local index."""
+        email = self._resolve(arg)
+        if email is None:
+            return
+        record = self.index.find_by_email(email)
+        if record is None:
+            self._say(f"Employee not found: {email}")
+            return
+        seen: Set[str] = set()
+        depth = 0
+        while record is not None and record.email.lower() not in seen:
+            seen.add(record.email.lower())
+            self._say(f"{'  ' * depth}{_describe(record)}")
+            depth += 1
+            record = self.index.find_by_email(record.manager_email) if record.manager_email else None
+
+    def do_reports(self, arg: str) -> None:
+        """reports EMAIL|NAME: list direct reports, from the local index."""
+        email = self._resolve(arg)
+        if email is None:
+            return
+        record = self.index.find_by_email(email)
+        reports = self.index.direct_reports(record.email if record is not None else email)
+        if not reports:
+            self._say(f"No direct reports: {email}")
+        for report in reports:
+            self._say(_describe(report))
+
+    def do_search(self, arg: str) -> None:
+        """search PREFIX: list employees whose email or name starts with PREFIX."""
+        if not arg.strip():
+            self._say("A prefix is required")
+            return
+        emails: Dict[str, None] = {}
+        for _, email in self._completions.matches(arg.strip()):
+            emails.setdefault(email)
+        if not emails:
+            self._say(f"No matches: {arg.strip()}")
+        for email in emails:
+            record = self.index.find_by_email(email)
+            if record is not None:
+                self._say(_describe(record))
+
+    def do_refresh(self, arg: str) -> None:
+        """refresh: reload the local index used by chain, reports, search and completion."""
+        self.refresh()
+        self._say(f"Indexed {len(self.index)} employees")
+
+    def do_quit(self, arg: str) -> bool:
+        """quit: leave the shell."""
+        return True
+
+    do_exit = do_quit
+
+    def do_EOF(self, arg: str) -> bool:
+        """Leave the shell on end of input."""
+        self._say()
+        return True
+
+    def complete_lookup(self, text: str, line: str, begidx: int, endidx: int) -> List[str]:
+        return self._complete(text, line)
+
+    complete_chain = complete_lookup
+    complete_reports = complete_lookup
+    complete_search = complete_lookup
+
+
+def _describe(record: EmployeeRecord) -> str:
+    """Format a record as one line: email, name and title when known, status."""
+    label = record.email
+    if record.name:
+        label += f" ({record.name})"
+    if record.title:
+        label += f", {record.title}"
+    return f"{label} [{record.employment_status}]"
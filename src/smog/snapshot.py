@@ -0,0 +1,344 @@
+"""
+Read-only, memory-mappable snapshot of the employee table.
+
+A snapshot is a single file with a fixed binary layout so that many
+processes can mmap the same file and share its pages through the OS page
+cache. Lookups probe an open-addressing hash index and compare keys in
+place; an EmployeeRecord is only materialized for a hit.
+
+Layout (all integers little-endian):
+
+    header   magic, version, counts and section offsets (see _HEADER)
+    columns  column_count x uint32 string offsets naming each column
+    slots    slot_count x (uint32 key hash, uint32 key string offset,
+             uint32 row number + 1); alternate emails get their own slots
+    rows     record_count x (1 + column_count) x uint32 string offsets;
+             the first offset of each row is the lowercased email key
+    strings  deduplicated uint32-length-prefixed UTF-8 strings
+
+A string offset of NULL_OFFSET stands for None.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from smog.directory import EmployeeDirectory
+from smog.emails import split_alternate_emails
+from smog.models import EmployeeRecord
+
+MAGIC = b"SMOGSNAP"
+VERSION = 2
+NULL_OFFSET = 0xFFFFFFFF
+
+# magic, version, record_count, column_count, slot_count,
+# columns_offset, slots_offset, rows_offset, strings_offset
+_HEADER = struct.Struct("<8sIIII4Q")
+_UINT32 = struct.Struct("<I")
+_SLOT = struct.Struct("<III")
+
+
+def email_key(email: str) -> bytes:
+    """
+    Build the lookup key for an email address.
+
+    Args:
+        email: Email address as entered or stored.
+
+    Returns:
+        Lowercased UTF-8 encoding of the email, matching Airtable's LOWER() comparison.
+    """
+    return email.lower().encode("utf-8")
+
+
+def _slot_count(record_count: int) -> int:
+    """Smallest power of two keeping the index at most half full."""
+    count = 1
+    while count < record_count * 2:
+        count <<= 1
+    return count
+
+
+def write_snapshot(records: Iterable[EmployeeRecord], path: Path) -> int:
+    """
+    Write employee records to a snapshot file.
+
+    The file is written to a temporary name and renamed into place, so
+    processes that already mapped an older snapshot keep a consistent view.
+    When several records share an email, the first one wins. Alternate
+    emails resolve to their record unless they are another record's email.
+
+    Args:
+        records: Employee records to store.
+        path: Destination snapshot file.
+
+    Returns:
+        Number of records written.
+    """
+    columns = list(EmployeeRecord.model_fields)
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NULL_OFFSET
+        offset = string_offsets.get(value)
+        if offset is None:
+            encoded = value.encode("utf-8")
+            offset = len(strings)
+            strings.extend(_UINT32.pack(len(encoded)))
+            strings.extend(encoded)
+            string_offsets[value] = offset
+        return offset
+
+    column_offsets = [intern(column) for column in columns]
+
+    rows: List[List[int]] = []
+    entries: Dict[bytes, int] = {}
+    aliases: List[Tuple[bytes, int]] = []
+    for record in records:
+        key = email_key(record.email)
+        if key in entries:
+            continue
+        entries[key] = len(rows)
+        for alias in split_alternate_emails(record.alternate_emails):
+            aliases.append((email_key(alias), len(rows)))
+        values = record.model_dump()
+        rows.append([intern(key.decode("utf-8"))] + [intern(values[column]) for column in columns])
+    for alias_key, row_number in aliases:
+        entries.setdefault(alias_key, row_number)
+
+    slot_count = _slot_count(len(entries))
+    slots = [(0, 0, 0)] * slot_count
+    mask = slot_count - 1
+    for key, row_number in entries.items():
+        key_hash = zlib.crc32(key)
+        position = key_hash & mask
+        while slots[position][2]:
+            position = (position + 1) & mask
+        slots[position] = (key_hash, intern(key.decode("utf-8")), row_number + 1)
+
+    columns_offset = _HEADER.size
+    slots_offset = columns_offset + _UINT32.size * len(columns)
+    rows_offset = slots_offset + _SLOT.size * slot_count
+    strings_offset = rows_offset + _UINT32.size * (1 + len(columns)) * len(rows)
+
+    row_format = struct.Struct(f"<{1 + len(columns)}I")
+    body = bytearray(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(rows),
+            len(columns),
+            slot_count,
+            columns_offset,
+            slots_offset,
+            rows_offset,
+            strings_offset,
+        )
+    )
+    body.extend(struct.pack(f"<{len(columns)}I", *column_offsets))
+    for slot in slots:
+        body.extend(_SLOT.pack(*slot))
+    for row in rows:
+        body.extend(row_format.pack(*row))
+    body.extend(strings)
+
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return len(rows)
+
+
+class Snapshot(EmployeeDirectory):
+    """
+    Zero-copy reader over snapshot bytes.
+
+    Works on any buffer: a memory-mapped file (see Snapshot.open) or bytes
+    already in memory.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            buffer: Snapshot contents.
+
+        Raises:
+            ValueError: If the buffer is not a snapshot this version can read.
+        """
+        self._mmap: Optional[mmap.mmap] = None
+        self._buf = memoryview(buffer)
+        try:
+            self._read_header()
+        except BaseException:
+            self._buf.release()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self._buf) < _HEADER.size:
+            raise ValueError("Not a smog snapshot: file is truncated")
+
+        (
+            magic,
+            version,
+            self._record_count,
+            self._column_count,
+            self._slot_count,
+            columns_offset,
+            self._slots_offset,
+            self._rows_offset,
+            self._strings_offset,
+        ) = _HEADER.unpack_from(self._buf, 0)
+
+        if magic != MAGIC:
+            raise ValueError("Not a smog snapshot: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+
+        self._row_size = _UINT32.size * (1 + self._column_count)
+        self._columns = [
+            self._string(offset)
+            for offset in struct.unpack_from(f"<{self._column_count}I", self._buf, columns_offset)
+        ]
+        known = set(EmployeeRecord.model_fields)
+        self._record_columns = [
+            (index, column) for index, column in enumerate(self._columns) if column in known
+        ]
+
+    @classmethod
+    def open(cls, path: Path) -> "Snapshot":
+        """
+        Memory-map a snapshot file read-only.
+
+        Args:
+            path: Snapshot file written by write_snapshot.
+
+        Returns:
+            Snapshot backed by the shared mapping. Call close() when done.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            snapshot = cls(mapped)
+        except BaseException:
+            mapped.close()
+            raise
+        snapshot._mmap = mapped
+        return snapshot
+
+    def close(self) -> None:
+        """Release the buffer and unmap the file if this snapshot owns a mapping."""
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._record_count)
+
+    def __contains__(self, email: object) -> bool:
+        return isinstance(email, str) and self._find_row(email_key(email)) is not None
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names stored in the snapshot, in row order."""
+        return list(self._columns)
+
+    def _string_bytes(self, offset: int) -> memoryview:
+        start = self._strings_offset + offset
+        (length,) = _UINT32.unpack_from(self._buf, start)
+        start += _UINT32.size
+        return self._buf[start:start + length]
+
+    def _string(self, offset: int) -> str:
+        return str(self._string_bytes(offset), "utf-8")
+
+    def _find_row(self, key: bytes) -> Optional[int]:
+        if not self._record_count:
+            return None
+        key_hash = zlib.crc32(key)
+        mask = self._slot_count - 1
+        position = key_hash & mask
+        while True:
+            slot = self._slots_offset + position * _SLOT.size
+            slot_hash, key_offset, row = _SLOT.unpack_from(self._buf, slot)
+            if not row:
+                return None
+            if slot_hash == key_hash and self._string_bytes(key_offset) == key:
+                return int(row - 1)
+            position = (position + 1) & mask
+
+    def _materialize(self, row: int) -> EmployeeRecord:
+        offsets = struct.unpack_from(
+            f"<{1 + self._column_count}I", self._buf, self._rows_offset + row * self._row_size
+        )
+        values: Dict[str, Any] = {}
+        for index, column in self._record_columns:
+            offset = offsets[index + 1]
+            values[column] = None if offset == NULL_OFFSET else self._string(offset)
+        return EmployeeRecord(**values)
+
+    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        """
+        Find an employee by email address.
+
+        Args:
+            email: Employee email or alternate email to search for (case-insensitive).
+
+        Returns:
+            EmployeeRecord if found, None otherwise.
+        """
+        row = self._find_row(email_key(email))
+        if row is None:
+            return None
+        return self._materialize(row)
+
+    def emails(self) -> Iterator[str]:
+        """
+        Iterate over the lowercased email keys, in file order.
+
+        Returns:
+            Iterator of email keys.
+        """
+        for row in range(self._record_count):
+            (key_offset,) = _UINT32.unpack_from(self._buf, self._rows_offset + row * self._row_size)
+            yield self._string(key_offset)
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[EmployeeRecord]:
+        """
+        Iterate over records, in file order.
+
+        Args:
+            start: Index of the first record.
+            stop: Index after the last record; the end of the file if None.
+
+        Returns:
+            Iterator of materialized EmployeeRecord objects.
+        """
+        for row in range(*slice(start, stop).indices(self._record_count)):
+            yield self._materialize(row)
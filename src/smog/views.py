@@ -0,0 +1,244 @@
+"""Org-wide views computed in one pass over the manager graph."""
+
+import json
+import os
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from smog.models import EmployeeRecord
+from smog.snapshot import Snapshot
+
+# Bump when the cached layout changes, so old cache files are rebuilt.
+CACHE_VERSION = 1
+
+# Keys of the rows yielded by OrgViews.span and OrgViews.depth.
+REPORT_SPAN_COLUMNS = ["manager", "direct_reports", "total_reports", "depth"]
+REPORT_DEPTH_COLUMNS = ["email", "manager", "depth"]
+
+_Fingerprint = Tuple[int, int, int]
+
+_memo: Dict[Path, Tuple[_Fingerprint, "OrgViews"]] = {}
+_memo_lock = threading.Lock()
+
+
+def _fingerprint(path: Path) -> _Fingerprint:
+    """Identify a file's contents by inode, size and modification time."""
+    stat = path.stat()
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class OrgViews:
+    """
+    Span of control, depth and management chains for a whole table.
+
+    Built in O(n): a breadth-first pass down from the top of the org assigns
+    depths, and walking that order backwards adds each employee's report
+    count into their manager's. Employees whose Manager Email is missing
+    from the table are treated as the top of their own org; a cycle is
+    broken at the first of its members in table order.
+    """
+
+    def __init__(
+        self,
+        emails: List[str],
+        parents: List[int],
+        depths: List[int],
+        direct: List[int],
+        total: List[int],
+    ) -> None:
+        """
+        Initialize from precomputed columns, in top-down order.
+
+        Args:
+            emails: Employee emails.
+            parents: Index of each employee's manager, or -1 at the top.
+            depths: Number of managers above each employee.
+            direct: Number of direct reports.
+            total: Number of direct and indirect reports.
+        """
+        self._emails = emails
+        self._parents = parents
+        self._depths = depths
+        self._direct = direct
+        self._total = total
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+    @classmethod
+    def build(cls, records: Iterable[EmployeeRecord]) -> "OrgViews":
+        """
+        Compute the views for a set of records.
+
+        Args:
+            records: Employee records. Later records replace earlier ones with the same email.
+
+        Returns:
+            OrgViews over the records.
+        """
+        by_key: Dict[str, EmployeeRecord] = {}
+        for record in records:
+            by_key[record.email.lower()] = record
+
+        children: Dict[str, List[str]] = {}
+        roots: List[str] = []
+        for key, record in by_key.items():
+            manager = record.manager_email.lower() if record.manager_email else None
+            if manager is None or manager == key or manager not in by_key:
+                roots.append(key)
+            else:
+                children.setdefault(manager, []).append(key)
+
+        position: Dict[str, int] = {}
+        emails: List[str] = []
+        parents: List[int] = []
+        depths: List[int] = []
+        queue: Deque[Tuple[str, int]] = deque((key, -1) for key in roots)
+        pending = iter(by_key)
+        while len(position) < len(by_key):
+            if not queue:
+                # Everyone left is in a cycle with no way down from a root.
+                key = next(key for key in pending if key not in position)
+                queue.append((key, -1))
+            while queue:
+                key, parent = queue.popleft()
+                if key in position:
+                    continue
+                position[key] = len(emails)
+                emails.append(by_key[key].email)
+                parents.append(parent)
+                depths.append(0 if parent < 0 else depths[parent] + 1)
+                queue.extend((child, position[key]) for child in children.get(key, ()))
+
+        direct = [0] * len(emails)
+        total = [0] * len(emails)
+        for index in range(len(emails) - 1, -1, -1):
+            parent = parents[index]
+            if parent >= 0:
+                direct[parent] += 1
+                total[parent] += total[index] + 1
+        return cls(emails, parents, depths, direct, total)
+
+    @classmethod
+    def for_snapshot(cls, path: Path) -> "OrgViews":
+        """
+        Return the views for a snapshot file, computing them only when it has changed.
+
+        Views are kept in memory per process and in a cache file next to the
+        snapshot (SNAPSHOT.views), both keyed by the snapshot's inode, size
+        and modification time. Since snapshots are replaced atomically, any
+        rewrite invalidates them. If the cache file cannot be written the
+        views are still returned.
+
+        Args:
+            path: Snapshot file.
+
+        Returns:
+            OrgViews over the snapshot's records.
+        """
+        path = path.resolve()
+        fingerprint = _fingerprint(path)
+        with _memo_lock:
+            cached = _memo.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        cache_path = path.with_name(path.name + ".views")
+        views = cls._read_cache(cache_path, fingerprint)
+        if views is None:
+            with Snapshot.open(path) as snapshot:
+                views = cls.build(snapshot.records())
+            views._write_cache(cache_path, fingerprint)
+
+        with _memo_lock:
+            _memo[path] = (fingerprint, views)
+        return views
+
+    @classmethod
+    def _read_cache(cls, cache_path: Path, fingerprint: _Fingerprint) -> Optional["OrgViews"]:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or tuple(data.get("fingerprint", ())) != fingerprint:
+            return None
+        return cls(data["emails"], data["parents"], data["depths"], data["direct"], data["total"])
+
+    def _write_cache(self, cache_path: Path, fingerprint: _Fingerprint) -> None:
+        data = {
+            "version": CACHE_VERSION,
+            "fingerprint": list(fingerprint),
+            "emails": self._emails,
+            "parents": self._parents,
+            "depths": self._depths,
+            "direct": self._direct,
+            "total": self._total,
+        }
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_name, cache_path)
+        except OSError:
+            os.unlink(tmp_name)
+
+    def span(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every manager's span of control, top of the org first.
+
+        Yields:
+            Rows with manager, direct_reports, total_reports and depth.
+        """
+        for index, email in enumerate(self._emails):
+            if self._direct[index]:
+                yield {
+                    "manager": email,
+                    "direct_reports": self._direct[index],
+                    "total_reports": self._total[index],
+                    "depth": self._depths[index],
+                }
+
+    def depth(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every employee's depth in the org, top of the org first.
+
+        Yields:
+            Rows with email, manager (None at the top) and depth (0 at the top).
+        """
+        for index, email in enumerate(self._emails):
+            parent = self._parents[index]
+            yield {
+                "email": email,
+                "manager": self._emails[parent] if parent >= 0 else None,
+                "depth": self._depths[index],
+            }
+
+    def chains(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every employee's full management chain, top of the org first.
+
+        Yields:
+            Rows with email and chain, the list of managers from the direct
+            manager up to the top.
+        """
+        for index, email in enumerate(self._emails):
+            chain: List[str] = []
+            parent = self._parents[index]
+            while parent >= 0:
+                chain.append(self._emails[parent])
+                parent = self._parents[parent]
+            yield {"email": email, "chain": chain}
+
+    @property
+    def max_depth(self) -> int:
+        """Largest depth in the org, 0 if it is flat or empty."""
+        return max(self._depths, default=0)
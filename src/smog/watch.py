@@ -0,0 +1,158 @@
+"""Change-feed polling against Airtable's last-modified time."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Collection, Iterator, List, Optional, Union
+
+from smog.client import AirtableClient
+from smog.federation import FederatedClient
+from smog.index import EmployeeIndex, record_hash
+from smog.models import ChangeEvent, EmployeeRecord
+
+# Rows modified within this window before the watermark are fetched again, to
+# tolerate clock skew between this host and Airtable. Re-fetched rows whose
+# content hash is unchanged produce no events.
+WATERMARK_OVERLAP = timedelta(seconds=30)
+
+
+def diff_records(
+    previous: Optional[EmployeeRecord],
+    current: EmployeeRecord,
+    terminated_statuses: Collection[str],
+) -> List[ChangeEvent]:
+    """
+    Classify the differences between two versions of an employee.
+
+    Args:
+        previous: Record as last seen, or None for a new employee.
+        current: Record as now stored in Airtable.
+        terminated_statuses: Employment statuses that count as a termination.
+
+    Returns:
+        Events describing the change, in a stable order. Changes to fields
+        without a dedicated event type produce no events.
+    """
+    if previous is None:
+        return [
+            ChangeEvent(
+                type="hire",
+                email=current.email,
+                previous=None,
+                current=current.employment_status,
+                employee=current,
+            )
+        ]
+
+    events = []
+    if previous.employment_status != current.employment_status:
+        terminated = current.employment_status in terminated_statuses
+        events.append(
+            ChangeEvent(
+                type="termination" if terminated else "status_change",
+                email=current.email,
+                previous=previous.employment_status,
+                current=current.employment_status,
+                employee=current,
+            )
+        )
+    if (previous.manager_email or "").lower() != (current.manager_email or "").lower():
+        events.append(
+            ChangeEvent(
+                type="manager_change",
+                email=current.email,
+                previous=previous.manager_email,
+                current=current.manager_email,
+                employee=current,
+            )
+        )
+    if previous.title != current.title:
+        events.append(
+            ChangeEvent(
+                type="title_change",
+                email=current.email,
+                previous=previous.title,
+                current=current.title,
+                employee=current,
+            )
+        )
+    return events
+
+
+class ChangeFeed:
+    """
+    Polls Airtable for rows modified since a watermark and emits change events.
+
+    Only rows whose LAST_MODIFIED_TIME() is after the watermark are fetched.
+    Each fetched row is compared to the local index by content hash, and the
+    index is updated in place. Deleted rows are not visible to this query and
+    are not reported.
+    """
+
+    def __init__(
+        self,
+        client: Union[AirtableClient, FederatedClient],
+        index: EmployeeIndex,
+        watermark: datetime,
+        terminated_statuses: Collection[str],
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Initialize the feed.
+
+        Args:
+            client: Client used to query modified rows.
+            index: Local index holding the last known state of every employee.
+            watermark: Timezone-aware time the index is known to be current as of.
+            terminated_statuses: Employment statuses that count as a termination.
+            clock: Source of the current UTC time.
+        """
+        self._client = client
+        self._index = index
+        self._watermark = watermark
+        self._terminated_statuses = terminated_statuses
+        self._clock = clock
+
+    @property
+    def watermark(self) -> datetime:
+        """Time the local index is known to be current as of."""
+        return self._watermark
+
+    def poll(self) -> List[ChangeEvent]:
+        """
+        Fetch rows modified since the watermark and advance it.
+
+        Returns:
+            Events for every meaningful change found.
+        """
+        started = self._clock()
+        changed = self._client.modified_since(self._watermark - WATERMARK_OVERLAP)
+
+        events: List[ChangeEvent] = []
+        for record in changed:
+            previous = None
+            if record.record_id is not None:
+                previous = self._index.find_by_record_id(record.record_id)
+            if previous is None:
+                previous = self._index.find_by_email(record.email)
+            if previous is not None and self._index.content_hash(previous.email) == record_hash(record):
+                continue
+            events.extend(diff_records(previous, record, self._terminated_statuses))
+            self._index.upsert(record)
+
+        self._watermark = started
+        return events
+
+    def stream(self, interval: float, sleep: Callable[[float], None] = time.sleep) -> Iterator[ChangeEvent]:
+        """
+        Poll forever, yielding events as they are found.
+
+        Args:
+            interval: Seconds to wait between polls.
+            sleep: Function used to wait between polls.
+
+        Returns:
+            Never-ending iterator of change events.
+        """
+        while True:
+            yield from self.poll()
+            sleep(interval)
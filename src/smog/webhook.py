@@ -0,0 +1,276 @@
+"""
+Push-based index updates from Airtable webhooks.
+
+Airtable notifies a webhook URL with a small "ping" body; the changes
+themselves are listed through the webhook payloads API. WebhookSync turns
+those payloads into record IDs, fetches only those records, and patches them
+into an EmployeeIndex. Recorded payloads can also be POSTed directly, which
+is how the local stand-in (post_payloads) exercises a server without Airtable.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, Mapping, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from requests import RequestException
+
+from smog.client import AirtableClient
+from smog.index import EmployeeIndex
+
+MAC_HEADER = "X-Airtable-Content-MAC"
+
+
+def payload_record_changes(
+    payload: Mapping[str, Any],
+    table_id: Optional[str] = None,
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Extract the record IDs a webhook payload touches.
+
+    Args:
+        payload: One webhook payload in Airtable's JSON shape.
+        table_id: Only consider changes to this table. All tables if None.
+
+    Returns:
+        Tuple of (created or changed record IDs, destroyed record IDs).
+    """
+    upserted: Set[str] = set()
+    destroyed: Set[str] = set()
+    for changed_table_id, changes in payload.get("changedTablesById", {}).items():
+        if table_id is not None and changed_table_id != table_id:
+            continue
+        upserted.update(changes.get("createdRecordsById", {}))
+        upserted.update(changes.get("changedRecordsById", {}))
+        destroyed.update(changes.get("destroyedRecordIds", []))
+    return upserted - destroyed, destroyed
+
+
+def content_mac(secret: bytes, body: bytes) -> str:
+    """
+    Compute the value Airtable sends in the X-Airtable-Content-MAC header.
+
+    Args:
+        secret: The webhook's MAC secret, base64-decoded.
+        body: Raw request body.
+
+    Returns:
+        Header value of the form "hmac-sha256=<hex digest>".
+    """
+    return "hmac-sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+class WebhookSync:
+    """Applies webhook payloads to an EmployeeIndex by fetching only the changed records."""
+
+    def __init__(
+        self,
+        client: AirtableClient,
+        index: EmployeeIndex,
+        webhook_id: Optional[str] = None,
+        table_id: Optional[str] = None,
+        mac_secret: Optional[str] = None,
+        cursor: int = 1,
+    ) -> None:
+        """
+        Initialize the sync.
+
+        Args:
+            client: Client used to fetch changed records and webhook payloads.
+            index: Index to keep up to date.
+            webhook_id: Webhook whose payloads are fetched on each ping. Required for pings.
+            table_id: Airtable table ID to follow. All tables in the base if None.
+            mac_secret: Base64 MAC secret from webhook creation. Notifications are not verified if None.
+            cursor: Cursor of the next payload to fetch.
+        """
+        self._client = client
+        self._index = index
+        self._webhook_id = webhook_id
+        self._table_id = table_id
+        self._mac_secret = None if mac_secret is None else base64.b64decode(mac_secret)
+        self._cursor = cursor
+        # Reentrant so a ping can hold it across fetching and applying its payloads.
+        self._lock = threading.RLock()
+
+    @property
+    def index(self) -> EmployeeIndex:
+        """The index being kept up to date."""
+        return self._index
+
+    @property
+    def cursor(self) -> int:
+        """Cursor of the next webhook payload to fetch."""
+        return self._cursor
+
+    def verify(self, body: bytes, mac: Optional[str]) -> bool:
+        """
+        Check a notification's MAC header.
+
+        Args:
+            body: Raw request body.
+            mac: Value of the X-Airtable-Content-MAC header, if present.
+
+        Returns:
+            True if no secret is configured or the MAC matches.
+        """
+        if self._mac_secret is None:
+            return True
+        return mac is not None and hmac.compare_digest(content_mac(self._mac_secret, body), mac)
+
+    def apply_payloads(self, payloads: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Patch the index with the records touched by some payloads.
+
+        Args:
+            payloads: Webhook payloads in Airtable's JSON shape.
+
+        Returns:
+            Number of records upserted or removed.
+        """
+        upserted: Set[str] = set()
+        destroyed: Set[str] = set()
+        for payload in payloads:
+            changed, removed = payload_record_changes(payload, self._table_id)
+            upserted = (upserted - removed) | changed
+            destroyed = (destroyed - changed) | removed
+
+        records = self._client.find_by_record_ids(upserted) if upserted else []
+
+        with self._lock:
+            for record in records:
+                self._index.upsert(record)
+            for record_id in destroyed:
+                existing = self._index.find_by_record_id(record_id)
+                if existing is not None:
+                    self._index.remove(existing.email)
+        return len(records) + len(destroyed)
+
+    def handle_notification(self, body: Mapping[str, Any]) -> int:
+        """
+        Handle one POSTed notification.
+
+        A body carrying "changedTablesById" (or a "payloads" list of such
+        bodies) is applied directly. Any other body is treated as an Airtable
+        ping, and new payloads are fetched from the cursor onwards. The cursor
+        only moves past payloads once they are applied, so if fetching them or
+        their records fails, the next ping retries them.
+
+        Args:
+            body: Decoded JSON request body.
+
+        Returns:
+            Number of records upserted or removed.
+
+        Raises:
+            ValueError: If a ping arrives and no webhook_id was configured.
+            requests.RequestException: If fetching payloads or records from Airtable fails.
+        """
+        if "payloads" in body:
+            return self.apply_payloads(body["payloads"])
+        if "changedTablesById" in body:
+            return self.apply_payloads([body])
+
+        if self._webhook_id is None:
+            raise ValueError("Received a webhook ping but no webhook_id is configured")
+        with self._lock:
+            payloads = self._client.webhook_payloads(self._webhook_id, self._cursor)
+            changed = self.apply_payloads(payloads)
+            if payloads:
+                self._cursor = int(payloads[-1]["cursor"]) + 1
+        return changed
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    server: "WebhookServer"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if not self.server.sync.verify(body, self.headers.get(MAC_HEADER)):
+            self._respond(401, {"error": "invalid MAC"})
+            return
+        try:
+            changed = self.server.sync.handle_notification(json.loads(body or b"{}"))
+        except ValueError as e:
+            self._respond(400, {"error": str(e)})
+            return
+        except RequestException as e:
+            # The cursor has not moved, so the next ping fetches these payloads again.
+            self._respond(502, {"error": f"Airtable request failed: {e}"})
+            return
+        except Exception as e:
+            self._respond(500, {"error": str(e)})
+            return
+        self._respond(200, {"changed": changed})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        email = parse_qs(url.query).get("email", [""])[0]
+        if url.path != "/employee" or not email:
+            self._respond(404, {"error": "use /employee?email=ADDRESS"})
+            return
+        result = self.server.sync.index.get_employee_with_management_chain(email)
+        if result is None:
+            self._respond(404, {"error": f"Employee not found: {email}"})
+            return
+        self._respond(200, result.model_dump(mode="json"))
+
+    def _respond(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """
+    HTTP server receiving webhook notifications.
+
+    POST / accepts notifications. GET /employee?email=ADDRESS answers
+    lookups from the index being kept fresh.
+    """
+
+    def __init__(self, address: Tuple[str, int], sync: WebhookSync) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to listen on. Port 0 picks a free port.
+            sync: Sync that notifications are handed to.
+        """
+        super().__init__(address, _WebhookHandler)
+        self.sync = sync
+
+
+def post_payloads(url: str, payloads: Sequence[Mapping[str, Any]], mac_secret: Optional[str] = None) -> None:
+    """
+    POST recorded webhook payloads to a receiver, one request per payload.
+
+    This is a local stand-in for Airtable when testing a receiver.
+
+    Args:
+        url: Receiver URL.
+        payloads: Recorded payloads in Airtable's JSON shape.
+        mac_secret: Base64 MAC secret to sign requests with, if the receiver verifies them.
+
+    Raises:
+        urllib.error.HTTPError: If the receiver rejects a payload.
+    """
+    for payload in payloads:
+        body = json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(url, data=body, method="POST")
+        request.add_header("Content-Type", "application/json")
+        if mac_secret is not None:
+            request.add_header(MAC_HEADER, content_mac(base64.b64decode(mac_secret), body))
+        with urllib.request.urlopen(request):
+            pass
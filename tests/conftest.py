@@ -0,0 +1,13 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep parsed-config caches out of the real home directory."""
+    cache_dir = tmp_path / "smog-cache"
+    monkeypatch.setenv("SMOG_CACHE_DIR", str(cache_dir))
+    return cache_dir
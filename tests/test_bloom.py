@@ -0,0 +1,67 @@
+"""Tests for the email prefilter."""
+
+from pathlib import Path
+
+import pytest
+
+from smog.bloom import BloomFilter, filter_path
+from smog.models import EmployeeRecord
+
+
+def test_contains_every_email_case_insensitively() -> None:
+    """Test that primary and alternate emails are always found, whatever their case."""
+    bloom = BloomFilter.build(
+        [
+            EmployeeRecord(
+                email="John.Doe@example.com",
+                alternate_emails="john@example.com, jdoe@oldco.com",
+                employment_status="FTE",
+            ),
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+        ]
+    )
+
+    for email in ["john.doe@example.com", "JOHN@example.com", "jdoe@oldco.com", "ceo@EXAMPLE.com"]:
+        assert email in bloom
+    assert "nobody@example.com" not in bloom
+    assert bloom.count == 4
+
+
+def test_false_positive_rate_stays_near_target() -> None:
+    """Test that unknown emails pass at about the rate the filter was sized for."""
+    records = [EmployeeRecord(email=f"employee{i}@example.com", employment_status="FTE") for i in range(5000)]
+    bloom = BloomFilter.build(records, false_positive_rate=0.01)
+
+    passed = sum(f"contractor{i}@example.com" in bloom for i in range(20000))
+
+    assert passed / 20000 < 0.02
+    assert 0.005 < bloom.false_positive_rate < 0.015
+    assert bloom.nbytes < 5000 * 10 // 8 + 1
+
+
+def test_save_and_load_round_trip(tmp_path: Path) -> None:
+    """Test that a saved filter loads with the same contents and stats."""
+    bloom = BloomFilter.build([EmployeeRecord(email="ceo@example.com", employment_status="FTE")])
+    path = filter_path(tmp_path / "employees.snap")
+
+    bloom.save(path)
+    loaded = BloomFilter.load(path)
+
+    assert path.name == "employees.snap.bloom"
+    assert "ceo@example.com" in loaded
+    assert loaded.stats() == bloom.stats()
+
+
+def test_load_rejects_other_files(tmp_path: Path) -> None:
+    """Test that a file that is not a filter is refused."""
+    path = tmp_path / "employees.snap.bloom"
+    path.write_bytes(b"not a filter at all, just some bytes")
+
+    with pytest.raises(ValueError, match="Not a smog filter file"):
+        BloomFilter.load(path)
+
+
+def test_sized_for_rejects_impossible_rates() -> None:
+    """Test that the target false positive rate must be strictly between 0 and 1."""
+    with pytest.raises(ValueError):
+        BloomFilter.sized_for(10, false_positive_rate=0)
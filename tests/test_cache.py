@@ -0,0 +1,200 @@
+"""Tests for the stale-while-revalidate cache."""
+
+import threading
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from smog.cache import StaleWhileRevalidateCache
+from smog.client import AirtableClient
+from smog.config import AirtableConfig
+from smog.deadline import DeadlineExceeded
+from smog.models import EmployeeRecord
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fresh_entry_is_served_without_reloading() -> None:
+    """Test that a fresh entry does not call the loader again."""
+    clock = FakeClock()
+    cache: StaleWhileRevalidateCache[str, int] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60, clock=clock
+    )
+    calls: List[int] = []
+
+    def loader() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get("a", loader) == 1
+    clock.now = 5
+    assert cache.get("a", loader) == 1
+    assert len(calls) == 1
+    cache.close()
+
+
+def test_stale_entry_is_served_while_refreshing() -> None:
+    """Test that an expired entry is returned immediately and refreshed in the background."""
+    clock = FakeClock()
+    cache: StaleWhileRevalidateCache[str, str] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60, clock=clock
+    )
+    release = threading.Event()
+
+    assert cache.get("a", lambda: "old") == "old"
+    clock.now = 20
+
+    def slow_loader() -> str:
+        release.wait(5)
+        return "new"
+
+    assert cache.get("a", slow_loader) == "old"
+    release.set()
+    cache.close()
+    assert cache.get("a", lambda: "unused") == "new"
+
+
+def test_entry_past_max_staleness_blocks_on_load() -> None:
+    """Test that callers block once an entry exceeds max_staleness."""
+    clock = FakeClock()
+    cache: StaleWhileRevalidateCache[str, str] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60, clock=clock
+    )
+
+    cache.get("a", lambda: "old")
+    clock.now = 61
+
+    assert cache.get("a", lambda: "new") == "new"
+    cache.close()
+
+
+def test_refresh_ahead_renews_before_expiry() -> None:
+    """Test that reads inside the refresh-ahead window trigger a refresh."""
+    clock = FakeClock()
+    cache: StaleWhileRevalidateCache[str, str] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60, refresh_ahead=3, clock=clock
+    )
+
+    cache.get("a", lambda: "old")
+    clock.now = 8
+    assert cache.get("a", lambda: "new") == "old"
+    cache.close()
+    assert cache.get("a", lambda: "unused") == "new"
+
+
+def test_concurrent_misses_share_one_load() -> None:
+    """Test that concurrent callers for the same key are single-flighted."""
+    cache: StaleWhileRevalidateCache[str, int] = StaleWhileRevalidateCache(ttl=10, max_staleness=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls: List[int] = []
+
+    def loader() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: List[int] = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("a", loader))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 5
+    assert len(calls) == 1
+    cache.close()
+
+
+def test_caller_joining_a_load_waits_only_for_its_timeout() -> None:
+    """Test that a caller sharing another's in-flight load gives up at its own timeout."""
+    cache: StaleWhileRevalidateCache[str, int] = StaleWhileRevalidateCache(ttl=10, max_staleness=60)
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader() -> int:
+        started.set()
+        release.wait(5)
+        return 42
+
+    results: List[int] = []
+    first = threading.Thread(target=lambda: results.append(cache.get("a", loader)))
+    first.start()
+    started.wait(5)
+
+    with pytest.raises(DeadlineExceeded):
+        cache.get("a", lambda: 0, timeout=0.05)
+    release.set()
+    first.join()
+
+    assert results == [42]
+    assert cache.get("a", lambda: 0) == 42
+    cache.close()
+
+
+def test_miss_does_not_queue_behind_busy_refreshes() -> None:
+    """Test that a blocking miss loads on the caller's thread while every refresh worker is stuck."""
+    clock = FakeClock()
+    cache: StaleWhileRevalidateCache[str, str] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60, max_workers=1, clock=clock
+    )
+    release = threading.Event()
+    refresh_threads: List[threading.Thread] = []
+
+    def stuck_refresh() -> str:
+        refresh_threads.append(threading.current_thread())
+        release.wait(5)
+        return "new"
+
+    cache.get("a", lambda: "old")
+    cache.get("b", lambda: "old")
+    clock.now = 20
+    assert cache.get("a", stuck_refresh) == "old"
+    assert cache.get("b", stuck_refresh) == "old"
+
+    assert cache.get("cold", lambda: threading.current_thread().name) == threading.current_thread().name
+    release.set()
+    cache.close()
+
+    assert len(refresh_threads) == 1
+    assert refresh_threads[0].daemon
+    assert cache.get("a", lambda: "unused") == "new"
+
+
+def test_invalid_bounds_are_rejected() -> None:
+    """Test that max_staleness shorter than ttl is rejected."""
+    with pytest.raises(ValueError):
+        StaleWhileRevalidateCache(ttl=10, max_staleness=5)
+
+
+def test_client_find_by_email_uses_cache() -> None:
+    """Test that AirtableClient answers repeated lookups from its cache."""
+    cache: StaleWhileRevalidateCache[str, Optional[EmployeeRecord]] = StaleWhileRevalidateCache(
+        ttl=10, max_staleness=60
+    )
+    config = AirtableConfig(api_key="test_api_key", base_id="appTestBase", table_name="Users")
+    client = AirtableClient(config, cache=cache)
+    client._table = MagicMock()
+    client._table.all.return_value = [
+        {"id": "rec1", "fields": {"Email": "ceo@example.com", "Employee Status": "FTE"}},
+    ]
+
+    first = client.find_by_email("ceo@example.com")
+    second = client.find_by_email("CEO@example.com")
+
+    assert isinstance(first, EmployeeRecord)
+    assert second == first
+    assert client._table.all.call_count == 1
+    cache.close()
@@ -0,0 +1,148 @@
+"""Tests for HTTP record and replay."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ReadTimeout
+
+from smog.cassette import Cassette, CassetteMiss, RecordingTransport, ReplayTransport, run_workload
+from smog.client import AirtableClient
+from smog.config import AirtableConfig
+
+ROWS: Dict[str, Dict[str, Any]] = {
+    "john.doe@example.com": {"Email": "john.doe@example.com", "Manager Email": "ceo@example.com"},
+    "ceo@example.com": {"Email": "ceo@example.com"},
+}
+
+
+def _row(index: int) -> Dict[str, Any]:
+    fields = list(ROWS.values())[index]
+    return {"id": f"rec{index}", "createdTime": "2024-01-01T00:00:00.000Z", "fields": fields}
+
+
+class FakeAirtable(BaseAdapter):
+    """Answers email formula lookups from ROWS and pages the full table one row at a time."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: List[str] = []
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+        self.requests.append(request.url or "")
+        params = parse_qs(urlsplit(request.url or "").query)
+        formula = params.get("filterByFormula", [""])[0]
+        if formula:
+            records = [_row(i) for i, email in enumerate(ROWS) if f"'{email}'" in formula]
+            page: Dict[str, Any] = {"records": records}
+        else:
+            index = int(params.get("offset", ["0"])[0])
+            page = {"records": [_row(index)]}
+            if index + 1 < len(ROWS):
+                page["offset"] = str(index + 1)
+        response = Response()
+        response.status_code = 200
+        response._content = json.dumps(page).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.request = request
+        response.url = request.url or ""
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _client(transport: Any) -> AirtableClient:
+    config = AirtableConfig(api_key="pat", base_id="appBase", table_name="Users")
+    return AirtableClient(config, transport=transport)
+
+
+def _record() -> Cassette:
+    """Record a chain lookup and a full-table read against the fake Airtable."""
+    recorder = RecordingTransport()
+    client = _client(recorder)
+    recorder._inner = FakeAirtable()
+    client.get_employee_with_management_chain("john.doe@example.com")
+    client.all_employees()
+    return recorder.cassette
+
+
+def test_recording_captures_formula_pages_and_timings(tmp_path: Path) -> None:
+    """Test that each request is recorded with its parameters, response and latency, and survives a save."""
+    cassette = _record()
+
+    assert len(cassette) == 4
+    lookup, _, first_page, second_page = cassette
+    assert lookup["params"]["filterByFormula"] == ["LOWER({Email}) = LOWER('john.doe@example.com')"]
+    assert json.loads(lookup["response"])["records"][0]["fields"]["Email"] == "john.doe@example.com"
+    assert "offset" not in first_page["params"] and second_page["params"]["offset"] == ["1"]
+    assert all(interaction["elapsed"] >= 0 and interaction["status"] == 200 for interaction in cassette)
+    assert cassette.stats()["pages"] == 1
+
+    path = tmp_path / "workload.cassette"
+    cassette.save(path)
+    assert Cassette.load(path).interactions == cassette.interactions
+
+
+def test_replay_answers_client_without_network() -> None:
+    """Test that a replayed client gets the recorded results and unrecorded requests fail."""
+    replay = ReplayTransport(_record(), latency_scale=0)
+    client = _client(replay)
+
+    result = client.get_employee_with_management_chain("john.doe@example.com")
+
+    assert result is not None and result.manager is not None
+    assert result.manager.email == "ceo@example.com"
+    assert [record.email for record in client.all_employees()] == list(ROWS)
+    assert replay.requests == 4
+    with pytest.raises(CassetteMiss):
+        client.find_by_email("new.hire@example.com")
+
+
+def test_replay_scales_latency_and_honours_read_timeout() -> None:
+    """Test that recorded latencies are scaled and a delay past the read timeout times out."""
+    cassette = _record()
+    for interaction in cassette:
+        interaction["elapsed"] = 0.5
+    sleep = Mock()
+
+    client = _client(ReplayTransport(cassette, latency_scale=2.0, sleep=sleep))
+    client.find_by_email("john.doe@example.com")
+    sleep.assert_called_once_with(1.0)
+
+    session = client._table.api.session
+    with pytest.raises(ReadTimeout):
+        session.get(
+            "https://api.airtable.com/v0/appBase/Users",
+            params={"filterByFormula": "LOWER({Email}) = LOWER('ceo@example.com')"},
+            timeout=(5, 0.25),
+        )
+    assert sleep.call_args.args == (0.25,)
+
+
+def test_replay_with_timeout_matches_recording_without_one() -> None:
+    """Test that deadline-bound lookups send the same requests as unbounded ones."""
+    config = AirtableConfig(api_key="pat", base_id="appBase", table_name="Users")
+    client = AirtableClient(config, timeout=2.0, transport=ReplayTransport(_record(), latency_scale=0))
+
+    result = client.get_employee_with_management_chain("john.doe@example.com")
+
+    assert result is not None and result.manager is not None
+    assert result.manager.email == "ceo@example.com"
+
+
+def test_run_workload_counts_outcomes() -> None:
+    """Test that a workload run reports found, missing and failed lookups."""
+    client = _client(ReplayTransport(_record(), latency_scale=0))
+
+    stats = run_workload(client, ["john.doe@example.com", "john.doe@example.com", "ghost@example.com"])
+
+    assert stats["lookups"] == 3
+    assert stats["found"] == 2
+    assert stats["errors"] == 1
+    assert stats["p95_latency"] >= stats["p50_latency"] >= 0
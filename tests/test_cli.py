@@ -1,11 +1,22 @@
 """Tests for CLI interface."""
 
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 from click.testing import CliRunner
 
+from smog.bloom import BloomFilter
+from smog.cassette import Cassette
 from smog.cli import main
-from smog.models import EmployeeRecord, EmployeeLookupResult
+from smog.config import AirtableConfig
+from smog.deadline import DeadlineExceeded
+from smog.history import History
+from smog.models import ChangeEvent, EmployeeRecord, EmployeeLookupResult
+from smog.snapshot import Snapshot, write_snapshot
 
 
 def test_cli_with_full_management_chain() -> None:
@@ -314,3 +325,418 @@ def test_cli_preserves_full_email_regardless_of_config() -> None:
         mock_client.get_employee_with_management_chain.assert_called_with("jdoe@custom.com")
 
     assert result.exit_code == 0
+
+
+def test_cli_lookup_from_snapshot_file(tmp_path: Path) -> None:
+    """Test that --snapshot answers lookups from a snapshot without calling Airtable."""
+    runner = CliRunner()
+
+    path = tmp_path / "employees.snap"
+    write_snapshot(
+        [
+            EmployeeRecord(
+                email="john.doe@example.com",
+                manager_email="ceo@example.com",
+                employment_status="FTE",
+            ),
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+        ],
+        path,
+    )
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        result = runner.invoke(main, ["john.doe@example.com", "--snapshot", str(path)])
+
+        mock_client_class.assert_not_called()
+
+    assert result.exit_code == 0
+    assert "ceo@example.com" in result.output
+
+
+def test_cli_lookup_finds_alternate_email_at_aliased_domain(tmp_path: Path) -> None:
+    """Test that an alternate email is looked up as typed before its domain alias is applied."""
+    runner = CliRunner()
+    path = tmp_path / "employees.snap"
+    write_snapshot(
+        [EmployeeRecord(email="vp@x.com", alternate_emails="vice@old.com", employment_status="FTE")],
+        path,
+    )
+
+    with patch("smog.cli.load_app_config") as mock_app_config:
+        mock_app_config.return_value = {
+            "default_email_domain": "",
+            "domain_aliases": {"old.com": "x.com"},
+            "strip_plus_tags": False,
+        }
+        result = runner.invoke(main, ["vice@old.com", "--snapshot", str(path)])
+
+    assert result.exit_code == 0
+    assert "vp@x.com" in result.output
+
+
+def test_cli_live_lookup_sends_only_normalized_email() -> None:
+    """Test that a live lookup queries Airtable once, with the normalized address."""
+    runner = CliRunner()
+
+    with patch("smog.cli.AirtableClient") as mock_client_class, \
+         patch("smog.cli.load_app_config") as mock_app_config:
+        mock_app_config.return_value = {
+            "default_email_domain": "",
+            "domain_aliases": {"old.com": "x.com"},
+            "strip_plus_tags": True,
+        }
+        mock_client = Mock()
+        mock_client.get_employee_with_management_chain.return_value = None
+        mock_client_class.return_value = mock_client
+
+        result = runner.invoke(main, ["jane+svc@old.com"])
+
+    mock_client.get_employee_with_management_chain.assert_called_once_with("jane@x.com")
+    assert result.exit_code == 1
+
+
+def test_cli_lookup_has_no_hedge_option() -> None:
+    """Test that a one-off lookup doesn't offer hedging, which needs a long-lived client."""
+    result = CliRunner().invoke(main, ["jdoe@example.com", "--hedge"])
+
+    assert result.exit_code == 2
+    assert "--hedge" in result.output
+
+
+def test_cli_snapshot_command_writes_file(tmp_path: Path) -> None:
+    """Test that the snapshot command writes every employee to the output file."""
+    runner = CliRunner()
+    path = tmp_path / "employees.snap"
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        mock_client = Mock()
+        mock_client.all_employees.return_value = [
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+        ]
+        mock_client_class.return_value = mock_client
+
+        result = runner.invoke(main, ["snapshot", str(path)])
+
+    assert result.exit_code == 0
+    assert "Wrote 1 employees" in result.output
+    with Snapshot.open(path) as snapshot:
+        assert "ceo@example.com" in snapshot
+    assert "ceo@example.com" in BloomFilter.load(tmp_path / "employees.snap.bloom")
+
+
+def test_cli_lookup_with_prefilter_skips_unknown_emails(tmp_path: Path) -> None:
+    """Test that --prefilter reports a ruled-out email as not found without querying Airtable."""
+    runner = CliRunner()
+    path = tmp_path / "employees.snap.bloom"
+    BloomFilter.build([EmployeeRecord(email="ceo@example.com", employment_status="FTE")]).save(path)
+
+    with patch("smog.cli.load_sources") as mock_sources:
+        mock_sources.return_value = [AirtableConfig(api_key="pat", base_id="app", table_name="Users")]
+        with patch("smog.client.Api") as mock_api:
+            result = runner.invoke(main, ["lookup", "svc-deploy@example.com", "--prefilter", str(path)])
+
+        mock_api.return_value.table.return_value.all.assert_not_called()
+
+    assert result.exit_code == 1
+    assert "Employee not found: svc-deploy@example.com" in result.output
+
+
+def test_cli_prefilter_stats(tmp_path: Path) -> None:
+    """Test that prefilter stats reports the email count, memory and false positive rate."""
+    runner = CliRunner()
+    path = tmp_path / "employees.bloom"
+    BloomFilter.build([EmployeeRecord(email="ceo@example.com", employment_status="FTE")]).save(path)
+
+    result = runner.invoke(main, ["prefilter", "stats", str(path)])
+
+    assert result.exit_code == 0
+    assert "Emails:              1" in result.output
+    assert "bytes" in result.output
+    assert "False positive rate:" in result.output
+
+
+def test_cli_watch_streams_ndjson_events() -> None:
+    """Test that watch prints one JSON object per change event."""
+    runner = CliRunner()
+
+    event = ChangeEvent(
+        type="hire",
+        email="new.hire@example.com",
+        previous=None,
+        current="FTE",
+        employee=EmployeeRecord(email="new.hire@example.com", employment_status="FTE"),
+    )
+
+    with patch("smog.cli.AirtableClient") as mock_client_class, \
+         patch("smog.cli.ChangeFeed") as mock_feed_class:
+        mock_client_class.return_value.all_employees.return_value = []
+        mock_feed_class.return_value.stream.return_value = iter([event])
+
+        result = runner.invoke(main, ["watch", "--format", "ndjson"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output.strip()) == json.loads(event.model_dump_json())
+
+
+def test_cli_lookup_as_of_reads_history(tmp_path: Path) -> None:
+    """Test that --as-of answers from recorded history instead of Airtable."""
+    runner = CliRunner()
+
+    history = History(tmp_path)
+    history.record(
+        [
+            EmployeeRecord(
+                email="john.doe@example.com",
+                manager_email="old.manager@example.com",
+                employment_status="FTE",
+                record_id="rec1",
+            ),
+        ],
+        datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc),
+    )
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        result = runner.invoke(
+            main,
+            ["john.doe@example.com", "--as-of", "2026-03-01", "--history", str(tmp_path)],
+        )
+
+        mock_client_class.assert_not_called()
+
+    assert result.exit_code == 0
+    assert "N/A" in result.output
+
+    result = runner.invoke(
+        main,
+        ["john.doe@example.com", "--as-of", "2026-02-28", "--history", str(tmp_path)],
+    )
+    assert result.exit_code == 1
+    assert "No history" in result.output
+
+
+def test_cli_reconcile_annotates_csv_from_snapshot(tmp_path: Path) -> None:
+    """Test that reconcile streams annotated CSV rows joined against a snapshot."""
+    runner = CliRunner()
+
+    snapshot_path = tmp_path / "employees.snap"
+    write_snapshot(
+        [
+            EmployeeRecord(email="jdoe@example.com", employment_status="FTE"),
+            EmployeeRecord(email="left@example.com", employment_status="Terminated"),
+        ],
+        snapshot_path,
+    )
+    accounts = tmp_path / "accounts.csv"
+    accounts.write_text("account,email\nacct-1,jdoe\nacct-2,left@example.com\nacct-3,svc@example.com\n")
+
+    with patch("smog.cli.AirtableClient") as mock_client_class, \
+         patch("smog.cli.load_app_config") as mock_app_config:
+        mock_app_config.return_value = {
+            "default_email_domain": "example.com",
+            "terminated_statuses": ["Terminated"],
+        }
+
+        result = runner.invoke(main, ["reconcile", str(accounts), "--snapshot", str(snapshot_path)])
+
+        mock_client_class.assert_not_called()
+
+    assert result.exit_code == 0
+    rows = list(csv.DictReader(io.StringIO(result.output)))
+    assert [row["smog_status"] for row in rows] == ["active", "terminated", "unknown"]
+    assert rows[0]["smog_email"] == "jdoe@example.com"
+
+
+def test_cli_timeout_reports_partial_chain() -> None:
+    """Test that --timeout reaches the client and a partial chain is flagged."""
+    runner = CliRunner()
+    result_obj = EmployeeLookupResult(
+        employee=EmployeeRecord(
+            email="john.doe@example.com",
+            manager_email="jane.smith@example.com",
+            employment_status="FTE",
+        ),
+        manager=None,
+        managers_manager=None,
+        partial=True,
+    )
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        mock_client = Mock()
+        mock_client.get_employee_with_management_chain.return_value = result_obj
+        mock_client_class.return_value = mock_client
+
+        result = runner.invoke(main, ["john.doe@example.com", "--timeout", "1.5"])
+
+    assert result.exit_code == 0
+    assert mock_client_class.call_args.kwargs["timeout"] == 1.5
+    assert "john.doe@example.com" in result.output
+    assert "management chain was complete" in result.output
+
+
+def test_cli_timeout_before_employee_found() -> None:
+    """Test that a lookup timing out before the employee is found exits non-zero."""
+    runner = CliRunner()
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        mock_client = Mock()
+        mock_client.get_employee_with_management_chain.side_effect = DeadlineExceeded("slow")
+        mock_client_class.return_value = mock_client
+
+        result = runner.invoke(main, ["john.doe@example.com", "--timeout", "0.5"])
+
+    assert result.exit_code == 1
+    assert "Timed out" in result.output
+
+
+def test_cli_shell_runs_commands_against_one_client() -> None:
+    """Test that the shell builds one client, indexes the table and runs piped commands."""
+    runner = CliRunner()
+    employee = EmployeeRecord(email="john.doe@example.com", employment_status="FTE")
+
+    with patch("smog.cli.AirtableClient") as mock_client_class:
+        mock_client = Mock()
+        mock_client.all_employees.return_value = [employee]
+        mock_client.get_employee_with_management_chain.return_value = EmployeeLookupResult(employee=employee)
+        mock_client_class.return_value = mock_client
+
+        result = runner.invoke(main, ["shell"], input="lookup john.doe@example.com\nsearch john\nquit\n")
+
+    assert result.exit_code == 0
+    assert mock_client_class.call_count == 1
+    assert "Employment Status: FTE" in result.output
+    assert "john.doe@example.com [FTE]" in result.output
+
+
+def test_cli_materialize_and_sql(tmp_path: Path) -> None:
+    """Test that materialize writes a database that sql can query."""
+    runner = CliRunner()
+    snapshot_path = tmp_path / "employees.snap"
+    db_path = tmp_path / "employees.db"
+    write_snapshot(
+        [
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(
+                email="jane@example.com", manager_email="ceo@example.com", employment_status="FTE"
+            ),
+        ],
+        snapshot_path,
+    )
+
+    built = runner.invoke(main, ["materialize", "--db", str(db_path), "--snapshot", str(snapshot_path)])
+    statement = "SELECT employee, depth FROM closure WHERE ancestor = 'ceo@example.com' ORDER BY depth"
+    result = runner.invoke(main, ["sql", statement, "--db", str(db_path), "--format", "csv"])
+    failed = runner.invoke(main, ["sql", "SELECT nope FROM employees", "--db", str(db_path)])
+
+    assert built.exit_code == 0
+    assert "Wrote 2 employees" in built.output
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["employee,depth", "ceo@example.com,0", "jane@example.com,1"]
+    assert failed.exit_code == 1
+    assert "no such column" in failed.output
+
+
+def test_cli_report_span_and_chains(tmp_path: Path) -> None:
+    """Test that report prints span of control and chain columns from a snapshot."""
+    runner = CliRunner()
+    snapshot_path = tmp_path / "employees.snap"
+    write_snapshot(
+        [
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(
+                email="jane@example.com",
+                manager_email="ceo@example.com",
+                employment_status="FTE",
+            ),
+            EmployeeRecord(
+                email="john@example.com",
+                manager_email="jane@example.com",
+                employment_status="FTE",
+            ),
+        ],
+        snapshot_path,
+    )
+
+    span = runner.invoke(main, ["report", "span", "--snapshot", str(snapshot_path)])
+    chains = runner.invoke(main, ["report", "chains", "--snapshot", str(snapshot_path), "--format", "csv"])
+
+    assert span.exit_code == 0
+    assert span.output.splitlines() == [
+        "manager,direct_reports,total_reports,depth",
+        "ceo@example.com,1,2,0",
+        "jane@example.com,1,1,1",
+    ]
+    assert chains.output.splitlines()[0] == "email,manager_1,manager_2"
+    assert "john@example.com,jane@example.com,ceo@example.com" in chains.output.splitlines()
+
+
+def test_cli_orgchart_json(tmp_path: Path) -> None:
+    """Test that orgchart prints a nested JSON tree limited to the requested depth."""
+    runner = CliRunner()
+    snapshot_path = tmp_path / "employees.snap"
+    write_snapshot(
+        [
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(email="vp@example.com", manager_email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(email="eng@example.com", manager_email="vp@example.com", employment_status="FTE"),
+        ],
+        snapshot_path,
+    )
+
+    result = runner.invoke(
+        main,
+        ["orgchart", "ceo@example.com", "--depth", "1", "--format", "json", "--snapshot", str(snapshot_path)],
+    )
+    missing = runner.invoke(main, ["orgchart", "nobody@example.com", "--snapshot", str(snapshot_path)])
+
+    assert result.exit_code == 0
+    tree = json.loads(result.output)
+    assert tree["children"][0]["email"] == "vp@example.com"
+    assert tree["children"][0]["hidden_reports"] == 1
+    assert missing.exit_code == 1
+
+
+def test_cli_cassette_replay_reports_requests(tmp_path: Path) -> None:
+    """Test that replay runs the workload against the cassette and reports request counts."""
+    runner = CliRunner()
+    path = tmp_path / "workload.cassette"
+    Cassette(
+        [
+            {
+                "at": 0.0,
+                "method": "GET",
+                "path": "/v0/app/Users",
+                "params": {"filterByFormula": ["LOWER({Email}) = LOWER('ceo@example.com')"]},
+                "body": None,
+                "status": 200,
+                "content_type": "application/json",
+                "elapsed": 0.2,
+                "response": json.dumps(
+                    {
+                        "records": [
+                            {
+                                "id": "rec1",
+                                "createdTime": "2024-01-01T00:00:00.000Z",
+                                "fields": {"Email": "ceo@example.com"},
+                            }
+                        ]
+                    }
+                ),
+            }
+        ]
+    ).save(path)
+    workload = tmp_path / "emails.txt"
+    workload.write_text("# a day of lookups\nceo@example.com\nceo@example.com\n")
+
+    with patch("smog.cli.load_sources") as mock_sources:
+        mock_sources.return_value = [AirtableConfig(api_key="pat", base_id="app", table_name="Users")]
+        result = runner.invoke(
+            main, ["cassette", "replay", str(path), str(workload), "--latency-scale", "0"]
+        )
+    stats = runner.invoke(main, ["cassette", "stats", str(path)])
+
+    assert result.exit_code == 0
+    assert "Lookups:        2" in result.output
+    assert "Found:          2" in result.output
+    assert "Requests:       2" in result.output
+    assert stats.exit_code == 0
+    assert "P50 latency:    0.200s" in stats.output
@@ -1,12 +1,16 @@
 """Tests for Airtable client."""
 
+import threading
+from datetime import datetime, timezone
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, Mock
 
 import pytest
 
+from smog.bloom import BloomFilter
 from smog.client import AirtableClient
 from smog.config import AirtableConfig
+from smog.deadline import DeadlineExceeded
 from smog.models import EmployeeRecord, EmployeeLookupResult
 
 
@@ -306,3 +310,121 @@ def test_get_employee_with_management_chain_employee_not_found(
     result = client.get_employee_with_management_chain("nonexistent@example.com")
 
     assert result is None
+
+
+def test_all_employees_returns_every_record(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that all_employees maps every Airtable row to an EmployeeRecord."""
+    mock_table.all.return_value = [
+        {"id": "rec1", "fields": {"Email": "john.doe@example.com", "Employee Status": "FTE"}},
+        {"id": "rec2", "fields": {"Email": "ceo@example.com"}},
+    ]
+
+    client = AirtableClient(mock_config)
+    client._table = mock_table
+
+    result = client.all_employees()
+
+    assert [record.email for record in result] == ["john.doe@example.com", "ceo@example.com"]
+    assert result[1].employment_status == "Unknown"
+
+
+def test_modified_since_filters_on_last_modified_time(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that modified_since queries rows changed after the watermark and keeps record IDs."""
+    mock_table.all.return_value = [
+        {"id": "rec1", "fields": {"Email": "john.doe@example.com", "Employee Status": "FTE"}},
+    ]
+
+    client = AirtableClient(mock_config)
+    client._table = mock_table
+
+    result = client.modified_since(datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc))
+
+    formula = mock_table.all.call_args.kwargs["formula"]
+    assert "LAST_MODIFIED_TIME()" in formula
+    assert "2026-03-01T12:30:00.000Z" in formula
+    assert result[0].record_id == "rec1"
+
+
+def test_find_by_record_ids_batches_record_id_formula(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that record IDs are fetched with RECORD_ID() formulas in batches."""
+    mock_table.all.return_value = []
+
+    client = AirtableClient(mock_config)
+    client._table = mock_table
+
+    client.find_by_record_ids([f"rec{i:03d}" for i in range(120)])
+
+    formulas = [call.kwargs["formula"] for call in mock_table.all.call_args_list]
+    assert len(formulas) == 3
+    assert formulas[0].startswith("OR(RECORD_ID() = 'rec000'")
+
+
+def test_find_by_email_raises_when_timeout_expires(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that a lookup slower than its timeout raises DeadlineExceeded."""
+    release = threading.Event()
+    mock_table.api.session.get.side_effect = lambda *args, **kwargs: release.wait(5) and Mock()
+
+    client = AirtableClient(mock_config, timeout=0.05)
+    client._table = mock_table
+
+    with pytest.raises(DeadlineExceeded):
+        client.get_employee_with_management_chain("john.doe@example.com")
+    release.set()
+
+
+def test_find_by_email_limits_request_timeout_to_remaining_time(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that a lookup under a timeout caps the HTTP timeouts at the time left, on a daemon thread."""
+    record = {"id": "rec123", "fields": {"Email": "john.doe@example.com", "Employee Status": "FTE"}}
+    threads: List[threading.Thread] = []
+
+    def get(*args: Any, **kwargs: Any) -> Mock:
+        threads.append(threading.current_thread())
+        return Mock(**{"json.return_value": {"records": [record]}})
+
+    mock_table.api.session.get.side_effect = get
+
+    client = AirtableClient(mock_config, timeout=2.0)
+    client._table = mock_table
+
+    result = client.find_by_email("john.doe@example.com", timeout=2.0)
+
+    assert result is not None
+    connect_timeout, read_timeout = mock_table.api.session.get.call_args.kwargs["timeout"]
+    assert 0 < connect_timeout == read_timeout <= 2.0
+    assert threads[0].daemon
+    mock_table.api.build_url.assert_called_once_with("appTestBase", "Users")
+    mock_table.all.assert_not_called()
+
+
+def test_find_by_email_skips_request_when_prefilter_rules_out_email(
+    mock_config: AirtableConfig,
+    mock_table: Mock,
+) -> None:
+    """Test that an email missing from the prefilter is not found without querying Airtable."""
+    prefilter = BloomFilter.build([EmployeeRecord(email="john.doe@example.com", employment_status="FTE")])
+    mock_table.all.return_value = [
+        {"id": "rec123", "fields": {"Email": "john.doe@example.com", "Employee Status": "FTE"}}
+    ]
+
+    client = AirtableClient(mock_config, prefilter=prefilter)
+    client._table = mock_table
+
+    assert client.find_by_email("svc-deploy@example.com") is None
+    mock_table.all.assert_not_called()
+    assert client.find_by_email("John.Doe@example.com") is not None
+    mock_table.all.assert_called_once()
@@ -1,7 +1,14 @@
 """Tests for configuration loading."""
 
+import json
 from pathlib import Path
-from smog.config import AirtableConfig, load_config
+from unittest.mock import Mock
+
+import pytest
+import yaml
+
+from smog import config
+from smog.config import AirtableConfig, load_app_config, load_config, load_sources, load_yaml_file
 
 
 def test_load_config_from_secrets_yaml() -> None:
@@ -21,3 +28,100 @@ def test_load_config_with_custom_path() -> None:
 
     assert isinstance(config, AirtableConfig)
     assert config.api_key.startswith("pat")
+
+
+def test_load_sources_reads_multiple_bases(tmp_path: Path) -> None:
+    """Test that a sources list yields one config per base, inheriting the API key."""
+    secrets_path = tmp_path / "secrets.yaml"
+    secrets_path.write_text(
+        "airtable:\n"
+        "  api_key: patShared\n"
+        "  sources:\n"
+        "    - name: parent\n"
+        "      base_id: appParent\n"
+        "      table_name: Users\n"
+        "      domains: [example.com]\n"
+        "    - base_id: appSub\n"
+        "      table_name: Employees\n"
+        "      api_key: patSub\n"
+    )
+
+    sources = load_sources(secrets_path)
+
+    assert [source.base_id for source in sources] == ["appParent", "appSub"]
+    assert [source.api_key for source in sources] == ["patShared", "patSub"]
+    assert sources[0].domains == ["example.com"]
+    assert load_config(secrets_path).base_id == "appParent"
+
+
+def test_load_sources_with_single_base() -> None:
+    """Test that the classic single-base layout is one source."""
+    sources = load_sources(Path(__file__).parent.parent / "secrets.yaml")
+
+    assert len(sources) == 1
+    assert sources[0].table_name == "Users"
+
+
+def test_load_sources_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that SMOG_SECRETS replaces secrets.yaml without touching the file."""
+    secrets = {"airtable": {"api_key": "patEnv", "base_id": "appEnv", "table_name": "People"}}
+    monkeypatch.setenv("SMOG_SECRETS", json.dumps(secrets))
+    monkeypatch.setattr(config, "load_yaml_file", Mock(side_effect=AssertionError("file read")))
+
+    source = load_config()
+
+    assert (source.api_key, source.base_id, source.table_name) == ("patEnv", "appEnv", "People")
+
+
+def test_load_app_config_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that SMOG_CONFIG replaces config.yaml and missing keys keep their defaults."""
+    monkeypatch.setenv("SMOG_CONFIG", json.dumps({"default_email_domain": "example.com"}))
+
+    app_config = load_app_config()
+
+    assert app_config["default_email_domain"] == "example.com"
+    assert app_config["terminated_statuses"] == ["Terminated"]
+
+
+def test_load_yaml_file_reuses_parse_until_file_changes(
+    tmp_path: Path, isolated_cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that parses are cached across processes and invalidated by a change in size or mtime."""
+    path = tmp_path / "config.yaml"
+    path.write_text("default_email_domain: example.com\n")
+    parse = Mock(wraps=config._parse_yaml)
+    monkeypatch.setattr(config, "_parse_yaml", parse)
+
+    assert load_yaml_file(path) == {"default_email_domain": "example.com"}
+    config._parsed.clear()  # as in a new process: only the cache file remains
+    assert load_yaml_file(path) == {"default_email_domain": "example.com"}
+    assert parse.call_count == 1
+    (cache_file,) = isolated_cache_dir.iterdir()
+    assert cache_file.stat().st_mode & 0o077 == 0
+
+    path.write_text("default_email_domain: example.org\n")
+    assert load_yaml_file(path) == {"default_email_domain": "example.org"}
+    assert parse.call_count == 2
+
+
+def test_load_yaml_file_uses_libyaml_loader(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the C loader is used when PyYAML has it."""
+    path = tmp_path / "config.yaml"
+    path.write_text("strip_plus_tags: true\n")
+    load = Mock(wraps=yaml.load)
+    monkeypatch.setattr(yaml, "load", load)
+
+    assert load_yaml_file(path) == {"strip_plus_tags": True}
+    assert load.call_args.kwargs["Loader"] is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def test_secrets_are_never_written_to_the_cache(tmp_path: Path, isolated_cache_dir: Path) -> None:
+    """Test that secrets.yaml is only memoized in process, and stale cache files for it are removed."""
+    secrets_path = tmp_path / "secrets.yaml"
+    secrets_path.write_text("airtable:\n  api_key: patSecret\n  base_id: appBase\n  table_name: Users\n")
+    load_yaml_file(secrets_path)
+    assert list(isolated_cache_dir.iterdir())
+    config._parsed.clear()
+
+    assert load_config(secrets_path).api_key == "patSecret"
+    assert list(isolated_cache_dir.iterdir()) == []
@@ -0,0 +1,113 @@
+"""Tests for SQLite materialization."""
+
+import sqlite3
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from smog.database import FACET_COLUMNS, closure_rows, query, write_database
+from smog.models import EmployeeRecord
+
+
+@pytest.fixture
+def employees() -> List[EmployeeRecord]:
+    """Create a small org: a CEO, a director and two engineers."""
+    return [
+        EmployeeRecord(email="ceo@example.com", employment_status="FTE", division="Exec"),
+        EmployeeRecord(
+            email="Jane.Smith@example.com",
+            manager_email="ceo@example.com",
+            employment_status="FTE",
+            division="Engineering",
+        ),
+        EmployeeRecord(
+            email="john.doe@example.com",
+            manager_email="jane.smith@example.com",
+            employment_status="FTE",
+            division="Engineering",
+        ),
+        EmployeeRecord(
+            email="amy@example.com",
+            manager_email="JANE.SMITH@example.com",
+            employment_status="Contractor",
+            division="Engineering",
+        ),
+    ]
+
+
+def test_closure_lists_every_ancestor_with_depth(employees: List[EmployeeRecord]) -> None:
+    """Test that the closure has a self row and one row per manager up the chain."""
+    rows = sorted(closure_rows(employees))
+
+    assert ("john.doe@example.com", "john.doe@example.com", 0) in rows
+    assert ("john.doe@example.com", "Jane.Smith@example.com", 1) in rows
+    assert ("john.doe@example.com", "ceo@example.com", 2) in rows
+    assert len(rows) == 1 + 2 + 3 + 3
+
+
+def test_closure_stops_at_cycles_and_missing_managers() -> None:
+    """Test that bad Manager Email data cannot loop forever."""
+    records = [
+        EmployeeRecord(email="a@example.com", manager_email="b@example.com", employment_status="FTE"),
+        EmployeeRecord(email="b@example.com", manager_email="a@example.com", employment_status="FTE"),
+        EmployeeRecord(email="c@example.com", manager_email="gone@example.com", employment_status="FTE"),
+    ]
+
+    rows = list(closure_rows(records))
+
+    assert ("c@example.com", "c@example.com", 0) in rows
+    assert not any(ancestor == "gone@example.com" for _, ancestor, _ in rows)
+    assert len([row for row in rows if row[0] == "a@example.com"]) <= 2
+
+
+def test_database_answers_org_queries(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test span of control, headcount under a manager and facet counts."""
+    path = tmp_path / "employees.db"
+    assert write_database(employees, path) == 4
+
+    _, rows = query(
+        path,
+        "SELECT count(*) FROM closure WHERE ancestor = ? AND depth > 0",
+        ["CEO@example.com"],
+    )
+    assert list(rows) == [(3,)]
+
+    _, rows = query(path, "SELECT count(*) FROM employees WHERE manager_email = 'jane.smith@example.com'")
+    assert list(rows) == [(2,)]
+
+    columns, rows = query(
+        path, "SELECT division, count(*) AS headcount FROM employees GROUP BY division ORDER BY division"
+    )
+    assert columns == ["division", "headcount"]
+    assert list(rows) == [("Engineering", 3), ("Exec", 1)]
+
+
+def test_database_indexes_manager_and_facets(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that manager, facet and closure lookups have indexes."""
+    path = tmp_path / "employees.db"
+    write_database(employees, path)
+
+    _, rows = query(path, "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%'")
+    indexes = {name for (name,) in rows}
+
+    assert {"employees_manager_email", "closure_ancestor"} <= indexes
+    assert {f"employees_{column}" for column in FACET_COLUMNS} <= indexes
+
+
+def test_query_is_read_only(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that the passthrough cannot modify the database."""
+    path = tmp_path / "employees.db"
+    write_database(employees, path)
+
+    with pytest.raises(sqlite3.OperationalError):
+        query(path, "DELETE FROM employees")
+
+    _, rows = query(path, "SELECT count(*) FROM employees")
+    assert list(rows) == [(4,)]
+
+
+def test_query_reports_missing_database(tmp_path: Path) -> None:
+    """Test that querying a database that was never written fails clearly."""
+    with pytest.raises(FileNotFoundError):
+        query(tmp_path / "missing.db", "SELECT 1")
@@ -0,0 +1,172 @@
+"""Tests for deadlines and hedged calls."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+import pytest
+
+from smog.deadline import (
+    DaemonExecutor,
+    Deadline,
+    DeadlineExceeded,
+    HedgingPolicy,
+    LatencyTracker,
+    call_with_deadline,
+)
+from smog.directory import EmployeeDirectory
+from smog.models import EmployeeRecord
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    """Create an executor that is shut down after the test."""
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_deadline_counts_down_on_its_clock() -> None:
+    """Test that remaining time follows the clock and never goes negative."""
+    now = [100.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+
+    assert deadline.remaining() == 2.0
+    assert not deadline.expired
+    now[0] = 103.0
+    assert deadline.remaining() == 0.0
+    assert deadline.expired
+
+
+def test_latency_tracker_needs_enough_samples() -> None:
+    """Test that no percentile is reported until the window has min_samples."""
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(0.3)
+    tracker.record(0.1)
+    assert tracker.percentile(0.95) is None
+
+    tracker.record(0.2)
+    assert tracker.percentile(0.5) == 0.2
+    assert tracker.percentile(0.95) == 0.3
+
+
+def test_hedging_policy_respects_budget() -> None:
+    """Test that hedges are capped at the budgeted fraction of requests."""
+    policy = HedgingPolicy(budget=0.1)
+    for _ in range(10):
+        policy.hedge_delay()
+
+    assert policy.try_acquire()
+    assert not policy.try_acquire()
+
+
+def test_call_with_deadline_raises_when_call_is_too_slow(executor: ThreadPoolExecutor) -> None:
+    """Test that a call still running at the deadline raises DeadlineExceeded."""
+    release = threading.Event()
+
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(executor, lambda: release.wait(5), Deadline(0.05))
+    release.set()
+
+
+def test_abandoned_call_runs_on_daemon_thread() -> None:
+    """Test that a call abandoned at the deadline runs on a daemon thread, so it cannot block exit."""
+    release = threading.Event()
+    threads: List[threading.Thread] = []
+
+    def slow() -> bool:
+        threads.append(threading.current_thread())
+        return release.wait(5)
+
+    with pytest.raises(DeadlineExceeded):
+        call_with_deadline(DaemonExecutor(), slow, Deadline(0.05))
+    release.set()
+
+    assert threads[0].daemon
+
+
+def test_call_with_deadline_reraises_call_errors(executor: ThreadPoolExecutor) -> None:
+    """Test that the call's own error is raised unchanged."""
+
+    def fail() -> None:
+        raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        call_with_deadline(executor, fail, Deadline(1.0))
+
+
+def test_call_with_deadline_hedges_slow_call(executor: ThreadPoolExecutor) -> None:
+    """Test that a duplicate call is sent after the hedge delay and its result used."""
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record(0.01)
+    policy = HedgingPolicy(budget=1.0, tracker=tracker)
+    release = threading.Event()
+    calls: List[int] = []
+    lock = threading.Lock()
+
+    def lookup() -> str:
+        with lock:
+            calls.append(len(calls))
+            attempt = len(calls)
+        if attempt == 1:
+            release.wait(5)
+            return "primary"
+        return "hedge"
+
+    assert call_with_deadline(executor, lookup, Deadline(2.0), policy) == "hedge"
+    assert len(calls) == 2
+    release.set()
+
+
+def test_call_with_deadline_does_not_hedge_without_budget(executor: ThreadPoolExecutor) -> None:
+    """Test that no duplicate call is sent once the budget is spent."""
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record(0.01)
+    policy = HedgingPolicy(budget=0.0, tracker=tracker)
+    calls: List[int] = []
+    release = threading.Event()
+
+    def lookup() -> str:
+        calls.append(1)
+        release.wait(0.1)
+        return "primary"
+
+    assert call_with_deadline(executor, lookup, Deadline(2.0), policy) == "primary"
+    assert calls == [1]
+
+
+class _SlowManagerDirectory(EmployeeDirectory):
+    """Directory whose manager lookups block until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def find_by_email(self, email: str) -> Optional[EmployeeRecord]:
+        if email == "jane.smith@example.com":
+            self.release.wait(0.2)
+        return EmployeeRecord(
+            email=email,
+            manager_email=None if email == "ceo@example.com" else "jane.smith@example.com",
+            employment_status="FTE",
+        )
+
+
+def test_chain_walk_returns_partial_result_when_deadline_expires() -> None:
+    """Test that managers not reached in time are None and the result is marked partial."""
+    directory = _SlowManagerDirectory()
+
+    result = directory.get_employee_with_management_chain("john.doe@example.com", timeout=0.1)
+
+    assert result is not None
+    assert result.employee.email == "john.doe@example.com"
+    assert result.manager is not None
+    assert result.managers_manager is None
+    assert result.partial
+
+
+def test_chain_walk_raises_when_deadline_expired_before_employee() -> None:
+    """Test that an already-expired budget raises instead of returning None."""
+    directory = _SlowManagerDirectory()
+
+    with pytest.raises(DeadlineExceeded):
+        directory.get_employee_with_management_chain("john.doe@example.com", timeout=0)
@@ -0,0 +1,66 @@
+"""Tests for email normalization."""
+
+from smog.emails import EmailNormalizer, normalize_email, split_alternate_emails
+
+
+def test_normalize_email_appends_default_domain() -> None:
+    """Test that bare usernames get the default domain and full emails are kept."""
+    assert normalize_email("jdoe", "example.com") == "jdoe@example.com"
+    assert normalize_email("jdoe", "") == "jdoe"
+    assert normalize_email("jdoe@custom.com", "example.com") == "jdoe@custom.com"
+
+
+def test_domain_aliases_are_rewritten() -> None:
+    """Test that alias domains map to their canonical domain, case-insensitively."""
+    normalizer = EmailNormalizer("example.com", domain_aliases={"oldco.com": "example.com"})
+
+    assert normalizer("jdoe@OldCo.com") == "jdoe@example.com"
+    assert normalizer("jdoe@other.com") == "jdoe@other.com"
+
+
+def test_plus_tags_are_stripped_when_enabled() -> None:
+    """Test that plus-addressing is removed only when configured."""
+    assert EmailNormalizer(strip_plus_tags=True)("jdoe+github@example.com") == "jdoe@example.com"
+    assert EmailNormalizer()("jdoe+github@example.com") == "jdoe+github@example.com"
+
+
+def test_unique_deduplicates_normalized_batch() -> None:
+    """Test that a batch is canonicalized and de-duplicated before lookup."""
+    normalizer = EmailNormalizer(
+        "example.com", domain_aliases={"oldco.com": "example.com"}, strip_plus_tags=True
+    )
+
+    emails = normalizer.unique(["jdoe", "JDoe@oldco.com", " jdoe+x@example.com", "asmith"])
+
+    assert emails == ["jdoe@example.com", "asmith@example.com"]
+
+
+def test_from_app_config_reads_settings() -> None:
+    """Test that the pipeline is built from load_app_config output."""
+    normalizer = EmailNormalizer.from_app_config(
+        {"default_email_domain": "example.com", "domain_aliases": {"oldco.com": "example.com"}}
+    )
+
+    assert normalizer("jdoe@oldco.com") == "jdoe@example.com"
+
+
+def test_split_alternate_emails() -> None:
+    """Test that Alternate Emails text is split into addresses."""
+    assert split_alternate_emails("a@x.com, b@y.com\nc@z.com; not-an-email") == [
+        "a@x.com",
+        "b@y.com",
+        "c@z.com",
+    ]
+    assert split_alternate_emails(None) == []
+
+
+def test_candidates_try_address_as_typed_before_rewriting() -> None:
+    """Test that aliased or plus-tagged addresses are tried as typed, then normalized."""
+    normalizer = EmailNormalizer(
+        "example.com", domain_aliases={"oldco.com": "example.com"}, strip_plus_tags=True
+    )
+
+    assert normalizer.candidates(" vice@oldco.com ") == ["vice@oldco.com", "vice@example.com"]
+    assert normalizer.candidates("ops+oncall@example.com") == ["ops+oncall@example.com", "ops@example.com"]
+    assert normalizer.candidates("jdoe") == ["jdoe@example.com"]
+    assert normalizer.candidates("JDoe@example.com") == ["JDoe@example.com"]
@@ -0,0 +1,91 @@
+"""Tests for lookups across several Airtable bases."""
+
+from typing import Dict, Optional
+from unittest.mock import Mock
+
+from smog.federation import FederatedClient
+from smog.models import EmployeeRecord
+
+
+def make_source(records: Dict[str, EmployeeRecord]) -> Mock:
+    """Build a mock client answering find_by_email from a dict."""
+    client = Mock()
+
+    def find_by_email(email: str, timeout: Optional[float] = None) -> Optional[EmployeeRecord]:
+        return records.get(email.lower())
+
+    client.find_by_email.side_effect = find_by_email
+    client.all_employees.return_value = list(records.values())
+    return client
+
+
+def test_fan_out_returns_hit_from_any_source() -> None:
+    """Test that unrouted lookups query every source and return the hit."""
+    parent = make_source({})
+    subsidiary = make_source(
+        {"a@sub.example": EmployeeRecord(email="a@sub.example", employment_status="FTE")}
+    )
+    client = FederatedClient([parent, subsidiary])
+
+    result = client.find_by_email("a@sub.example")
+
+    assert result is not None
+    assert result.email == "a@sub.example"
+    parent.find_by_email.assert_called_once_with("a@sub.example", None)
+    assert client.find_by_email("nobody@example.com") is None
+    client.close()
+
+
+def test_routing_table_queries_only_owning_source() -> None:
+    """Test that a domain claimed by a source is only looked up there."""
+    parent = make_source(
+        {"ceo@example.com": EmployeeRecord(email="ceo@example.com", employment_status="FTE")}
+    )
+    subsidiary = make_source({})
+    client = FederatedClient([parent, subsidiary], [["example.com"], ["sub.example"]])
+
+    assert client.find_by_email("CEO@Example.com") is not None
+    subsidiary.find_by_email.assert_not_called()
+    client.close()
+
+
+def test_management_chain_crosses_bases() -> None:
+    """Test that a chain resolves when the manager lives in another base."""
+    parent = make_source(
+        {
+            "vp@example.com": EmployeeRecord(
+                email="vp@example.com", manager_email="ceo@example.com", employment_status="FTE"
+            ),
+            "ceo@example.com": EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+        }
+    )
+    subsidiary = make_source(
+        {
+            "a@sub.example": EmployeeRecord(
+                email="a@sub.example", manager_email="vp@example.com", employment_status="FTE"
+            )
+        }
+    )
+    client = FederatedClient([parent, subsidiary], [["example.com"], ["sub.example"]])
+
+    result = client.get_employee_with_management_chain("a@sub.example")
+
+    assert result is not None
+    assert result.manager is not None
+    assert result.manager.email == "vp@example.com"
+    assert result.managers_manager is not None
+    assert result.managers_manager.email == "ceo@example.com"
+    client.close()
+
+
+def test_all_employees_combines_sources() -> None:
+    """Test that the full table is the concatenation of every source."""
+    client = FederatedClient(
+        [
+            make_source({"a@example.com": EmployeeRecord(email="a@example.com", employment_status="FTE")}),
+            make_source({"b@sub.example": EmployeeRecord(email="b@sub.example", employment_status="FTE")}),
+        ]
+    )
+
+    assert [record.email for record in client.all_employees()] == ["a@example.com", "b@sub.example"]
+    client.close()
@@ -0,0 +1,130 @@
+"""Tests for point-in-time history."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from smog.history import History
+from smog.models import EmployeeRecord
+
+JAN = datetime(2026, 1, 1, tzinfo=timezone.utc)
+FEB = datetime(2026, 2, 1, tzinfo=timezone.utc)
+MAR = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def org(manager: str, with_new_hire: bool = False) -> List[EmployeeRecord]:
+    """Build a small org where a@example.com reports to the given manager."""
+    records = [
+        EmployeeRecord(email="m1@example.com", employment_status="FTE", record_id="recM1"),
+        EmployeeRecord(email="m2@example.com", employment_status="FTE", record_id="recM2"),
+        EmployeeRecord(
+            email="a@example.com",
+            manager_email=manager,
+            employment_status="FTE",
+            record_id="recA",
+        ),
+    ]
+    records.extend(
+        EmployeeRecord(email=f"e{i}@example.com", employment_status="FTE", record_id=f"rec{i}")
+        for i in range(10)
+    )
+    if with_new_hire:
+        records.append(
+            EmployeeRecord(email="new@example.com", employment_status="FTE", record_id="recNew")
+        )
+    return records
+
+
+def test_first_sync_writes_base_then_deltas(tmp_path: Path) -> None:
+    """Test that later syncs only store changed records."""
+    history = History(tmp_path)
+
+    assert history.record(org("m1@example.com"), JAN) == 13
+    assert history.record(org("m2@example.com", with_new_hire=True), FEB) == 2
+    assert history.record(org("m2@example.com", with_new_hire=True), MAR) == 0
+
+    assert history.times() == [JAN, FEB]
+    assert len(list(tmp_path.glob("base-*"))) == 1
+    assert len(list(tmp_path.glob("delta-*"))) == 1
+
+
+def test_as_of_reconstructs_past_manager(tmp_path: Path) -> None:
+    """Test that lookups as of a date see the org as it was then."""
+    history = History(tmp_path)
+    history.record(org("m1@example.com"), JAN)
+    history.record(org("m2@example.com", with_new_hire=True), FEB)
+
+    with history.as_of(datetime(2026, 1, 15, tzinfo=timezone.utc)) as view:
+        result = view.get_employee_with_management_chain("a@example.com")
+        assert result is not None
+        assert result.manager is not None
+        assert result.manager.email == "m1@example.com"
+        assert view.find_by_email("new@example.com") is None
+
+    with history.as_of(MAR) as view:
+        result = view.get_employee_with_management_chain("a@example.com")
+        assert result is not None
+        assert result.manager is not None
+        assert result.manager.email == "m2@example.com"
+        assert view.find_by_email("new@example.com") is not None
+        assert len(list(view.records())) == 14
+
+
+def test_deleted_and_renamed_records_disappear(tmp_path: Path) -> None:
+    """Test that deletions and email changes hide the old base entry."""
+    history = History(tmp_path)
+    history.record(org("m1@example.com"), JAN)
+    records = [record for record in org("m1@example.com") if record.email != "e0@example.com"]
+    records[0] = EmployeeRecord(
+        email="m1.renamed@example.com", employment_status="FTE", record_id="recM1"
+    )
+    history.record(records, FEB)
+
+    with history.as_of(FEB) as view:
+        assert view.find_by_email("e0@example.com") is None
+        assert view.find_by_email("m1@example.com") is None
+        assert view.find_by_email("m1.renamed@example.com") is not None
+
+
+def test_alternate_email_finds_record_changed_after_base(tmp_path: Path) -> None:
+    """Test that a lookup by alternate email sees a record changed after the base."""
+    history = History(tmp_path)
+    records = org("m1@example.com")
+    records[2] = records[2].model_copy(update={"alternate_emails": "alt0@old.com"})
+    history.record(records, JAN)
+    records[2] = records[2].model_copy(update={"title": "Staff Engineer"})
+    records[3] = records[3].model_copy(update={"alternate_emails": "new.alt@old.com"})
+    history.record(records, FEB)
+
+    with history.as_of(FEB) as view:
+        record = view.find_by_email("ALT0@old.com")
+        assert record is not None
+        assert record.email == "a@example.com"
+        assert record.title == "Staff Engineer"
+        new_alt = view.find_by_email("new.alt@old.com")
+        assert new_alt is not None and new_alt.email == "e0@example.com"
+
+    with history.as_of(JAN) as view:
+        assert view.find_by_email("new.alt@old.com") is None
+
+
+def test_large_change_writes_new_base(tmp_path: Path) -> None:
+    """Test that a sync changing most of the table starts a new base."""
+    history = History(tmp_path, rebase_ratio=0.5)
+    history.record(org("m1@example.com"), JAN)
+    changed = [record.model_copy(update={"title": "Changed"}) for record in org("m1@example.com")]
+
+    history.record(changed, FEB)
+
+    assert len(list(tmp_path.glob("base-*"))) == 2
+
+
+def test_as_of_before_first_sync_fails(tmp_path: Path) -> None:
+    """Test that asking for a time before any sync is an error."""
+    history = History(tmp_path)
+    history.record(org("m1@example.com"), FEB)
+
+    with pytest.raises(LookupError):
+        history.as_of(JAN)
@@ -0,0 +1,115 @@
+"""Tests for the in-memory employee index."""
+
+from smog.index import EmployeeIndex, record_hash
+from smog.models import EmployeeRecord
+
+
+def test_index_finds_records_case_insensitively() -> None:
+    """Test that lookups ignore email case."""
+    index = EmployeeIndex(
+        [EmployeeRecord(email="John.Doe@example.com", employment_status="FTE", record_id="rec1")]
+    )
+
+    assert len(index) == 1
+    assert "john.doe@EXAMPLE.com" in index
+    result = index.find_by_email("JOHN.DOE@example.com")
+    assert result is not None
+    assert result.record_id == "rec1"
+    assert index.find_by_record_id("rec1") == result
+
+
+def test_upsert_replaces_record_whose_email_changed() -> None:
+    """Test that re-keying a record by ID drops its old email."""
+    index = EmployeeIndex(
+        [EmployeeRecord(email="old@example.com", employment_status="FTE", record_id="rec1")]
+    )
+
+    previous = index.upsert(
+        EmployeeRecord(email="new@example.com", employment_status="FTE", record_id="rec1")
+    )
+
+    assert previous is not None
+    assert previous.email == "old@example.com"
+    assert "old@example.com" not in index
+    assert "new@example.com" in index
+    assert len(index) == 1
+
+
+def test_content_hash_ignores_record_id() -> None:
+    """Test that the content hash tracks employee data, not the Airtable ID."""
+    first = EmployeeRecord(email="a@example.com", employment_status="FTE", record_id="rec1")
+    same = EmployeeRecord(email="a@example.com", employment_status="FTE", record_id="rec2")
+    changed = EmployeeRecord(email="a@example.com", employment_status="Contractor", record_id="rec1")
+
+    assert record_hash(first) == record_hash(same)
+    assert record_hash(first) != record_hash(changed)
+
+
+def test_remove_drops_record() -> None:
+    """Test that removed records are no longer found."""
+    index = EmployeeIndex([EmployeeRecord(email="a@example.com", employment_status="FTE", record_id="rec1")])
+
+    removed = index.remove("A@example.com")
+
+    assert removed is not None
+    assert len(index) == 0
+    assert index.find_by_record_id("rec1") is None
+    assert index.content_hash("a@example.com") is None
+
+
+def test_direct_reports_follow_manager_changes() -> None:
+    """Test that the reverse manager index is updated incrementally."""
+    index = EmployeeIndex(
+        [
+            EmployeeRecord(
+                email="a@example.com",
+                manager_email="M1@example.com",
+                employment_status="FTE",
+                record_id="rec1",
+            ),
+            EmployeeRecord(
+                email="b@example.com",
+                manager_email="m1@example.com",
+                employment_status="FTE",
+                record_id="rec2",
+            ),
+        ]
+    )
+
+    reports = index.direct_reports("m1@example.com")
+    assert [record.email for record in reports] == ["a@example.com", "b@example.com"]
+
+    index.upsert(
+        EmployeeRecord(
+            email="a@example.com",
+            manager_email="m2@example.com",
+            employment_status="FTE",
+            record_id="rec1",
+        )
+    )
+
+    assert [record.email for record in index.direct_reports("m1@example.com")] == ["b@example.com"]
+    assert [record.email for record in index.direct_reports("M2@example.com")] == ["a@example.com"]
+
+
+def test_alternate_emails_resolve_to_primary_record() -> None:
+    """Test that alternate emails are indexed as aliases of the primary record."""
+    index = EmployeeIndex(
+        [
+            EmployeeRecord(
+                email="jdoe@example.com",
+                employment_status="FTE",
+                alternate_emails="john@example.com, jdoe@oldco.com",
+                record_id="rec1",
+            ),
+            EmployeeRecord(email="john@other.com", employment_status="FTE", record_id="rec2"),
+        ]
+    )
+
+    result = index.find_by_email("JDOE@oldco.com")
+    assert result is not None
+    assert result.email == "jdoe@example.com"
+    assert "john@example.com" in index
+
+    index.remove("jdoe@example.com")
+    assert index.find_by_email("jdoe@oldco.com") is None
@@ -0,0 +1,108 @@
+"""Tests for org chart export."""
+
+import io
+import json
+import time
+from typing import List, Optional, Tuple
+
+import pytest
+
+from smog.index import EmployeeIndex
+from smog.models import EmployeeRecord
+from smog.orgchart import subtree_sizes, walk_org, write_dot, write_json
+
+
+def _employee(email: str, manager_email: Optional[str], **fields: str) -> EmployeeRecord:
+    return EmployeeRecord(email=email, manager_email=manager_email, employment_status="FTE", **fields)
+
+
+@pytest.fixture
+def index() -> EmployeeIndex:
+    """Create an org: CEO -> (CTO -> two engineers, CFO)."""
+    return EmployeeIndex(
+        [
+            _employee("ceo@example.com", None, name="Ceo", title="CEO"),
+            _employee("cto@example.com", "ceo@example.com"),
+            _employee("cfo@example.com", "ceo@example.com"),
+            _employee("eng1@example.com", "cto@example.com"),
+            _employee("eng2@example.com", "cto@example.com"),
+        ]
+    )
+
+
+def _entered(index: EmployeeIndex, **options: int) -> List[Tuple[str, int]]:
+    """Walk from the CEO and return (email, hidden report count) per node, in visit order."""
+    events = walk_org(index, "ceo@example.com", **options)
+    return [(node.record.email, node.collapsed) for kind, node in events if kind == "enter"]
+
+
+def test_walk_is_depth_first_in_email_order(index: EmployeeIndex) -> None:
+    """Test that the walk visits everyone under the root once, depth first."""
+    assert [email for email, _ in _entered(index)] == [
+        "ceo@example.com",
+        "cfo@example.com",
+        "cto@example.com",
+        "eng1@example.com",
+        "eng2@example.com",
+    ]
+
+
+def test_depth_limit_and_collapse_report_hidden_counts(index: EmployeeIndex) -> None:
+    """Test that cut-off and collapsed nodes carry their hidden report count."""
+    expected = [("ceo@example.com", 0), ("cfo@example.com", 0), ("cto@example.com", 2)]
+
+    assert _entered(index, max_depth=1) == expected
+    assert _entered(index, collapse_above=1) == expected
+
+
+def test_subtree_sizes(index: EmployeeIndex) -> None:
+    """Test that report counts include indirect reports."""
+    sizes = subtree_sizes(index, "CEO@example.com")
+
+    assert sizes["ceo@example.com"] == 4
+    assert sizes["cto@example.com"] == 2
+    assert sizes["eng1@example.com"] == 0
+
+
+def test_json_output_is_nested_tree(index: EmployeeIndex) -> None:
+    """Test that the streamed JSON parses as the nested org."""
+    out = io.StringIO()
+    count = write_json(walk_org(index, "ceo@example.com", collapse_above=1), out)
+
+    tree = json.loads(out.getvalue())
+    assert count == 3
+    assert tree["name"] == "Ceo"
+    assert [child["email"] for child in tree["children"]] == ["cfo@example.com", "cto@example.com"]
+    assert tree["children"][1]["hidden_reports"] == 2
+    assert tree["children"][1]["children"] == []
+
+
+def test_dot_output_has_nodes_and_edges(index: EmployeeIndex) -> None:
+    """Test that DOT output declares every node and manager edge."""
+    out = io.StringIO()
+    write_dot(walk_org(index, "cto@example.com"), out)
+
+    dot = out.getvalue()
+    assert dot.startswith("digraph orgchart {")
+    assert '"cto@example.com" -> "eng1@example.com";' in dot
+    assert "ceo@example.com" not in dot
+
+
+def test_walk_handles_deep_and_wide_orgs_quickly() -> None:
+    """Test that a 50k-employee org, 10k levels deep in part, is walked without recursion."""
+    records = [_employee("e0@example.com", None)]
+    records += [_employee(f"e{i}@example.com", f"e{i - 1}@example.com") for i in range(1, 10000)]
+    records += [_employee(f"w{i}@example.com", "e0@example.com") for i in range(40000)]
+    index = EmployeeIndex(records)
+
+    started = time.perf_counter()
+    count = write_dot(walk_org(index, "e0@example.com"), io.StringIO())
+
+    assert count == 50000
+    assert time.perf_counter() - started < 10
+
+
+def test_unknown_root_raises(index: EmployeeIndex) -> None:
+    """Test that a root missing from the index is reported."""
+    with pytest.raises(LookupError):
+        list(walk_org(index, "nobody@example.com"))
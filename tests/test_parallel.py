@@ -0,0 +1,72 @@
+"""Tests for shared-memory snapshots and process-parallel maps."""
+
+from operator import attrgetter
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from smog.models import EmployeeRecord
+from smog.parallel import SharedSnapshot, map_employees, worker_snapshot
+from smog.snapshot import write_snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: Path) -> Path:
+    """Write a snapshot of a 100-person org where everyone reports to e0."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(
+        [EmployeeRecord(email="e0@example.com", employment_status="FTE")]
+        + [
+            EmployeeRecord(email=f"e{i}@example.com", manager_email="e0@example.com", employment_status="FTE")
+            for i in range(1, 100)
+        ],
+        path,
+    )
+    return path
+
+
+def manager_of(record: EmployeeRecord) -> Optional[str]:
+    """Resolve a record's manager through the worker's attached snapshot."""
+    result = worker_snapshot().get_employee_with_management_chain(record.email)
+    return result.manager.email if result is not None and result.manager is not None else None
+
+
+def test_map_employees_returns_results_in_snapshot_order(snapshot_path: Path) -> None:
+    """Test that every employee is mapped once, in order, across workers and chunks."""
+    emails: List[str] = map_employees(attrgetter("email"), snapshot_path, workers=3, chunk_size=7)
+
+    assert emails == [f"e{i}@example.com" for i in range(100)]
+
+
+def test_workers_can_look_up_other_employees(snapshot_path: Path) -> None:
+    """Test that mapped functions can use the worker's shared snapshot for lookups."""
+    with SharedSnapshot.publish(snapshot_path) as shared:
+        first = map_employees(manager_of, shared, workers=2)
+        second = map_employees(manager_of, shared, workers=2)
+
+    assert first[0] is None
+    assert first[1:] == ["e0@example.com"] * 99
+    assert second == first
+
+
+def test_shared_snapshot_reads_without_workers(snapshot_path: Path) -> None:
+    """Test that the published copy is a readable snapshot in the publishing process."""
+    with SharedSnapshot(snapshot_path.read_bytes()) as shared:
+        assert len(shared) == 100
+        record = shared.snapshot.find_by_email("E5@example.com")
+
+    assert record is not None
+    assert record.manager_email == "e0@example.com"
+
+
+def test_shared_snapshot_rejects_other_data() -> None:
+    """Test that non-snapshot bytes are rejected and the block is not leaked."""
+    with pytest.raises(ValueError):
+        SharedSnapshot(b"x" * 128)
+
+
+def test_worker_snapshot_outside_worker_raises() -> None:
+    """Test that worker_snapshot is only usable inside map_employees."""
+    with pytest.raises(RuntimeError):
+        worker_snapshot()
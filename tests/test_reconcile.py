@@ -0,0 +1,117 @@
+"""Tests for bulk account reconciliation."""
+
+import csv
+import io
+from typing import Dict, List, Optional
+
+from smog.directory import EmployeeDirectory
+from smog.emails import EmailNormalizer
+from smog.index import EmployeeIndex
+from smog.models import EmployeeRecord
+from smog.reconcile import reconcile
+
+
+def make_index(manager: str) -> EmployeeIndex:
+    """Build an index where a@example.com reports to the given manager."""
+    return EmployeeIndex(
+        [
+            EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(email="m1@example.com", manager_email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(email="m2@example.com", manager_email="ceo@example.com", employment_status="FTE"),
+            EmployeeRecord(email="a@example.com", manager_email=manager, employment_status="FTE"),
+            EmployeeRecord(
+                email="gone@example.com",
+                manager_email="m1@example.com",
+                employment_status="Terminated",
+            ),
+        ]
+    )
+
+
+def run(rows: List[Dict[str, str]], baseline: Optional[EmployeeDirectory] = None) -> List[Dict[str, str]]:
+    """Reconcile rows against the default index."""
+    return list(
+        reconcile(
+            rows,
+            make_index("m1@example.com"),
+            "owner",
+            lambda email: email if "@" in email else f"{email}@example.com",
+            ("Terminated",),
+            baseline=baseline,
+        )
+    )
+
+
+def test_reconcile_flags_status_and_chain() -> None:
+    """Test that rows get status and management chain columns."""
+    rows = run(
+        [
+            {"account": "1", "owner": "A@example.com"},
+            {"account": "2", "owner": "gone"},
+            {"account": "3", "owner": "svc-backup@example.com"},
+        ]
+    )
+
+    assert [row["smog_status"] for row in rows] == ["active", "terminated", "unknown"]
+    assert rows[0]["account"] == "1"
+    assert rows[0]["smog_manager"] == "m1@example.com"
+    assert rows[0]["smog_managers_manager"] == "ceo@example.com"
+    assert rows[1]["smog_email"] == "gone@example.com"
+    assert rows[2]["smog_employment_status"] == ""
+    assert "smog_chain_changed" not in rows[0]
+
+
+def test_reconcile_compares_chain_against_baseline() -> None:
+    """Test that a baseline adds a chain-changed flag."""
+    rows = run(
+        [{"owner": "a@example.com"}, {"owner": "m1@example.com"}, {"owner": "nobody@example.com"}],
+        baseline=make_index("m2@example.com"),
+    )
+
+    assert [row["smog_chain_changed"] for row in rows] == ["yes", "no", "no"]
+
+
+def test_alternate_email_at_aliased_domain_is_matched() -> None:
+    """Test that an alternate email is found even when its domain is configured as an alias."""
+    index = EmployeeIndex(
+        [EmployeeRecord(email="vp@x.com", alternate_emails="vice@old.com", employment_status="FTE")]
+    )
+
+    rows = list(
+        reconcile(
+            [{"owner": "vice@old.com"}, {"owner": "other@old.com"}],
+            index,
+            "owner",
+            EmailNormalizer(domain_aliases={"old.com": "x.com"}),
+            ("Terminated",),
+        )
+    )
+
+    assert rows[0]["smog_status"] == "active"
+    assert rows[0]["smog_email"] == "vice@old.com"
+    assert rows[1]["smog_status"] == "unknown"
+    assert rows[1]["smog_email"] == "other@x.com"
+
+
+def test_short_csv_row_is_unknown() -> None:
+    """Test that a CSV row missing the email column is reported as unknown rather than failing."""
+    reader = csv.DictReader(io.StringIO("id,owner\n1,a@example.com\n2\n"))
+
+    rows = run(list(reader))
+
+    assert [row["smog_status"] for row in rows] == ["active", "unknown"]
+    assert rows[1]["id"] == "2"
+    assert rows[1]["smog_email"] == ""
+
+
+def test_long_csv_row_drops_extra_fields() -> None:
+    """Test that fields beyond the header are dropped so the rows can be written back out."""
+    reader = csv.DictReader(io.StringIO("id,owner\n1,a@example.com\n2,gone,extra\n"))
+
+    rows = run(list(reader))
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+    writer.writerows(rows)
+
+    assert [row["smog_status"] for row in rows] == ["active", "terminated"]
+    assert "extra" not in output.getvalue()
@@ -0,0 +1,137 @@
+"""Tests for the interactive lookup shell."""
+
+import io
+import time
+from typing import List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from smog.models import EmployeeLookupResult, EmployeeRecord
+from smog.shell import PrefixIndex, Shell
+
+
+@pytest.fixture
+def employees() -> List[EmployeeRecord]:
+    """Create a small three-level org."""
+    return [
+        EmployeeRecord(
+            email="john.doe@example.com",
+            manager_email="jane.smith@example.com",
+            employment_status="FTE",
+            name="John Doe",
+            title="Software Engineer",
+        ),
+        EmployeeRecord(
+            email="jane.smith@example.com",
+            manager_email="ceo@example.com",
+            employment_status="FTE",
+            name="Jane Smith",
+        ),
+        EmployeeRecord(email="ceo@example.com", manager_email=None, employment_status="FTE"),
+    ]
+
+
+def _shell(
+    employees: List[EmployeeRecord],
+    client: Mock,
+) -> Tuple[Shell, io.StringIO, List[EmployeeLookupResult]]:
+    """Create a shell over the given records, capturing output and shown results."""
+    out = io.StringIO()
+    shown: List[EmployeeLookupResult] = []
+    shell = Shell(client, lambda: employees, lambda email: email, shown.append, stdout=out)
+    return shell, out, shown
+
+
+def test_prefix_index_matches_case_insensitively_in_order() -> None:
+    """Test that prefix matches are case-insensitive, sorted and limited."""
+    index = PrefixIndex([("Jane Smith", "jane@x"), ("jane@x", "jane@x"), ("john@x", "john@x")])
+
+    assert index.matches("JA") == [("Jane Smith", "jane@x"), ("jane@x", "jane@x")]
+    assert index.matches("j", limit=1) == [("Jane Smith", "jane@x")]
+    assert index.matches("z") == []
+
+
+def test_prefix_index_is_fast_on_large_tables() -> None:
+    """Test that completion on a 50k-entry table does not scan the whole table."""
+    index = PrefixIndex((f"user{i:05d}@example.com", f"user{i:05d}@example.com") for i in range(50000))
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        matches = index.matches("user4999")
+    elapsed = time.perf_counter() - started
+
+    assert [key for key, _ in matches][:2] == ["user49990@example.com", "user49991@example.com"]
+    assert len(matches) == 10
+    assert elapsed < 1.0
+
+
+def test_shell_lookup_uses_client(employees: List[EmployeeRecord]) -> None:
+    """Test that lookup resolves a full name and goes to the live client."""
+    client = Mock()
+    result = EmployeeLookupResult(employee=employees[1], manager=employees[2], managers_manager=None)
+    client.get_employee_with_management_chain.return_value = result
+    shell, _, shown = _shell(employees, client)
+
+    shell.onecmd("lookup jane smith")
+
+    client.get_employee_with_management_chain.assert_called_once_with("jane.smith@example.com")
+    assert shown == [result]
+
+
+def test_shell_lookup_reports_missing_employee(employees: List[EmployeeRecord]) -> None:
+    """Test that a lookup miss is reported without leaving the shell."""
+    client = Mock()
+    client.get_employee_with_management_chain.return_value = None
+    shell, out, shown = _shell(employees, client)
+
+    assert not shell.onecmd("lookup nobody@example.com")
+
+    assert "Employee not found: nobody@example.com" in out.getvalue()
+    assert shown == []
+
+
+def test_shell_chain_reports_and_search_use_local_index(employees: List[EmployeeRecord]) -> None:
+    """Test that chain, reports and search are answered without the client."""
+    client = Mock()
+    shell, out, _ = _shell(employees, client)
+
+    shell.onecmd("chain john.doe@example.com")
+    shell.onecmd("reports Jane Smith")
+    shell.onecmd("search j")
+
+    lines = out.getvalue().splitlines()
+    assert lines[:3] == [
+        "john.doe@example.com (John Doe), Software Engineer [FTE]",
+        "  jane.smith@example.com (Jane Smith) [FTE]",
+        "    ceo@example.com [FTE]",
+    ]
+    assert lines[3] == "john.doe@example.com (John Doe), Software Engineer [FTE]"
+    assert lines[4:] == [
+        "jane.smith@example.com (Jane Smith) [FTE]",
+        "john.doe@example.com (John Doe), Software Engineer [FTE]",
+    ]
+    client.get_employee_with_management_chain.assert_not_called()
+
+
+def test_shell_completes_emails_and_names(employees: List[EmployeeRecord]) -> None:
+    """Test that completion returns the rest of the matching emails and names."""
+    shell, _, _ = _shell(employees, Mock())
+
+    assert shell.complete_lookup("jo", "lookup jo", 7, 9) == ["John Doe", "john.doe@example.com"]
+    # Readline passes only the current word; the name is matched as a whole.
+    assert shell.complete_chain("Sm", "chain Jane Sm", 11, 13) == ["Smith"]
+
+
+def test_shell_refresh_reloads_index(employees: List[EmployeeRecord]) -> None:
+    """Test that refresh picks up new records."""
+    records = list(employees)
+    out = io.StringIO()
+    shell = Shell(Mock(), lambda: records, lambda email: email, Mock(), stdout=out)
+    records.append(EmployeeRecord(email="new@example.com", employment_status="FTE"))
+
+    shell.onecmd("refresh")
+
+    assert "Indexed 4 employees" in out.getvalue()
+    assert shell.index.find_by_email("new@example.com") is not None
+    assert shell.onecmd("quit")
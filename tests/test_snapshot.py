@@ -0,0 +1,135 @@
+"""Tests for memory-mapped snapshot files."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from smog.models import EmployeeRecord
+from smog.snapshot import Snapshot, write_snapshot
+
+
+@pytest.fixture
+def employees() -> List[EmployeeRecord]:
+    """Create a small three-level org."""
+    return [
+        EmployeeRecord(
+            email="John.Doe@example.com",
+            manager_email="jane.smith@example.com",
+            employment_status="FTE",
+            name="John Doe",
+            title="Software Engineer",
+        ),
+        EmployeeRecord(
+            email="jane.smith@example.com",
+            manager_email="ceo@example.com",
+            employment_status="FTE",
+            title="Director",
+        ),
+        EmployeeRecord(
+            email="ceo@example.com",
+            manager_email=None,
+            employment_status="FTE",
+        ),
+    ]
+
+
+def test_snapshot_round_trips_records(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that records written to a snapshot are read back unchanged."""
+    path = tmp_path / "employees.snap"
+    count = write_snapshot(employees, path)
+
+    assert count == 3
+    with Snapshot.open(path) as snapshot:
+        assert len(snapshot) == 3
+        assert list(snapshot.records()) == employees
+
+
+def test_snapshot_lookup_is_case_insensitive(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that find_by_email matches regardless of case."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(employees, path)
+
+    with Snapshot.open(path) as snapshot:
+        result = snapshot.find_by_email("john.doe@EXAMPLE.com")
+        assert result is not None
+        assert result.email == "John.Doe@example.com"
+        assert result.name == "John Doe"
+        assert result.department is None
+        assert "JANE.SMITH@example.com" in snapshot
+        assert snapshot.find_by_email("nobody@example.com") is None
+        assert "nobody@example.com" not in snapshot
+
+
+def test_snapshot_resolves_management_chain(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that the shared chain walk works against a snapshot."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(employees, path)
+
+    with Snapshot.open(path) as snapshot:
+        result = snapshot.get_employee_with_management_chain("john.doe@example.com")
+
+    assert result is not None
+    assert result.manager is not None
+    assert result.manager.email == "jane.smith@example.com"
+    assert result.managers_manager is not None
+    assert result.managers_manager.email == "ceo@example.com"
+
+
+def test_snapshot_reads_from_in_memory_bytes(tmp_path: Path, employees: List[EmployeeRecord]) -> None:
+    """Test that a snapshot can be read from any buffer, not only a mapped file."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(employees, path)
+
+    snapshot = Snapshot(path.read_bytes())
+
+    assert list(snapshot.emails()) == [
+        "john.doe@example.com",
+        "jane.smith@example.com",
+        "ceo@example.com",
+    ]
+
+
+def test_empty_snapshot_has_no_records(tmp_path: Path) -> None:
+    """Test that an empty table produces a valid, empty snapshot."""
+    path = tmp_path / "empty.snap"
+    write_snapshot([], path)
+
+    with Snapshot.open(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.find_by_email("ceo@example.com") is None
+
+
+def test_snapshot_rejects_other_files(tmp_path: Path) -> None:
+    """Test that non-snapshot files are rejected."""
+    path = tmp_path / "bogus.snap"
+    path.write_bytes(b"x" * 128)
+
+    with pytest.raises(ValueError):
+        Snapshot.open(path)
+
+
+def test_snapshot_resolves_alternate_emails(tmp_path: Path) -> None:
+    """Test that alternate emails resolve in one probe, but never shadow a primary email."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(
+        [
+            EmployeeRecord(
+                email="jdoe@example.com",
+                employment_status="FTE",
+                alternate_emails="john@example.com, taken@example.com",
+            ),
+            EmployeeRecord(email="taken@example.com", employment_status="Contractor"),
+        ],
+        path,
+    )
+
+    with Snapshot.open(path) as snapshot:
+        alias = snapshot.find_by_email("John@example.com")
+        primary = snapshot.find_by_email("taken@example.com")
+        assert len(snapshot) == 2
+
+    assert alias is not None
+    assert alias.email == "jdoe@example.com"
+    assert primary is not None
+    assert primary.employment_status == "Contractor"
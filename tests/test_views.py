@@ -0,0 +1,94 @@
+"""Tests for org-wide views."""
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from smog.models import EmployeeRecord
+from smog.snapshot import write_snapshot
+from smog.views import OrgViews
+
+
+@pytest.fixture
+def employees() -> List[EmployeeRecord]:
+    """Create an org: a CEO, a director with two engineers, and a VP with none."""
+    return [
+        EmployeeRecord(email="john@example.com", manager_email="jane@example.com", employment_status="FTE"),
+        EmployeeRecord(email="amy@example.com", manager_email="JANE@example.com", employment_status="FTE"),
+        EmployeeRecord(email="jane@example.com", manager_email="ceo@example.com", employment_status="FTE"),
+        EmployeeRecord(email="vp@example.com", manager_email="ceo@example.com", employment_status="FTE"),
+        EmployeeRecord(email="ceo@example.com", employment_status="FTE"),
+    ]
+
+
+def test_span_counts_direct_and_total_reports(employees: List[EmployeeRecord]) -> None:
+    """Test that span covers managers only, top first, with report counts and depth."""
+    views = OrgViews.build(employees)
+
+    assert list(views.span()) == [
+        {"manager": "ceo@example.com", "direct_reports": 2, "total_reports": 4, "depth": 0},
+        {"manager": "jane@example.com", "direct_reports": 2, "total_reports": 2, "depth": 1},
+    ]
+
+
+def test_depth_and_chains(employees: List[EmployeeRecord]) -> None:
+    """Test that every employee gets a depth and their chain up to the top."""
+    views = OrgViews.build(employees)
+
+    depths = {row["email"]: (row["manager"], row["depth"]) for row in views.depth()}
+    chains = {row["email"]: row["chain"] for row in views.chains()}
+
+    assert depths["ceo@example.com"] == (None, 0)
+    assert depths["amy@example.com"] == ("jane@example.com", 2)
+    assert chains["john@example.com"] == ["jane@example.com", "ceo@example.com"]
+    assert chains["ceo@example.com"] == []
+    assert views.max_depth == 2
+    assert len(views) == 5
+
+
+def test_cycles_and_missing_managers_are_tops() -> None:
+    """Test that bad Manager Email data still yields every employee exactly once."""
+    views = OrgViews.build(
+        [
+            EmployeeRecord(email="a@example.com", manager_email="b@example.com", employment_status="FTE"),
+            EmployeeRecord(email="b@example.com", manager_email="a@example.com", employment_status="FTE"),
+            EmployeeRecord(email="c@example.com", manager_email="gone@example.com", employment_status="FTE"),
+        ]
+    )
+
+    depths = {row["email"]: row["depth"] for row in views.depth()}
+
+    assert depths == {"c@example.com": 0, "a@example.com": 0, "b@example.com": 1}
+
+
+def test_snapshot_views_are_cached_until_snapshot_changes(
+    tmp_path: Path,
+    employees: List[EmployeeRecord],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that views are reused for an unchanged snapshot and rebuilt after a rewrite."""
+    path = tmp_path / "employees.snap"
+    write_snapshot(employees, path)
+    first = OrgViews.for_snapshot(path)
+    assert (tmp_path / "employees.snap.views").exists()
+
+    builds: List[int] = []
+    original_build = OrgViews.build.__func__  # type: ignore[attr-defined]
+
+    def counting_build(cls: type, records: List[EmployeeRecord]) -> OrgViews:
+        builds.append(1)
+        return original_build(cls, records)  # type: ignore[no-any-return]
+
+    monkeypatch.setattr(OrgViews, "build", classmethod(counting_build))
+
+    assert OrgViews.for_snapshot(path) is first
+    assert builds == []
+
+    write_snapshot(employees[:3], path)
+    os.utime(path, ns=(0, 1))
+    rebuilt = OrgViews.for_snapshot(path)
+
+    assert builds == [1]
+    assert len(rebuilt) == 3
@@ -0,0 +1,90 @@
+"""Tests for change-feed polling."""
+
+from datetime import datetime, timezone
+from typing import List
+from unittest.mock import Mock
+
+from smog.index import EmployeeIndex
+from smog.models import EmployeeRecord
+from smog.watch import WATERMARK_OVERLAP, ChangeFeed, diff_records
+
+TERMINATED = ("Terminated",)
+
+
+def make_feed(index: EmployeeIndex, changed: List[EmployeeRecord]) -> ChangeFeed:
+    """Build a feed whose client returns the given modified rows."""
+    client = Mock()
+    client.modified_since.return_value = changed
+    return ChangeFeed(
+        client,
+        index,
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        TERMINATED,
+        clock=lambda: datetime(2026, 1, 2, tzinfo=timezone.utc),
+    )
+
+
+def test_diff_records_classifies_changes() -> None:
+    """Test that status, manager and title changes produce typed events."""
+    before = EmployeeRecord(
+        email="a@example.com",
+        employment_status="FTE",
+        manager_email="m1@example.com",
+        title="Engineer",
+    )
+    after = EmployeeRecord(
+        email="a@example.com",
+        employment_status="Terminated",
+        manager_email="m2@example.com",
+        title="Senior Engineer",
+    )
+
+    events = diff_records(before, after, TERMINATED)
+
+    assert [event.type for event in events] == ["termination", "manager_change", "title_change"]
+    assert events[1].previous == "m1@example.com"
+    assert events[1].current == "m2@example.com"
+
+
+def test_diff_records_reports_new_employee_as_hire() -> None:
+    """Test that a record with no previous version is a hire."""
+    events = diff_records(None, EmployeeRecord(email="a@example.com", employment_status="FTE"), TERMINATED)
+
+    assert [event.type for event in events] == ["hire"]
+
+
+def test_poll_emits_events_and_updates_index() -> None:
+    """Test that poll diffs modified rows against the index and advances the watermark."""
+    index = EmployeeIndex(
+        [EmployeeRecord(email="a@example.com", employment_status="FTE", record_id="rec1")]
+    )
+    feed = make_feed(
+        index,
+        [
+            EmployeeRecord(email="a@example.com", employment_status="Terminated", record_id="rec1"),
+            EmployeeRecord(email="b@example.com", employment_status="FTE", record_id="rec2"),
+        ],
+    )
+
+    events = feed.poll()
+
+    assert [(event.type, event.email) for event in events] == [
+        ("termination", "a@example.com"),
+        ("hire", "b@example.com"),
+    ]
+    record = index.find_by_email("a@example.com")
+    assert record is not None
+    assert record.employment_status == "Terminated"
+    assert "b@example.com" in index
+    assert feed.watermark == datetime(2026, 1, 2, tzinfo=timezone.utc)
+    feed._client.modified_since.assert_called_once_with(  # type: ignore[attr-defined]
+        datetime(2026, 1, 1, tzinfo=timezone.utc) - WATERMARK_OVERLAP
+    )
+
+
+def test_poll_skips_rows_with_unchanged_content() -> None:
+    """Test that rows re-fetched without content changes produce no events."""
+    record = EmployeeRecord(email="a@example.com", employment_status="FTE", record_id="rec1")
+    feed = make_feed(EmployeeIndex([record]), [record.model_copy()])
+
+    assert feed.poll() == []
@@ -0,0 +1,185 @@
+"""Tests for webhook-driven index updates."""
+
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterator, List
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from smog.index import EmployeeIndex
+from smog.models import EmployeeRecord
+from smog.webhook import WebhookServer, WebhookSync, payload_record_changes, post_payloads
+
+SECRET = base64.b64encode(b"webhook-secret").decode("ascii")
+
+
+def make_payload(changed: List[str] = [], destroyed: List[str] = []) -> Dict[str, Any]:
+    """Build a webhook payload touching the given record IDs."""
+    return {
+        "changedTablesById": {
+            "tblUsers": {
+                "changedRecordsById": {record_id: {"current": {}} for record_id in changed},
+                "destroyedRecordIds": destroyed,
+            }
+        }
+    }
+
+
+@pytest.fixture
+def index() -> EmployeeIndex:
+    """Index with a manager and one report."""
+    return EmployeeIndex(
+        [
+            EmployeeRecord(email="m1@example.com", employment_status="FTE", record_id="recM1"),
+            EmployeeRecord(email="m2@example.com", employment_status="FTE", record_id="recM2"),
+            EmployeeRecord(
+                email="a@example.com",
+                manager_email="m1@example.com",
+                employment_status="FTE",
+                record_id="recA",
+            ),
+        ]
+    )
+
+
+@pytest.fixture
+def server(index: EmployeeIndex) -> Iterator[WebhookServer]:
+    """Run a webhook server on a free port."""
+    client = Mock()
+    client.find_by_record_ids.return_value = [
+        EmployeeRecord(
+            email="a@example.com",
+            manager_email="m2@example.com",
+            employment_status="FTE",
+            record_id="recA",
+        ),
+    ]
+    server = WebhookServer(("127.0.0.1", 0), WebhookSync(client, index, mac_secret=SECRET))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_payload_record_changes_filters_by_table() -> None:
+    """Test that record IDs are extracted only for the followed table."""
+    payload = make_payload(changed=["rec1"], destroyed=["rec2"])
+    payload["changedTablesById"]["tblOther"] = {"changedRecordsById": {"rec9": {}}}
+
+    assert payload_record_changes(payload, "tblUsers") == ({"rec1"}, {"rec2"})
+    assert payload_record_changes(payload) == ({"rec1", "rec9"}, {"rec2"})
+
+
+def test_apply_payloads_reindexes_manager_change(index: EmployeeIndex) -> None:
+    """Test that a changed Manager Email moves the employee between managers' reports."""
+    client = Mock()
+    client.find_by_record_ids.return_value = [
+        EmployeeRecord(
+            email="a@example.com",
+            manager_email="m2@example.com",
+            employment_status="FTE",
+            record_id="recA",
+        ),
+    ]
+    sync = WebhookSync(client, index)
+
+    changed = sync.apply_payloads([make_payload(changed=["recA"])])
+
+    assert changed == 1
+    client.find_by_record_ids.assert_called_once_with({"recA"})
+    assert index.direct_reports("m1@example.com") == []
+    assert [record.email for record in index.direct_reports("m2@example.com")] == ["a@example.com"]
+
+
+def test_apply_payloads_removes_destroyed_records(index: EmployeeIndex) -> None:
+    """Test that destroyed records are dropped without fetching anything."""
+    client = Mock()
+    sync = WebhookSync(client, index)
+
+    sync.apply_payloads([make_payload(destroyed=["recA"])])
+
+    client.find_by_record_ids.assert_not_called()
+    assert "a@example.com" not in index
+    assert index.direct_reports("m1@example.com") == []
+
+
+def test_ping_fetches_payloads_from_cursor(index: EmployeeIndex) -> None:
+    """Test that a ping lists payloads from the cursor and advances it."""
+    client = Mock()
+    client.webhook_payloads.return_value = [dict(make_payload(destroyed=["recA"]), cursor=7)]
+    sync = WebhookSync(client, index, webhook_id="achHook", cursor=7)
+
+    sync.handle_notification({"base": {"id": "appTestBase"}, "webhook": {"id": "achHook"}})
+
+    client.webhook_payloads.assert_called_once_with("achHook", 7)
+    assert sync.cursor == 8
+    assert "a@example.com" not in index
+
+
+def test_ping_without_webhook_id_is_rejected(index: EmployeeIndex) -> None:
+    """Test that pings need a configured webhook ID."""
+    with pytest.raises(ValueError):
+        WebhookSync(Mock(), index).handle_notification({"webhook": {"id": "achHook"}})
+
+
+def test_server_applies_recorded_payloads_and_serves_lookups(server: WebhookServer) -> None:
+    """Test the receiver end to end using the local stand-in poster."""
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    post_payloads(base_url + "/", [make_payload(changed=["recA"])], mac_secret=SECRET)
+
+    with urllib.request.urlopen(base_url + "/employee?email=a@example.com") as response:
+        result = json.loads(response.read())
+    assert result["manager"]["email"] == "m2@example.com"
+
+
+def test_server_rejects_unsigned_notifications(server: WebhookServer) -> None:
+    """Test that notifications with a bad MAC are refused."""
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        post_payloads(f"http://127.0.0.1:{server.server_port}/", [make_payload(changed=["recA"])])
+
+    assert excinfo.value.code == 401
+
+
+def test_ping_keeps_cursor_when_records_cannot_be_fetched(index: EmployeeIndex) -> None:
+    """Test that payloads whose records fail to load are fetched again by the next ping."""
+    client = Mock()
+    client.webhook_payloads.return_value = [dict(make_payload(changed=["recA"]), cursor=7)]
+    client.find_by_record_ids.side_effect = [
+        requests.ConnectionError("reset"),
+        [
+            EmployeeRecord(
+                email="a@example.com",
+                manager_email="m2@example.com",
+                employment_status="FTE",
+                record_id="recA",
+            )
+        ],
+    ]
+    sync = WebhookSync(client, index, webhook_id="achHook", cursor=7)
+    ping = {"webhook": {"id": "achHook"}}
+
+    with pytest.raises(requests.ConnectionError):
+        sync.handle_notification(ping)
+    assert sync.cursor == 7
+
+    sync.handle_notification(ping)
+    assert client.webhook_payloads.call_args_list[-1].args == ("achHook", 7)
+    assert sync.cursor == 8
+    assert index.direct_reports("m2@example.com")[0].email == "a@example.com"
+
+
+def test_server_reports_airtable_failures_as_bad_gateway(server: WebhookServer) -> None:
+    """Test that an Airtable error while applying a notification gets a 502 response."""
+    server.sync._client.find_by_record_ids.side_effect = requests.HTTPError("429 Too Many Requests")
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        post_payloads(f"http://127.0.0.1:{server.server_port}/", [make_payload(changed=["recA"])], SECRET)
+
+    assert excinfo.value.code == 502